@@ -0,0 +1,73 @@
+import os
+import sys
+import time
+import json
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pymunk
+
+from game.game_manager import GameManager
+from game.world_builder import WorldBuilder, step_space
+from mqtt.null_client import NullMQTTClient
+
+PEG_COLUMNS = 20
+PEG_ROWS = 18
+PEG_SPACING = 24
+
+def add_pegs(game_manager, count, radius=5):
+    for index in range(count):
+        row, column = divmod(index, PEG_COLUMNS)
+        position = (140 + column * PEG_SPACING, 120 + (row % PEG_ROWS) * PEG_SPACING)
+        peg = pymunk.Circle(game_manager.space.static_body, radius, position)
+        peg.elasticity = 0.7
+        game_manager.space.add(peg)
+
+def build(pegs, balls, use_spatial_hash, seed=1):
+    game_manager = GameManager(NullMQTTClient(), leaderboard_path=None, seed=seed,
+                               world=WorldBuilder(use_spatial_hash=False))
+    add_pegs(game_manager, pegs)
+    
+    if balls > 1:
+        game_manager.start_multiball(balls, collide=False)
+    if use_spatial_hash:
+        WorldBuilder(use_spatial_hash=True).tune_broad_phase(game_manager.space, game_manager.ball_shape.radius)
+    
+    game_manager.launch_ball(1.0)
+    return game_manager
+
+def step_cost(pegs, balls, use_spatial_hash, steps=300, repeats=3):
+    best = None
+    for _ in range(repeats):
+        game_manager = build(pegs, balls, use_spatial_hash)
+        dt = 1.0 / game_manager.physics_rate
+        
+        start = time.perf_counter()
+        for _ in range(steps):
+            step_space(game_manager.space, dt)
+        elapsed = (time.perf_counter() - start) / steps * 1e6
+        
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+def main():
+    scenarios = [(pegs, 1) for pegs in (0, 100, 250, 500)] + [(0, balls) for balls in (6, 50, 100, 200, 400)]
+    
+    results = []
+    for pegs, balls in scenarios:
+        tree = step_cost(pegs, balls, False)
+        spatial_hash = step_cost(pegs, balls, True)
+        shapes = len(build(pegs, balls, False).space.shapes)
+        results.append({
+            "pegs": pegs,
+            "balls": balls,
+            "shapes": shapes,
+            "bb_tree_us": round(tree, 1),
+            "spatial_hash_us": round(spatial_hash, 1),
+            "speedup": round(tree / spatial_hash, 2)
+        })
+    
+    print(json.dumps(results, indent=2))
+
+if __name__ == "__main__":
+    main()
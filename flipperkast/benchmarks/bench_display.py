@@ -0,0 +1,75 @@
+import os
+import sys
+import time
+import json
+import statistics
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+
+from display import Display
+from simulation.headless import HeadlessRunner
+
+def percentile(samples, fraction):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+def run_frames(use_dirty_rects, frames, seed=1):
+    runner = HeadlessRunner(max_frames=frames, seed=seed)
+    game_manager = runner.game_manager
+    
+    display = Display(
+        game_manager.space,
+        game_manager.ball_shape,
+        flippers=game_manager.get_flippers(),
+        bumpers=game_manager.bumpers,
+        plunger=game_manager.plunger
+    )
+    display.use_dirty_rects = use_dirty_rects
+    game_manager.set_display(display)
+    
+    frame_times = []
+    updated_pixels = 0
+    
+    for _ in range(frames):
+        if not game_manager.game_over:
+            runner.step()
+        
+        start = time.perf_counter()
+        dirty_rects = display.draw_elements(game_manager)
+        if dirty_rects is None:
+            pygame.display.flip()
+            updated_pixels += display.width * display.height
+        else:
+            pygame.display.update(dirty_rects)
+            updated_pixels += sum(rect.width * rect.height for rect in dirty_rects)
+        frame_times.append((time.perf_counter() - start) * 1000)
+    
+    return {
+        "frames": frames,
+        "mean_ms": statistics.mean(frame_times),
+        "p50_ms": percentile(frame_times, 0.50),
+        "p95_ms": percentile(frame_times, 0.95),
+        "updated_pixels_per_frame": updated_pixels / frames
+    }
+
+def main():
+    frames = int(sys.argv[1]) if len(sys.argv) > 1 else 600
+    
+    full = run_frames(False, frames)
+    dirty = run_frames(True, frames)
+    
+    results = {
+        "video_driver": os.environ["SDL_VIDEODRIVER"],
+        "full_flip": full,
+        "dirty_rects": dirty,
+        "speedup": full["mean_ms"] / dirty["mean_ms"]
+    }
+    print(json.dumps(results, indent=2))
+    
+    pygame.quit()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,231 @@
+import os
+import contextlib
+import sys
+import time
+import json
+import platform
+import statistics
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+from game.game_manager import COLLISION_HANDLER_NAMES
+from instrumentation.profiler import Profiler
+from simulation.headless import HeadlessRunner
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+SEEDS = list(range(1, 9))
+MAX_FRAMES = 2000
+
+def best_of(repeats, function):
+    results = [function() for _ in range(repeats)]
+    return min(results, key=lambda result: result["seconds"])
+
+def run_scenario(runner, seeds):
+    steps = 0
+    frames = 0
+    start = time.perf_counter()
+    
+    for seed in seeds:
+        runner.reset(seed)
+        while not runner.game_manager.game_over and runner.frame < runner.max_frames:
+            runner.step()
+        steps += runner.game_manager.step_count
+        frames += runner.frame
+    
+    return {"seconds": time.perf_counter() - start, "steps": steps, "frames": frames}
+
+def bench_physics(repeats=3):
+    runner = HeadlessRunner(max_frames=MAX_FRAMES)
+    result = best_of(repeats, lambda: run_scenario(runner, SEEDS))
+    
+    return {
+        "physics.steps_per_second": result["steps"] / result["seconds"],
+        "physics.frame_us": result["seconds"] / result["frames"] * 1e6
+    }
+
+def bench_callbacks(repeats=3):
+    metrics = {}
+    
+    for _ in range(repeats):
+        runner = HeadlessRunner(max_frames=MAX_FRAMES)
+        profiler = Profiler(history=len(SEEDS) * MAX_FRAMES)
+        runner.game_manager.enable_profiling(profiler)
+        run_scenario(runner, SEEDS)
+        
+        for name in sorted(set(COLLISION_HANDLER_NAMES.values())):
+            prefix = f"callback.{name}."
+            seconds = sum(sum(times) for key, times in profiler.frame_times.items() if key.startswith(prefix)) / 1000
+            calls = sum(sum(counts) for key, counts in profiler.frame_calls.items() if key.startswith(prefix))
+            if calls:
+                metric = f"callback.{name}.us_per_call"
+                metrics[metric] = min(metrics.get(metric, float("inf")), seconds / calls * 1e6)
+    
+    return metrics
+
+def bench_draw(frames=300, repeats=3):
+    import pygame
+    from display import Display
+    
+    metrics = {}
+    for mode, use_dirty_rects in (("full", False), ("dirty", True)):
+        for _ in range(repeats):
+            runner = HeadlessRunner(max_frames=frames, seed=SEEDS[0])
+            game_manager = runner.game_manager
+            display = Display(
+                game_manager.space,
+                game_manager.ball_shape,
+                flippers=game_manager.get_flippers(),
+                bumpers=game_manager.bumpers,
+                plunger=game_manager.plunger
+            )
+            display.use_dirty_rects = use_dirty_rects
+            game_manager.set_display(display)
+            
+            frame_times = []
+            for _ in range(frames):
+                if not game_manager.game_over:
+                    runner.step()
+                start = time.perf_counter()
+                display.draw_elements(game_manager)
+                frame_times.append((time.perf_counter() - start) * 1000)
+            
+            metric = f"draw.{mode}.p50_ms"
+            metrics[metric] = min(metrics.get(metric, float("inf")), statistics.median(frame_times))
+    
+    pygame.quit()
+    return metrics
+
+def bench_mqtt(messages=20000, repeats=5):
+    from mqtt.config import MQTTConfig
+    from mqtt.loopback import LoopbackBroker, LoopbackClient
+    from mqtt.mqtt_client import MQTTClient
+    
+    broker = LoopbackBroker("benchmark")
+    LoopbackBroker.brokers["benchmark"] = broker
+    
+    listener = LoopbackClient(broker=broker)
+    listener.connect("benchmark")
+    listener.subscribe("#")
+    
+    client = MQTTClient(config=MQTTConfig.loopback("benchmark", client_id="benchmark"))
+    client.start()
+    
+    def publish_position(index):
+        client.publish_ball_position(index, index * 0.5, 120.0, -80.0, timestamp=index)
+    
+    scenarios = {
+        "score_update": lambda index: client.publish_score_update(index),
+        "bumper_hit": lambda index: client.publish_bumper_hit("top_left", 100),
+        "game_status": lambda index: client.publish_game_status("STARTED", index),
+        "ball_position_json": publish_position,
+        "ball_position_binary": publish_position
+    }
+    
+    metrics = {}
+    for name, publish in scenarios.items():
+        client.set_position_encoding("binary" if name == "ball_position_binary" else "json")
+        
+        def run():
+            start = time.perf_counter()
+            for index in range(messages):
+                publish(index)
+            return {"seconds": time.perf_counter() - start}
+        
+        metrics[f"mqtt.{name}.messages_per_second"] = messages / best_of(repeats, run)["seconds"]
+    
+    client.stop()
+    listener.disconnect()
+    LoopbackBroker.brokers.pop("benchmark", None)
+    return metrics
+
+def run_all(include_draw=True):
+    metrics = {}
+    metrics.update(bench_physics())
+    metrics.update(bench_callbacks())
+    if include_draw:
+        metrics.update(bench_draw())
+    metrics.update(bench_mqtt())
+    
+    return {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "video_driver": os.environ["SDL_VIDEODRIVER"],
+        "seeds": SEEDS,
+        "max_frames": MAX_FRAMES,
+        "metrics": metrics
+    }
+
+def median_results(runs):
+    results = dict(runs[0])
+    results["runs"] = len(runs)
+    results["metrics"] = {name: statistics.median(run["metrics"][name] for run in runs)
+                          for name in runs[0]["metrics"]}
+    return results
+
+def higher_is_better(name):
+    return name.endswith("_per_second")
+
+def compare(metrics, baseline, tolerance=0.25):
+    regressions = []
+    
+    for name, expected in sorted(baseline.items()):
+        actual = metrics.get(name)
+        if actual is None or not expected:
+            continue
+        
+        if higher_is_better(name):
+            change = (expected - actual) / expected
+        else:
+            change = (actual - expected) / expected
+        
+        if change > tolerance:
+            regressions.append({"name": name, "baseline": expected, "actual": actual, "change": change})
+    
+    return regressions
+
+def option_value(name, default=None):
+    if name not in sys.argv:
+        return default
+    index = sys.argv.index(name)
+    return sys.argv[index + 1] if len(sys.argv) > index + 1 else default
+
+def main():
+    output_path = option_value("--output")
+    baseline_path = option_value("--baseline", BASELINE_PATH)
+    tolerance = float(option_value("--tolerance", 0.25))
+    runs = int(option_value("--runs", 3 if "--update-baseline" in sys.argv else 1))
+    
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        results = median_results([run_all(include_draw="--no-draw" not in sys.argv) for _ in range(runs)])
+    
+    if output_path:
+        with open(output_path, 'w') as f:
+            json.dump(results, f, indent=2)
+    else:
+        print(json.dumps(results, indent=2))
+    
+    if "--update-baseline" in sys.argv:
+        with open(baseline_path, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"Baseline written to {baseline_path}")
+        return
+    
+    if not os.path.exists(baseline_path):
+        print(f"No baseline at {baseline_path}, run with --update-baseline to create one")
+        return
+    
+    with open(baseline_path, 'r') as f:
+        baseline = json.load(f)["metrics"]
+    
+    regressions = compare(results["metrics"], baseline, tolerance)
+    for regression in regressions:
+        print(f"Regression in {regression['name']}: {regression['actual']:.3f} vs baseline "
+              f"{regression['baseline']:.3f} ({regression['change'] * 100:.0f}% worse)")
+    
+    if regressions:
+        sys.exit(1)
+    print(f"No regressions beyond {tolerance * 100:.0f}% against {baseline_path}")
+
+if __name__ == "__main__":
+    main()
@@ -4,7 +4,11 @@ import pymunk.pygame_util
 import sys
 import math
 import time
+from contextlib import nullcontext
 from pygame.locals import *
+from ui.text_cache import TextRenderer, DigitAtlas
+from game.inputs import (LEFT_FLIPPER_ACTIVATE, LEFT_FLIPPER_DEACTIVATE, RIGHT_FLIPPER_ACTIVATE,
+                         RIGHT_FLIPPER_DEACTIVATE, PLUNGER_COMPRESS, PLUNGER_LAUNCH)
 
 class Display:
     def __init__(self, space, ball_shape, flippers=None, bumpers=None, plunger=None):
@@ -14,6 +18,7 @@ class Display:
         pygame.display.set_caption("Flipperkast Simulator")
         
         self.clock = pygame.time.Clock()
+        self.render_fps = 60
         
         self.space = space
         self.draw_options = pymunk.pygame_util.DrawOptions(self.screen)
@@ -33,6 +38,21 @@ class Display:
         self.font = pygame.font.SysFont("Arial", 30)
         self.big_font = pygame.font.SysFont("Arial", 40, bold=True)
         self.small_font = pygame.font.SysFont("Arial", 20)
+        self.controls_font = pygame.font.SysFont("Arial", 16)
+        
+        self.text_renderer = TextRenderer()
+        self.score_digits = DigitAtlas(self.font, self.text_color)
+        self.overlay = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
+        self.overlay.fill((0, 0, 0, 180))
+        
+        self.static_layer = None
+        
+        self.use_dirty_rects = True
+        self.previous_dirty_rects = []
+        self.previous_game_over = False
+        self.controls_rect = None
+        
+        self.profiler = None
         
         self.left_flipper_activated = False
         self.right_flipper_activated = False
@@ -46,12 +66,33 @@ class Display:
         self.game_over_time = 0
     
     def extract_wall_segments(self):
+        self.wall_segments = []
         for shape in self.space.shapes:
             if isinstance(shape, pymunk.Segment):
                 if shape.body.body_type == pymunk.Body.STATIC:
                     if not hasattr(shape, 'sensor') or not shape.sensor:
+                        if not getattr(shape, 'visible', True):
+                            continue
                         self.wall_segments.append(shape)
     
+    def bind(self, game_manager):
+        self.space = game_manager.space
+        self.ball_shape = game_manager.ball_shape
+        self.flippers = game_manager.get_flippers()
+        self.bumpers = game_manager.bumpers
+        self.plunger = game_manager.plunger
+        self.invalidate_static_layer()
+    
+    def invalidate_static_layer(self):
+        self.extract_wall_segments()
+        self.static_layer = None
+        self.text_renderer.clear()
+    
+    def build_static_layer(self):
+        self.static_layer = pygame.Surface((self.width, self.height)).convert()
+        self.static_layer.fill(self.background_color)
+        self.draw_walls(self.static_layer)
+    
     def handle_events(self, game_manager):
         for event in pygame.event.get():
             if event.type == QUIT:
@@ -61,14 +102,17 @@ class Display:
                 if event.key == K_ESCAPE:
                     return False
                 
+                elif event.key == K_r and game_manager.game_over:
+                    game_manager.new_game()
+                
                 elif event.key in (K_LEFT, K_z, K_a):
                     if not self.left_flipper_activated and self.flippers and len(self.flippers) > 0:
-                        self.flippers[0].activate()
+                        game_manager.apply_input(LEFT_FLIPPER_ACTIVATE)
                         self.left_flipper_activated = True
                 
                 elif event.key in (K_RIGHT, K_m, K_l):
                     if not self.right_flipper_activated and self.flippers and len(self.flippers) > 1:
-                        self.flippers[1].activate()
+                        game_manager.apply_input(RIGHT_FLIPPER_ACTIVATE)
                         self.right_flipper_activated = True
                 
                 elif event.key == K_SPACE:
@@ -78,25 +122,25 @@ class Display:
             elif event.type == KEYUP:
                 if event.key in (K_LEFT, K_z, K_a):
                     if self.left_flipper_activated and self.flippers and len(self.flippers) > 0:
-                        self.flippers[0].deactivate()
+                        game_manager.apply_input(LEFT_FLIPPER_DEACTIVATE)
                         self.left_flipper_activated = False
                 
                 elif event.key in (K_RIGHT, K_m, K_l):
                     if self.right_flipper_activated and self.flippers and len(self.flippers) > 1:
-                        self.flippers[1].deactivate()
+                        game_manager.apply_input(RIGHT_FLIPPER_DEACTIVATE)
                         self.right_flipper_activated = False
                 
                 elif event.key == K_SPACE:
                     if self.is_plunger_held and self.plunger and not game_manager.game_over:
                         power = min(1.0, self.plunger_compression / self.plunger.max_compression)
-                        game_manager.launch_ball(power)
+                        game_manager.apply_input(PLUNGER_LAUNCH, power)
                     self.is_plunger_held = False
                     self.plunger_compression = 0
         
         keys = pygame.key.get_pressed()
         if keys[K_SPACE] and self.is_plunger_held and self.plunger and not game_manager.game_over:
             self.plunger_compression = min(self.plunger.max_compression, self.plunger_compression + 2)
-            self.plunger.compress(self.plunger_compression)
+            game_manager.apply_input(PLUNGER_COMPRESS, self.plunger_compression)
         
         if game_manager.quit_game:
             if self.game_over_time == 0:
@@ -109,82 +153,127 @@ class Display:
         return True
     
     def draw_elements(self, game_manager):
-        self.screen.fill(self.background_color)
-        
-        self.draw_walls()
+        full_redraw = (self.static_layer is None or not self.use_dirty_rects or
+                       game_manager.game_over or self.previous_game_over != game_manager.game_over)
+        self.previous_game_over = game_manager.game_over
+        
+        if self.static_layer is None:
+            self.build_static_layer()
+        
+        dirty_rects = []
+        restored_rects = []
+        redraw_controls = full_redraw
+        
+        with self.timer("draw.background"):
+            if full_redraw:
+                self.screen.blit(self.static_layer, (0, 0))
+            else:
+                for rect in self.previous_dirty_rects:
+                    self.screen.blit(self.static_layer, rect, rect)
+                
+                if self.controls_rect is None or self.controls_rect.collidelist(self.previous_dirty_rects) != -1:
+                    redraw_controls = True
+                    if self.controls_rect:
+                        self.screen.blit(self.static_layer, self.controls_rect, self.controls_rect)
+                        restored_rects.append(self.controls_rect)
         
-        for bumper in self.bumpers:
-            bumper.draw(self.screen)
+        with self.timer("draw.bumpers"):
+            for bumper in self.bumpers:
+                dirty_rects.append(bumper.draw(self.screen))
         
-        for flipper in self.flippers:
-            flipper.draw(self.screen)
+        with self.timer("draw.flippers"):
+            for flipper in self.flippers:
+                dirty_rects.append(flipper.draw(self.screen, game_manager.interpolation_alpha))
         
-        if self.plunger:
-            self.plunger.draw(self.screen)
+        with self.timer("draw.plunger"):
+            if self.plunger:
+                dirty_rects.append(self.plunger.draw(self.screen))
         
-        self.draw_ball()
+        with self.timer("draw.ball"):
+            dirty_rects.extend(self.draw_ball(game_manager.interpolated_ball_position()))
+            for position in game_manager.ball_positions():
+                dirty_rects.extend(self.draw_ball(position))
         
-        self.draw_score(game_manager.highscore)
+        with self.timer("draw.score"):
+            dirty_rects.extend(self.draw_score(game_manager.highscore))
         
         if game_manager.game_over:
-            self.draw_game_over(game_manager.score, game_manager.highscore)
+            with self.timer("draw.game_over"):
+                self.draw_game_over(game_manager.score, game_manager.highscore)
         
-        self.draw_controls(game_manager.game_over)
+        if redraw_controls:
+            with self.timer("draw.controls"):
+                self.controls_rect = self.draw_controls(game_manager.game_over)
+        
+        dirty_rects = [rect.inflate(4, 4) for rect in dirty_rects]
+        update_rects = None if full_redraw else self.previous_dirty_rects + dirty_rects + restored_rects
+        self.previous_dirty_rects = dirty_rects
+        
+        return update_rects
+    
+    def timer(self, name):
+        if self.profiler:
+            return self.profiler.timer(name)
+        return nullcontext()
     
-    def draw_walls(self):
+    def draw_walls(self, surface):
         line_thickness = 3
         
         for wall in self.wall_segments:
             p1 = wall.a
             p2 = wall.b
             
-            if abs(p1.y - 600) < 5 and abs(p2.y - 600) < 5:
-                continue
-            
             pygame.draw.line(
-                self.screen, 
+                surface, 
                 self.outline_color,
                 (int(p1.x), int(p1.y)),
                 (int(p2.x), int(p2.y)),
                 line_thickness
             )
     
-    def draw_ball(self):
+    def draw_ball(self, pos=None):
         if hasattr(self, 'ball_shape') and self.ball_shape and hasattr(self.ball_shape, 'body'):
-            pos = self.ball_shape.body.position
+            if pos is None:
+                pos = self.ball_shape.body.position
             radius = self.ball_shape.radius
             
-            pygame.draw.circle(self.screen, (80, 180, 80), 
-                              (int(pos.x), int(pos.y)), int(radius))
+            rect = pygame.draw.circle(self.screen, (80, 180, 80), 
+                                      (int(pos.x), int(pos.y)), int(radius))
+            return [rect]
+        
+        return []
     
     def draw_score(self, highscore):
-        score_text = f"Score: {self.score}"
-        score_surface = self.font.render(score_text, True, self.text_color)
-        self.screen.blit(score_surface, (20, 20))
-        
-        highscore_text = f"Highscore: {highscore}"
-        highscore_surface = self.font.render(highscore_text, True, self.text_color)
-        self.screen.blit(highscore_surface, (self.width - highscore_surface.get_width() - 20, 20))
+        score_label = self.text_renderer.render(self.font, "Score: ", self.text_color)
+        score_value = str(self.score)
+        label_rect = self.screen.blit(score_label, (20, 20))
+        score_rect = label_rect.union(self.score_digits.blit(self.screen, score_value, (label_rect.right, 20)))
+        
+        highscore_label = self.text_renderer.render(self.font, "Highscore: ", self.text_color)
+        highscore_value = str(highscore)
+        highscore_x = self.width - highscore_label.get_width() - self.score_digits.width(highscore_value) - 20
+        label_rect = self.screen.blit(highscore_label, (highscore_x, 20))
+        highscore_rect = label_rect.union(self.score_digits.blit(self.screen, highscore_value, (label_rect.right, 20)))
+        
+        return [score_rect, highscore_rect]
     
     def draw_game_over(self, final_score, highscore):
-        overlay = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
-        overlay.fill((0, 0, 0, 180))
-        self.screen.blit(overlay, (0, 0))
+        self.screen.blit(self.overlay, (0, 0))
         
-        game_over_text = self.big_font.render("GAME OVER", True, (255, 50, 50))
+        game_over_text = self.text_renderer.render(self.big_font, "GAME OVER", (255, 50, 50))
         self.screen.blit(game_over_text, 
                          (self.width//2 - game_over_text.get_width()//2, 
                           self.height//2 - 100))
         
-        final_score_text = self.font.render(f"Final Score: {final_score}", True, (255, 255, 255))
+        final_score_text = self.text_renderer.render(self.font, f"Final Score: {final_score}", (255, 255, 255))
         self.screen.blit(final_score_text, 
                          (self.width//2 - final_score_text.get_width()//2, 
                           self.height//2 - 30))
         
         if final_score >= highscore:
-            highscore_text = self.font.render(f"NEW HIGHSCORE!", True, (255, 215, 0))
+            highscore_text = self.text_renderer.render(self.font, "NEW HIGHSCORE!", (255, 215, 0))
         else:
-            highscore_text = self.font.render(f"Highscore: {highscore}", True, (255, 255, 255))
+            highscore_text = self.text_renderer.render(self.font, f"Highscore: {highscore}", (255, 255, 255))
         
         self.screen.blit(highscore_text, 
                          (self.width//2 - highscore_text.get_width()//2, 
@@ -192,25 +281,33 @@ class Display:
         
         seconds_left = max(0, int(self.game_over_delay - (time.time() - self.game_over_time)))
         if seconds_left > 0:
-            quit_text = self.small_font.render(f"Spel sluit over {seconds_left} seconden...", True, (200, 200, 200))
+            quit_text = self.text_renderer.render(self.small_font, f"Spel sluit over {seconds_left} seconden...", (200, 200, 200))
             self.screen.blit(quit_text, 
                             (self.width//2 - quit_text.get_width()//2, 
                             self.height//2 + 80))
     
     def draw_controls(self, game_over=False):
-        controls_font = pygame.font.SysFont("Arial", 16)
-        
         if game_over:
-            controls_text = controls_font.render(
-                "Game Over - Het spel sluit automatisch", 
-                True, (180, 180, 180))
+            controls_text = self.text_renderer.render(
+                self.controls_font,
+                "Game Over - R voor een nieuw spel, anders sluit het spel automatisch", 
+                (180, 180, 180))
         else:
-            controls_text = controls_font.render(
+            controls_text = self.text_renderer.render(
+                self.controls_font,
                 "Controls: A/Z/Left, L/M/Right voor flippers, Space voor plunger, ESC om te stoppen", 
-                True, (80, 80, 80))
-            
-        self.screen.blit(controls_text, 
-                         (self.width//2 - controls_text.get_width()//2, self.height - 30))
+                (80, 80, 80))
+        
+        return self.screen.blit(controls_text, 
+                                (self.width//2 - controls_text.get_width()//2, self.height - 30))
+    
+    def reset(self):
+        self.score = 0
+        self.game_over_time = 0
+        self.left_flipper_activated = False
+        self.right_flipper_activated = False
+        self.plunger_compression = 0
+        self.is_plunger_held = False
     
     def update_score(self, points):
         self.score += points
@@ -218,21 +315,30 @@ class Display:
     
     def run(self, game_manager):
         running = True
-        fps = 60
+        frame_time = 1.0 / self.render_fps
         
         game_manager.set_display(self)
+        self.profiler = game_manager.profiler
         
         while running:
             running = self.handle_events(game_manager)
             
             if not game_manager.game_over:
-                game_manager.update()
+                with self.timer("frame.advance"):
+                    game_manager.advance(frame_time)
+            
+            dirty_rects = self.draw_elements(game_manager)
             
-            self.draw_elements(game_manager)
+            with self.timer("draw.present"):
+                if dirty_rects is None:
+                    pygame.display.flip()
+                else:
+                    pygame.display.update(dirty_rects)
             
-            pygame.display.flip()
+            if self.profiler:
+                self.profiler.end_frame()
             
-            self.clock.tick(fps)
+            frame_time = self.clock.tick(self.render_fps) / 1000.0
         
         pygame.quit()
         sys.exit()
\ No newline at end of file
@@ -1,5 +1,6 @@
 import pymunk
 import math
+from game.shape_registry import ShapeRegistry
 
 class Ball:
     def __init__(self, space, position=(565, 650), radius=14):
@@ -20,6 +21,9 @@ class Ball:
         
         space.add(self.body, self.shape)
         
+        self.registry = ShapeRegistry.for_space(space)
+        self.registry.register(self.shape, self)
+        
         self.setup_collision_handlers(space)
         
     def setup_collision_handlers(self, space):
@@ -27,8 +31,10 @@ class Ball:
         wall_handler.pre_solve = self.handle_wall_collision
         
     def handle_wall_collision(self, arbiter, space, data):
+        ball = self.registry.owner(arbiter.shapes[0]) or self
+        
         normal = arbiter.normal
-        velocity = self.body.velocity
+        velocity = ball.body.velocity
 
         dot_product = velocity.dot(normal)
         reflection = velocity - 2 * dot_product * normal
@@ -36,9 +42,25 @@ class Ball:
         damping_factor = 0.9
         reflection = reflection * damping_factor
         
-        self.body.velocity = reflection
+        ball.body.velocity = reflection
         
         return True
         
+    def snapshot(self):
+        return {
+            "position": tuple(self.body.position),
+            "velocity": tuple(self.body.velocity),
+            "angle": self.body.angle,
+            "angular_velocity": self.body.angular_velocity
+        }
+        
+    def restore(self, state):
+        self.body.position = state["position"]
+        self.body.velocity = state["velocity"]
+        self.body.angle = state["angle"]
+        self.body.angular_velocity = state["angular_velocity"]
+        self.body.force = (0, 0)
+        self.body.torque = 0
+        
     def apply_impulse(self, impulse):
         self.body.apply_impulse_at_local_point(impulse)
\ No newline at end of file
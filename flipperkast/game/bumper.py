@@ -1,12 +1,13 @@
 import pymunk
-import pygame
 import random
 import math
-from mqtt.mqtt_client import MQTTClient
-from mqtt.topics import BUMPER_HIT_TOPIC
+from game.shape_registry import ShapeRegistry
+from game.world_builder import reindex_body
+from game.tuning import DEFAULT_TUNING
 
 class Bumper:
-    def __init__(self, space, x, y, radius=20, collision_type=3, bumper_id=None, mqtt_client=None):
+    def __init__(self, space, x, y, radius=20, collision_type=3, bumper_id=None, mqtt_client=None, rng=None,
+                 points=10, cooldown=0.1):
         self.space = space
         self.position = (x, y)
         self.radius = radius
@@ -14,21 +15,27 @@ class Bumper:
         self.highlight_color = (0, 255, 0, 255)
         self.is_hit = False
         self.hit_time = 0
+        self.hit_count = 0
+        self.cooldown = cooldown
+        self.last_scored_at = None
         self.bumper_id = bumper_id or f"bumper_{x}_{y}"
-        self.points = 10
+        self.points = points
+        self.kick = DEFAULT_TUNING["bumper_kick"]
         
         self.mqtt_client = mqtt_client
+        self.rng = rng or random.Random()
         
         self.body = pymunk.Body(body_type=pymunk.Body.KINEMATIC)
         self.body.position = (x, y)
         self.shape = pymunk.Circle(self.body, radius)
-        self.shape.elasticity = 1.2
+        self.shape.elasticity = DEFAULT_TUNING["bumper_elasticity"]
         self.shape.friction = 0.3
         self.shape.collision_type = collision_type
         
         self.shape.bumper = self
         
         space.add(self.body, self.shape)
+        ShapeRegistry.for_space(space).register(self.shape, self)
         self.setup_collision_handlers(space)
         
     def setup_collision_handlers(self, space):
@@ -42,7 +49,7 @@ class Bumper:
         dot_product = velocity.dot(normal)
         reflection = velocity - 2 * dot_product * normal
         
-        extra_velocity = normal * 150
+        extra_velocity = normal * self.kick
         ball_body.velocity = reflection + extra_velocity
         
         points = self.hit()
@@ -54,13 +61,39 @@ class Bumper:
     def hit(self):
         self.is_hit = True
         self.hit_time = 10
+        self.hit_count += 1
         
-        jitter_x = random.uniform(-1.5, 1.5)
-        jitter_y = random.uniform(-1.5, 1.5)
-        self.body.position = (self.position[0] + jitter_x, self.position[1] + jitter_y)
+        jitter_x = self.rng.uniform(-1.5, 1.5)
+        jitter_y = self.rng.uniform(-1.5, 1.5)
+        self.move_to((self.position[0] + jitter_x, self.position[1] + jitter_y))
         
         return self.points
         
+    def can_score(self, now):
+        return self.last_scored_at is None or now - self.last_scored_at >= self.cooldown
+        
+    def register_score(self, now):
+        if not self.can_score(now):
+            return False
+        self.last_scored_at = now
+        return True
+        
+    def snapshot(self):
+        return {
+            "is_hit": self.is_hit,
+            "hit_time": self.hit_time,
+            "hit_count": self.hit_count,
+            "last_scored_at": self.last_scored_at,
+            "position": tuple(self.body.position)
+        }
+        
+    def restore(self, state):
+        self.is_hit = state["is_hit"]
+        self.hit_time = state["hit_time"]
+        self.hit_count = state["hit_count"]
+        self.last_scored_at = state["last_scored_at"]
+        self.move_to(state["position"])
+        
     def publish_hit(self, points):
         if self.mqtt_client:
             self.mqtt_client.publish_bumper_hit(self.bumper_id, points)
@@ -70,12 +103,18 @@ class Bumper:
             self.hit_time -= 1
             if self.hit_time <= 0:
                 self.is_hit = False
-                self.body.position = self.position
+                self.move_to(self.position)
+                
+    def move_to(self, position):
+        self.body.position = position
+        reindex_body(self.space, self.body)
                 
     def draw(self, screen):
+        import pygame
+        
         color = self.highlight_color if self.is_hit else self.color
         
-        pygame.draw.circle(
+        rect = pygame.draw.circle(
             screen,
             color,
             (int(self.body.position.x), int(self.body.position.y)),
@@ -96,4 +135,6 @@ class Bumper:
                 (255, 255, 255, 150),
                 (int(self.body.position.x), int(self.body.position.y)),
                 int(self.radius * 0.3)
-            )
\ No newline at end of file
+            )
+            
+        return rect
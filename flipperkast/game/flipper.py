@@ -1,6 +1,7 @@
 import math
-import pygame
 import pymunk
+from game.shape_registry import ShapeRegistry
+from game.tuning import DEFAULT_TUNING
 
 class Flipper:
     def __init__(self, space, position, is_left):
@@ -21,29 +22,45 @@ class Flipper:
         self.shape.collision_type = 4
         self.space.add(self.body, self.shape)
         
-        pivot_offset = (-width / 2, 0) if is_left else (width / 2, 0)
-        pivot_world = self.body.position + pivot_offset
-        self.pivot = pymunk.PivotJoint(self.space.static_body, self.body, pivot_world)
-        self.pivot.collide_bodies = False
-        self.space.add(self.pivot)
+        self.registry = ShapeRegistry.for_space(space)
+        self.registry.register(self.shape, self)
+        
+        self.pivot_offset = (-width / 2, 0) if is_left else (width / 2, 0)
+        self.pivot_world = self.body.position + self.pivot_offset
         
-        rest_angle = 0.3 if is_left else -0.3
+        self.rest_angle = 0.3 if is_left else -0.3
         angle_range = math.radians(60)
 
         if is_left:
-            min_angle = rest_angle - angle_range
-            max_angle = rest_angle
-            self.target_angle = min_angle
+            self.min_angle = self.rest_angle - angle_range
+            self.max_angle = self.rest_angle
+            self.target_angle = self.min_angle
         else:
-            min_angle = rest_angle
-            max_angle = rest_angle + angle_range
-            self.target_angle = max_angle
-            
-        self.limit_joint = pymunk.RotaryLimitJoint(self.space.static_body, self.body, min_angle, max_angle)
-        space.add(self.limit_joint)
+            self.min_angle = self.rest_angle
+            self.max_angle = self.rest_angle + angle_range
+            self.target_angle = self.max_angle
+        
+        self.impulse = DEFAULT_TUNING["flipper_impulse"]
+        self.speed_factor = DEFAULT_TUNING["flipper_speed_factor"]
+        
+        self.motor_active = False
+        self.create_joints()
+        
+        self.previous_position = self.body.position
+        self.previous_angle = self.body.angle
+        
+        self.setup_collision_handler(space)
+    
+    def create_joints(self):
+        self.pivot = pymunk.PivotJoint(self.space.static_body, self.body, self.pivot_world, self.pivot_offset)
+        self.pivot.collide_bodies = False
+        self.space.add(self.pivot)
+        
+        self.limit_joint = pymunk.RotaryLimitJoint(self.space.static_body, self.body, self.min_angle, self.max_angle)
+        self.space.add(self.limit_joint)
         
         self.spring = pymunk.DampedRotarySpring(
-            self.space.static_body, self.body, rest_angle,
+            self.space.static_body, self.body, self.rest_angle,
             stiffness=3000000,
             damping=20000
         )
@@ -51,20 +68,25 @@ class Flipper:
         
         self.motor = pymunk.SimpleMotor(self.space.static_body, self.body, 0)
         self.motor.max_force = 5000000
-        self.motor_active = False
-        
-        self.setup_collision_handler(space)
+        if self.motor_active:
+            self.motor.rate = 20 if self.is_left else -20
+            self.space.add(self.motor)
+    
+    def remove_joints(self):
+        self.space.remove(self.pivot, self.limit_joint, self.spring)
+        if self.motor_active:
+            self.motor_active = False
+            self.space.remove(self.motor)
     
     def setup_collision_handler(self, space):
         handler = space.add_collision_handler(4, 1)
         handler.pre_solve = self.on_ball_hit
     
     def on_ball_hit(self, arbiter, space, data):
-        if self.motor_active:
-            shapes = arbiter.shapes
-            ball_shape = shapes[1] if shapes[0].collision_type == 4 else shapes[0]
-            flipper_shape = shapes[0] if shapes[0].collision_type == 4 else shapes[1]
-            
+        flipper_shape, ball_shape = arbiter.shapes
+        flipper = self.registry.owner(flipper_shape) or self
+        
+        if flipper.motor_active:
             ball_body = ball_shape.body
             flipper_body = flipper_shape.body
             
@@ -72,11 +94,11 @@ class Flipper:
 
             flipper_velocity = flipper_body.velocity_at_world_point(collision_point)
 
-            direction_x = 1.0 if self.is_left else -1.0
+            direction_x = 1.0 if flipper.is_left else -1.0
             direction = pymunk.Vec2d(direction_x, -3.0).normalized()
             
             flipper_speed = flipper_velocity.length
-            impulse_strength = 500 + flipper_speed * 0.8
+            impulse_strength = flipper.impulse + flipper_speed * flipper.speed_factor
             
 
             impulse = direction * impulse_strength
@@ -96,10 +118,47 @@ class Flipper:
             self.motor_active = False
             self.space.remove(self.motor)
     
-    def draw(self, screen):
-        vertices = [self.body.local_to_world(v) for v in self.shape.get_vertices()]
+    def save_previous_state(self):
+        self.previous_position = self.body.position
+        self.previous_angle = self.body.angle
+    
+    def snapshot(self):
+        return {
+            "position": tuple(self.body.position),
+            "velocity": tuple(self.body.velocity),
+            "angle": self.body.angle,
+            "angular_velocity": self.body.angular_velocity,
+            "motor_active": self.motor_active,
+            "previous_position": tuple(self.previous_position),
+            "previous_angle": self.previous_angle
+        }
+    
+    def restore(self, state):
+        if state["motor_active"]:
+            self.activate()
+        else:
+            self.deactivate()
+        
+        self.body.position = state["position"]
+        self.body.velocity = state["velocity"]
+        self.body.angle = state["angle"]
+        self.body.angular_velocity = state["angular_velocity"]
+        self.body.force = (0, 0)
+        self.body.torque = 0
+        
+        self.previous_position = pymunk.Vec2d(*state["previous_position"])
+        self.previous_angle = state["previous_angle"]
+    
+    def draw(self, screen, alpha=1.0):
+        import pygame
+        
+        position = self.previous_position + (self.body.position - self.previous_position) * alpha
+        angle = self.previous_angle + (self.body.angle - self.previous_angle) * alpha
+        vertices = [position + v.rotated(angle) for v in self.shape.get_vertices()]
         points = [(int(v.x), int(v.y)) for v in vertices]
         
-        pygame.draw.polygon(screen, (130, 130, 130), points)
+        rect = pygame.draw.polygon(screen, (130, 130, 130), points)
         if self.motor_active:
-            pygame.draw.polygon(screen, (160, 160, 160), points, 2)
\ No newline at end of file
+            pygame.draw.polygon(screen, (160, 160, 160), points, 2)
+            
+        return rect
\ No newline at end of file
@@ -3,52 +3,58 @@ from game.ball import Ball
 from game.flipper import Flipper
 from game.bumper import Bumper
 from game.plunger import Plunger
-from mqtt.mqtt_client import MQTTClient
-from mqtt.topics import SCORE_TOPIC, BUMPER_HIT_TOPIC, GAME_STATUS_TOPIC, BALL_POSITION_TOPIC
-import math
-import os
-import json
+from game.shape_registry import ShapeRegistry
+from game.world_builder import WorldBuilder, step_space
+from game.table_loader import load_table, SENSOR_COLLISION_TYPES, DEFAULT_TABLE
+from game.tuning import make_tuning
+from game.leaderboard import Leaderboard, DEFAULT_PLAYER
+from mqtt.topics import SCORE_TOPIC, BUMPER_HIT_TOPIC, GAME_STATUS_TOPIC, BALL_POSITION_TOPIC, BALL_POSITIONS_TOPIC
+from mqtt.dead_reckoning import DeadReckoningPublisher, KEYFRAME
+from game.inputs import (LEFT_FLIPPER_ACTIVATE, LEFT_FLIPPER_DEACTIVATE, RIGHT_FLIPPER_ACTIVATE,
+                         RIGHT_FLIPPER_DEACTIVATE, PLUNGER_COMPRESS, PLUNGER_LAUNCH)
 import time
+import random
+
+COLLISION_HANDLER_NAMES = {
+    (1, 0): "ball_wall",
+    (1, 2): "plunger",
+    (1, 3): "plunger_sensor",
+    (4, 1): "flipper",
+    (1, 98): "bumper",
+    (1, 99): "drain"
+}
 
 class GameManager:
-    def __init__(self):
-        self.space = pymunk.Space()
-        self.space.gravity = (0.0, 500.0)
-        self.space.damping = 0.95
-        self.space.iterations = 10
-        
-        self.center_x = 400
-        self.center_y = 200
-        self.plunger_right_x = 690
-        self.arc_width = (self.plunger_right_x - self.center_x) * 2
-        self.left_x = self.center_x - self.arc_width/2
-        self.right_x = self.plunger_right_x
-        self.bottom_y = 600
-        
-        flipper_center_x = self.center_x
-        flipper_spread = 150
-        self.left_flipper_x = flipper_center_x - flipper_spread/2
-        self.right_flipper_x = flipper_center_x + flipper_spread/2
-        self.flipper_y = 550
+    def __init__(self, mqtt_client=None, leaderboard_path='leaderboard.json', seed=None,
+                 player=DEFAULT_PLAYER, table=DEFAULT_TABLE, world=None, tuning=None):
+        self.seed = seed if seed is not None else random.randrange(2**32)
+        self.rng = random.Random(self.seed)
+        
+        self.world = world or WorldBuilder()
+        self.layout = load_table(table)
+        self.tuning = make_tuning(tuning)
         
         self.stuck_frames_count = 0
         
-        self.mqtt = MQTTClient()
-        self.mqtt.start()
+        self.sim_time = 0.0
+        self.step_count = 0
         
-        self.create_walls()
-        self.plunger = Plunger(self.space, (self.right_x - 20, 650))
-        self.ball = Ball(self.space, position=(self.right_x - 20, 620), radius=15)
-        self.ball_shape = self.ball.shape
-        self.ball_shape.density = 0.02
-        self.ball_shape.collision_type = 1
-        
-        self.bumpers = self.create_bumpers()
+        self.world.configure_timing(self)
+        self.accumulator = 0.0
+        self.interpolation_alpha = 1.0
+        self.previous_ball_position = None
         
-        self.left_flipper = Flipper(self.space, (self.left_flipper_x, self.flipper_y + 90), is_left=True)
-        self.right_flipper = Flipper(self.space, (self.right_flipper_x, self.flipper_y + 90), is_left=False)  
+        self.player = player
+        self.table = self.layout.name
+        self.leaderboard = Leaderboard(leaderboard_path)
         
-        self.setup_collision_handlers()
+        if mqtt_client is None:
+            from mqtt.pool import MQTTClientPool
+            self.mqtt = MQTTClientPool.acquire()
+            self.mqtt.enable_outbox()
+        else:
+            self.mqtt = mqtt_client
+        self.owns_mqtt = mqtt_client is None
         
         self.score = 0
         self.highscore = self.load_highscore()
@@ -58,141 +64,129 @@ class GameManager:
         
         self.last_position_update = 0
         self.position_update_interval = 0.05
+        self.position_stream = None
         
         self.display = None
+        self.profiler = None
+        self.recorder = None
+        self.multiball = None
+        
+        self.build_table()
+        self.initial_state = self.snapshot()
+        
+        if self.owns_mqtt:
+            self.mqtt.start_async()
         
         self.mqtt.publish_game_status("READY")
+        self.mqtt.flush()
+    
+    def build_table(self):
+        layout = self.layout
+        self.space = self.world.create_space(self.tuning["damping"])
+        self.shapes = ShapeRegistry.for_space(self.space)
+        
+        self.create_walls()
+        self.plunger = Plunger(self.space, layout.plunger["position"])
+        self.ball = Ball(self.space, position=layout.ball["position"], radius=layout.ball["radius"])
+        self.ball_shape = self.ball.shape
+        self.ball_shape.density = layout.ball["density"]
+        self.ball_shape.collision_type = 1
+        
+        self.bumpers = self.create_bumpers()
+        
+        self.left_flipper = Flipper(self.space, layout.flippers["left"], is_left=True)
+        self.right_flipper = Flipper(self.space, layout.flippers["right"], is_left=False)
+        
+        self.setup_collision_handlers()
+        self.world.tune_broad_phase(self.space, self.ball_shape.radius)
+        self.apply_tuning()
+        
+        if self.profiler:
+            self.enable_profiling(self.profiler)
+        if self.display:
+            self.display.bind(self)
+    
+    def apply_tuning(self):
+        tuning = self.tuning
+        self.space.damping = tuning["damping"]
+        self.plunger.spring_constant = tuning["plunger_spring_constant"]
+        
+        for bumper in self.bumpers:
+            bumper.shape.elasticity = tuning["bumper_elasticity"]
+            bumper.kick = tuning["bumper_kick"]
+        
+        for flipper in self.get_flippers():
+            flipper.impulse = tuning["flipper_impulse"]
+            flipper.speed_factor = tuning["flipper_speed_factor"]
+    
+    def switch_table(self, table):
+        self.end_multiball()
+        self.layout = load_table(table)
+        self.table = self.layout.name
+        self.highscore = self.load_highscore()
+        self.build_table()
+        
+        fresh = self.snapshot()
+        self.initial_state = dict(self.initial_state, **{key: fresh[key] for key in ("ball", "flippers", "plunger", "bumpers")})
+        self.restore(self.initial_state)
     
     def create_bumpers(self):
         bumpers = []
         
-        bumpers.append(Bumper(self.space, 220, 250, radius=23, collision_type=98, 
-                             bumper_id="top_left", mqtt_client=self.mqtt))
-        bumpers.append(Bumper(self.space, 580, 250, radius=23, collision_type=98, 
-                             bumper_id="top_right", mqtt_client=self.mqtt))
-        bumpers.append(Bumper(self.space, 180, 350, radius=23, collision_type=98, 
-                             bumper_id="left_side", mqtt_client=self.mqtt))
-        bumpers.append(Bumper(self.space, 620, 350, radius=23, collision_type=98, 
-                             bumper_id="right_side", mqtt_client=self.mqtt))
-        bumpers.append(Bumper(self.space, self.left_x + 50, self.bottom_y - 30, radius=23, 
-                            collision_type=98, bumper_id="bottom_left_corner", mqtt_client=self.mqtt))
-        bumpers.append(Bumper(self.space, self.right_x - 90, self.bottom_y - 30, radius=23, 
-                            collision_type=98, bumper_id="bottom_right_corner", mqtt_client=self.mqtt))
+        for bumper in self.layout.bumpers:
+            x, y = bumper["position"]
+            bumpers.append(Bumper(self.space, x, y, radius=bumper["radius"], collision_type=98,
+                                  bumper_id=bumper["id"], mqtt_client=self.mqtt, rng=self.rng,
+                                  points=bumper["points"], cooldown=bumper["cooldown"]))
         
         return bumpers
     
     def set_display(self, display):
         self.display = display
+        
+    def start_recording(self, path, checkpoint_interval=90):
+        from simulation.replay import ReplayRecorder
+        
+        self.recorder = ReplayRecorder(path, checkpoint_interval)
+        self.recorder.start(self)
+        return self.recorder
+        
+    def stop_recording(self):
+        if self.recorder:
+            self.recorder.close(self)
+            self.recorder = None
+        
+    def enable_profiling(self, profiler):
+        self.profiler = profiler
+        self.mqtt.profiler = profiler
+        
+        for (type_a, type_b), name in COLLISION_HANDLER_NAMES.items():
+            handler = self.space.add_collision_handler(type_a, type_b)
+            for phase in ("begin", "pre_solve", "post_solve", "separate"):
+                callback = getattr(handler, phase)
+                if callback and not hasattr(callback, "profiled_function"):
+                    setattr(handler, phase, profiler.wrap(f"callback.{name}.{phase}", callback))
     
     def create_walls(self):
-        wall_thickness = 3.0
-        
-        segments = 20
-        for i in range(segments):
-            angle1 = math.pi + (i * math.pi / segments)
-            angle2 = math.pi + ((i + 1) * math.pi / segments)
+        for wall in self.layout.walls:
+            segment = pymunk.Segment(self.space.static_body, wall["a"], wall["b"], wall["radius"])
+            segment.elasticity = wall["elasticity"]
+            segment.friction = wall["friction"]
+            segment.visible = wall["visible"]
             
-            x1 = self.center_x + (self.arc_width/2) * math.cos(angle1)
-            y1 = self.center_y + (self.arc_width/2) * math.sin(angle1)
-            x2 = self.center_x + (self.arc_width/2) * math.cos(angle2)
-            y2 = self.center_y + (self.arc_width/2) * math.sin(angle2)
+            if wall["sensor"]:
+                segment.sensor = True
+                segment.collision_type = SENSOR_COLLISION_TYPES[wall["sensor"]]
+                self.shapes.register(segment, self)
             
-            segment = pymunk.Segment(self.space.static_body, (x1, y1), (x2, y2), wall_thickness)
-            segment.elasticity = 0.7
-            segment.friction = 0.5
             self.space.add(segment)
-        
-        left_wall = pymunk.Segment(
-            self.space.static_body,
-            (self.left_x, self.center_y),
-            (self.left_x, self.bottom_y),
-            wall_thickness
-        )
-        
-        right_wall = pymunk.Segment(
-            self.space.static_body,
-            (self.right_x - 40, self.center_y),
-            (self.right_x - 40, self.bottom_y),
-            wall_thickness
-        )
-        
-        bottom_left_wall = pymunk.Segment(
-            self.space.static_body,
-            (self.left_x, self.bottom_y),
-            (self.left_flipper_x - 50, self.bottom_y),
-            wall_thickness
-        )
-        
-        bottom_right_wall = pymunk.Segment(
-            self.space.static_body,
-            (self.right_flipper_x + 50, self.bottom_y),
-            (self.right_x - 40, self.bottom_y),
-            wall_thickness
-        )
-        
-        drain_sensor = pymunk.Segment(
-            self.space.static_body,
-            (self.left_flipper_x - 50, self.bottom_y),
-            (self.right_flipper_x + 50, self.bottom_y),
-            wall_thickness
-        )
-        drain_sensor.sensor = True
-        drain_sensor.collision_type = 99
-        
-        bottom_left_diag = pymunk.Segment(
-            self.space.static_body,
-            (self.left_x, self.bottom_y),
-            (self.left_flipper_x - 30, self.bottom_y + 50),
-            wall_thickness
-        )
-        
-        bottom_right_diag = pymunk.Segment(
-            self.space.static_body,
-            (self.right_x - 40, self.bottom_y),
-            (self.right_flipper_x + 30, self.bottom_y + 50),
-            wall_thickness
-        )
-        
-        plunger_lane_right = pymunk.Segment(
-            self.space.static_body,
-            (self.right_x, self.center_y),
-            (self.right_x, self.bottom_y + 150),
-            wall_thickness
-        )
-        
-        plunger_lane_bottom = pymunk.Segment(
-            self.space.static_body,
-            (self.right_x - 40, self.bottom_y + 150),
-            (self.right_x, self.bottom_y + 150),
-            wall_thickness
-        )
-        
-        right_wall_extension = pymunk.Segment(
-            self.space.static_body,
-            (self.right_x - 40, self.bottom_y),
-            (self.right_x - 40, self.bottom_y + 150),
-            wall_thickness
-        )
-        
-        all_walls = [
-            left_wall, right_wall,
-            bottom_left_wall, bottom_right_wall, drain_sensor,
-            bottom_left_diag, bottom_right_diag,
-            plunger_lane_right, plunger_lane_bottom, right_wall_extension
-        ]
-        
-        for wall in all_walls:
-            wall.elasticity = 0.7
-            wall.friction = 0.5
-            self.space.add(wall)
     
     def setup_collision_handlers(self):
         drain_handler = self.space.add_collision_handler(1, 99)
         drain_handler.post_solve = self.on_ball_drained
         
         bumper_handler = self.space.add_collision_handler(1, 98)
-        bumper_handler.pre_solve = self.on_bumper_hit_pre
-        bumper_handler.post_solve = self.on_bumper_hit_post
+        bumper_handler.begin = self.on_bumper_hit_begin
         
         plunger_handler = self.space.add_collision_handler(1, 2)
         plunger_handler.pre_solve = self.on_plunger_hit
@@ -211,13 +205,8 @@ class GameManager:
         
         return True
 
-    def on_bumper_hit_pre(self, arbiter, space, data):
-        shapes = arbiter.shapes
-        if len(shapes) != 2:
-            return True
-            
-        ball_shape = shapes[0]
-        bumper_shape = shapes[1]
+    def on_bumper_hit_begin(self, arbiter, space, data):
+        ball_shape, bumper_shape = arbiter.shapes
         
         ball_body = ball_shape.body
         bumper_body = bumper_shape.body
@@ -228,7 +217,7 @@ class GameManager:
         dot_product = velocity.dot(normal)
         reflection = velocity - 2 * dot_product * normal
         
-        extra_velocity = normal * 150
+        extra_velocity = normal * self.tuning["bumper_kick"]
         
         ball_body.velocity = reflection + extra_velocity
         
@@ -236,37 +225,30 @@ class GameManager:
             self.game_started = True
             self.mqtt.publish_game_status("STARTED")
         
+        bumper = self.shapes.owner(bumper_shape)
+        if bumper and bumper.register_score(self.sim_time):
+            self.on_bumper_scored(bumper)
+        
         return True
 
-    def on_bumper_hit_post(self, arbiter, space, data):
-        points = 10
+    def on_bumper_scored(self, bumper):
+        points = bumper.points
         
         self.score += points
         if self.display:
             self.display.update_score(points)
         
-        bumper_shape = None
-        for shape in arbiter.shapes:
-            if shape.collision_type == 98:
-                bumper_shape = shape
-                break
-        
-        if bumper_shape:
-            for bumper in self.bumpers:
-                if bumper.shape == bumper_shape:
-                    bumper.hit()
+        bumper.hit()
         
         self.mqtt.publish_score_update(points)
-        
-        return True
     
     def on_ball_drained(self, arbiter, space, data):
+        if self.multiball and self.multiball.drain(self.shapes.owner(arbiter.shapes[0])):
+            return True
+        
         if not self.game_over:
             self.game_over = True
-            
-            if self.score > self.highscore:
-                self.highscore = self.score
-                self.save_highscore(self.highscore)
+            self.record_score()
             
             self.mqtt.publish_game_status("GAME_OVER", self.score)
             
@@ -276,54 +258,117 @@ class GameManager:
         
         return True
         
+    def step(self):
+        dt = 1.0 / self.physics_rate
+        
+        self.previous_ball_position = self.ball_shape.body.position
+        for flipper in self.get_flippers():
+            flipper.save_previous_state()
+        
+        self.check_ball_bounds()
+        if self.profiler:
+            with self.profiler.timer("physics.step"):
+                step_space(self.space, dt)
+        else:
+            step_space(self.space, dt)
+        self.sim_time += dt
+        self.step_count += 1
+        
+        if self.step_count % self.substeps == 0:
+            for bumper in self.bumpers:
+                bumper.update()
+        
+        if self.recorder:
+            self.recorder.after_step(self)
+        
     def update(self):
-        dt = 1.0 / 90.0
-        for _ in range(2):
-            self.check_ball_bounds()
-            self.space.step(dt)
+        for _ in range(self.substeps):
+            self.step()
             
-        for bumper in self.bumpers:
-            bumper.update()
+        self.interpolation_alpha = 1.0
+        self.end_frame()
+        
+    def advance(self, elapsed):
+        dt = 1.0 / self.physics_rate
+        self.accumulator += elapsed * self.time_scale
+        
+        steps = 0
+        while self.accumulator >= dt and steps < self.max_steps_per_frame:
+            self.step()
+            self.accumulator -= dt
+            steps += 1
+            
+        if self.accumulator >= dt:
+            self.accumulator %= dt
             
-        current_time = time.time()
-        if current_time - self.last_position_update >= self.position_update_interval:
-            self.last_position_update = current_time
-            self.publish_ball_position()
+        self.interpolation_alpha = self.accumulator / dt
+        
+        if steps > 0:
+            self.end_frame()
+            
+        return steps
+        
+    def interpolated_ball_position(self):
+        current = self.ball_shape.body.position
+        if self.previous_ball_position is None:
+            return current
+        return self.previous_ball_position + (current - self.previous_ball_position) * self.interpolation_alpha
+        
+    def end_frame(self):
+        if self.position_stream:
+            self.stream_ball_position()
+        else:
+            current_time = time.time()
+            if current_time - self.last_position_update >= self.position_update_interval:
+                self.last_position_update = current_time
+                self.publish_ball_position()
+            
+        self.mqtt.flush()
     
     def publish_ball_position(self):
         if self.ball_shape and hasattr(self.ball_shape, 'body'):
             position = self.ball_shape.body.position
             velocity = self.ball_shape.body.velocity
             self.mqtt.publish_ball_position(position.x, position.y, velocity.x, velocity.y)
+        
+        if self.multiball:
+            self.mqtt.publish(BALL_POSITIONS_TOPIC, {"balls": self.multiball.telemetry(), "timestamp": time.time()})
+    
+    def enable_position_streaming(self, tolerance=4.0, keyframe_interval=1.0):
+        self.position_stream = DeadReckoningPublisher(self.space.gravity, tolerance, keyframe_interval,
+                                                      epoch=time.time() - self.sim_time)
+        
+    def stream_ball_position(self):
+        position = self.ball_shape.body.position
+        velocity = self.ball_shape.body.velocity
+        
+        kind = self.position_stream.update(position.x, position.y, velocity.x, velocity.y, self.sim_time)
+        if kind:
+            self.mqtt.publish_ball_position(position.x, position.y, velocity.x, velocity.y,
+                                            timestamp=self.position_stream.epoch + self.sim_time,
+                                            keyframe=kind == KEYFRAME)
     
     def check_ball_bounds(self):
-        if self.ball_shape.body.position.y > self.bottom_y + 800 and not self.game_over:
-            self.game_over = True
-            
-            if self.score > self.highscore:
-                self.highscore = self.score
-                self.save_highscore(self.highscore)
-                
-            self.mqtt.publish_game_status("GAME_OVER", self.score)
-                
-            self.quit_game = True
-            
-            print(f"Ball out of bounds! Game over. Score: {self.score}, Highscore: {self.highscore}")
+        if self.multiball:
+            self.multiball.check_bounds()
             return
         
-        plunger_lane_left = self.right_x - 40
-        plunger_lane_right = self.right_x
+        if self.ball_shape.body.position.y > self.layout.out_of_bounds_y and not self.game_over:
+            self.ball_out_of_bounds()
+            return
+        
+        lane = self.layout.plunger_lane
         
         ball_pos = self.ball_shape.body.position
         ball_vel = self.ball_shape.body.velocity
         
-        if (ball_pos.x > plunger_lane_left - 15 and ball_pos.x < plunger_lane_right + 15 and 
-            ball_pos.y > self.bottom_y and ball_pos.y < self.bottom_y + 150):
+        if (ball_pos.x > lane["left"] - 15 and ball_pos.x < lane["right"] + 15 and 
+            ball_pos.y > lane["top"] and ball_pos.y < lane["bottom"]):
             
             if abs(ball_vel.x) < 10 and abs(ball_vel.y) < 50:
                 self.stuck_frames_count += 1
                 
-                if self.stuck_frames_count > 30:
+                if self.stuck_frames_count >= self.stuck_steps:
                     self.reset_ball()
                     self.stuck_frames_count = 0
             else:
@@ -335,6 +380,72 @@ class GameManager:
         if distance < 20 and ball_pos.y > plunger_pos.y:
             self.reset_ball()
     
+    def ball_out_of_bounds(self):
+        if self.game_over:
+            return
+        
+        self.game_over = True
+        self.record_score()
+            
+        self.mqtt.publish_game_status("GAME_OVER", self.score)
+            
+        self.quit_game = True
+        
+        print(f"Ball out of bounds! Game over. Score: {self.score}, Highscore: {self.highscore}")
+    
+    def start_multiball(self, count=3, collide=True):
+        from game.multiball import MultiBall
+        
+        if self.multiball is None:
+            self.multiball = MultiBall(self, collide)
+        
+        while len(self.multiball.balls) < count:
+            self.multiball.add_ball(velocity=(self.rng.uniform(-150, 150), 0))
+        self.world.tune_broad_phase(self.space, self.ball_shape.radius, len(self.multiball.balls))
+        
+        self.mqtt.publish_game_status("MULTIBALL", len(self.multiball.balls))
+        return self.multiball
+    
+    def end_multiball(self):
+        if self.multiball:
+            self.multiball.end()
+            self.multiball = None
+    
+    def set_primary_ball(self, ball):
+        self.ball = ball
+        self.ball_shape = ball.shape
+        self.previous_ball_position = None
+        self.stuck_frames_count = 0
+        
+        if self.display:
+            self.display.ball_shape = ball.shape
+    
+    def ball_positions(self):
+        if self.multiball:
+            return [ball.body.position for ball in self.multiball.balls[1:]]
+        return []
+    
+    def apply_input(self, action, value=None):
+        if self.recorder:
+            self.recorder.record_input(self.step_count, action, value)
+            
+        if action == LEFT_FLIPPER_ACTIVATE:
+            self.left_flipper.activate()
+        elif action == LEFT_FLIPPER_DEACTIVATE:
+            self.left_flipper.deactivate()
+        elif action == RIGHT_FLIPPER_ACTIVATE:
+            self.right_flipper.activate()
+        elif action == RIGHT_FLIPPER_DEACTIVATE:
+            self.right_flipper.deactivate()
+        elif action == PLUNGER_COMPRESS:
+            if not self.game_over:
+                self.plunger.compress(value)
+        elif action == PLUNGER_LAUNCH:
+            if not self.game_over:
+                self.launch_ball(1.0 if value is None else value)
+        else:
+            print(f"Unknown input action: {action}")
+    
     def launch_ball(self, power=1.0):
         if not self.game_started:
             self.game_started = True
@@ -345,52 +456,149 @@ class GameManager:
         if launched:
             self.mqtt.publish_game_status("BALL_LAUNCHED", power)
             
-    def reset_ball(self):
+    def reset_ball(self, body=None):
+        body = body or self.ball_shape.body
         plunger_y = self.plunger.body.position.y
         
-        self.ball_shape.body.velocity = (0, 0)
-        self.ball_shape.body.angular_velocity = 0
-        self.ball_shape.body.force = (0, 0)
-        self.ball_shape.body.torque = 0
+        body.velocity = (0, 0)
+        body.angular_velocity = 0
+        body.force = (0, 0)
+        body.torque = 0
         
-        lane_center_x = (self.right_x + (self.right_x - 40)) / 2
+        lane_center_x, _ = self.layout.lane_center()
         
-        self.ball_shape.body.position = (lane_center_x, plunger_y - 40)
+        body.position = (lane_center_x, plunger_y - 40)
         
         for _ in range(5):
-            self.ball_shape.body.velocity = (0, 0)
-            self.ball_shape.body.angular_velocity = 0
+            body.velocity = (0, 0)
+            body.angular_velocity = 0
             
         self.mqtt.publish_game_status("BALL_RESET")
     
     def load_highscore(self):
-        try:
-            if os.path.exists('highscore.json'):
-                with open('highscore.json', 'r') as f:
-                    data = json.load(f)
-                    return data.get('highscore', 0)
-        except Exception as e:
-            print(f"Error loading highscore: {e}")
-        
-        return 0
+        return self.leaderboard.highscore(self.table)
     
-    def save_highscore(self, score):
-        try:
-            with open('highscore.json', 'w') as f:
-                json.dump({'highscore': score}, f)
-            print(f"Highscore saved: {score}")
+    def record_score(self):
+        rank = self.leaderboard.submit(self.score, self.player, self.table)
+        
+        if self.score > self.highscore:
+            self.highscore = self.score
+            print(f"Highscore saved: {self.score}")
+            self.mqtt.publish_game_status("NEW_HIGHSCORE", self.score)
             
-            self.mqtt.publish_game_status("NEW_HIGHSCORE", score)
-        except Exception as e:
-            print(f"Error saving highscore: {e}")
+        return rank
+    
+    def snapshot(self):
+        previous = self.previous_ball_position
+        rng_version, rng_state, rng_gauss = self.rng.getstate()
+        
+        return {
+            "ball": self.ball.snapshot(),
+            "flippers": [flipper.snapshot() for flipper in self.get_flippers()],
+            "plunger": self.plunger.snapshot(),
+            "bumpers": [bumper.snapshot() for bumper in self.bumpers],
+            "score": self.score,
+            "game_over": self.game_over,
+            "quit_game": self.quit_game,
+            "game_started": self.game_started,
+            "stuck_frames_count": self.stuck_frames_count,
+            "sim_time": self.sim_time,
+            "step_count": self.step_count,
+            "accumulator": self.accumulator,
+            "interpolation_alpha": self.interpolation_alpha,
+            "previous_ball_position": tuple(previous) if previous is not None else None,
+            "rng": [rng_version, list(rng_state), rng_gauss],
+            "multiball": self.multiball.snapshot() if self.multiball else None
+        }
+    
+    def restore(self, snapshot):
+        multiball = snapshot.get("multiball")
+        if multiball is None:
+            self.end_multiball()
+        else:
+            if self.multiball is None:
+                from game.multiball import MultiBall
+                self.multiball = MultiBall(self, multiball["collide"])
+            self.multiball.restore(multiball)
+        
+        self.ball.restore(snapshot["ball"])
+        for flipper, state in zip(self.get_flippers(), snapshot["flippers"]):
+            flipper.restore(state)
+        self.plunger.restore(snapshot["plunger"])
+        for bumper, state in zip(self.bumpers, snapshot["bumpers"]):
+            bumper.restore(state)
+        
+        self.score = snapshot["score"]
+        self.game_over = snapshot["game_over"]
+        self.quit_game = snapshot["quit_game"]
+        self.game_started = snapshot["game_started"]
+        self.stuck_frames_count = snapshot["stuck_frames_count"]
+        self.sim_time = snapshot["sim_time"]
+        self.step_count = snapshot["step_count"]
+        self.accumulator = snapshot["accumulator"]
+        self.interpolation_alpha = snapshot["interpolation_alpha"]
+        
+        previous = snapshot["previous_ball_position"]
+        self.previous_ball_position = pymunk.Vec2d(*previous) if previous is not None else None
+        
+        rng_version, rng_state, rng_gauss = snapshot["rng"]
+        self.rng.setstate((rng_version, tuple(rng_state), rng_gauss))
+        
+        if self.position_stream:
+            self.position_stream.rebase(self.sim_time)
+    
+    def new_game(self, seed=None, table=None, tuning=None):
+        self.stop_recording()
+        self.end_multiball()
+        
+        if table is not None and load_table(table).source_hash != self.layout.source_hash:
+            self.switch_table(table)
+        else:
+            self.clear_solver_state(self.initial_state)
+        
+        if tuning is not None:
+            self.tuning = make_tuning(tuning)
+            self.apply_tuning()
+        
+        self.seed = seed if seed is not None else random.randrange(2**32)
+        self.rng.seed(self.seed)
+        
+        self.last_position_update = 0
+        if self.position_stream:
+            self.enable_position_streaming(self.position_stream.tolerance, self.position_stream.keyframe_interval)
+        
+        if self.display:
+            self.display.reset()
+        
+        self.mqtt.publish_game_status("READY")
+        self.mqtt.flush()
+        
+    def clear_solver_state(self, snapshot):
+        shapes = [shape for shape in self.space.shapes if shape.body is not self.space.static_body]
+        
+        self.space.remove(*shapes)
+        for flipper in self.get_flippers():
+            flipper.remove_joints()
+        
+        step_space(self.space, 1.0 / self.physics_rate)
+        
+        for flipper in self.get_flippers():
+            flipper.create_joints()
+        self.restore(snapshot)
+        self.space.add(*shapes)
     
     def get_flippers(self):
         return [self.left_flipper, self.right_flipper]
         
     def stop(self):
-        if self.score > self.highscore:
-            self.highscore = self.score
-            self.save_highscore(self.highscore)
+        if not self.game_over:
+            self.record_score()
             
+        self.leaderboard.close()
+        self.stop_recording()
         self.mqtt.publish_game_status("STOPPED")
-        self.mqtt.stop()
\ No newline at end of file
+        self.mqtt.flush(force=True)
+        
+        if self.owns_mqtt:
+            from mqtt.pool import MQTTClientPool
+            MQTTClientPool.release(self.mqtt)
\ No newline at end of file
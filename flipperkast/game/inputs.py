@@ -0,0 +1,13 @@
+# Player inputs shared by Display, the headless runner and scripted input sources
+LEFT_FLIPPER_ACTIVATE = "left_flipper_activate"
+LEFT_FLIPPER_DEACTIVATE = "left_flipper_deactivate"
+RIGHT_FLIPPER_ACTIVATE = "right_flipper_activate"
+RIGHT_FLIPPER_DEACTIVATE = "right_flipper_deactivate"
+PLUNGER_COMPRESS = "plunger_compress"
+PLUNGER_LAUNCH = "plunger_launch"
+
+ALL_INPUTS = (
+    LEFT_FLIPPER_ACTIVATE, LEFT_FLIPPER_DEACTIVATE,
+    RIGHT_FLIPPER_ACTIVATE, RIGHT_FLIPPER_DEACTIVATE,
+    PLUNGER_COMPRESS, PLUNGER_LAUNCH
+)
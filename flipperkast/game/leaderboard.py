@@ -0,0 +1,172 @@
+import json
+import os
+import queue
+import threading
+import time
+
+from game.table_loader import DEFAULT_TABLE
+
+LEADERBOARD_VERSION = 1
+DEFAULT_PLAYER = "Player"
+ENTRY_FIELDS = ("player", "score", "timestamp")
+
+def entry_sort_key(entry):
+    return (-entry["score"], entry["timestamp"])
+
+class Leaderboard:
+    def __init__(self, path='leaderboard.json', max_entries=10, legacy_path='highscore.json', background=True):
+        self.path = path
+        self.max_entries = max_entries
+        self.legacy_path = legacy_path
+        self.tables = {}
+        self.lock = threading.Lock()
+        
+        self.write_queue = None
+        self.writer = None
+        self.write_count = 0
+        self.dirty = False
+        
+        if self.path:
+            self.load()
+            if background:
+                self.write_queue = queue.Queue()
+                self.writer = threading.Thread(target=self.write_loop)
+                self.writer.daemon = True
+                self.writer.start()
+    
+    def submit(self, score, player=DEFAULT_PLAYER, table=DEFAULT_TABLE, timestamp=None):
+        if score <= 0:
+            return None
+        
+        entry = {
+            "player": player,
+            "score": score,
+            "timestamp": time.time() if timestamp is None else timestamp,
+            "table": table
+        }
+        
+        with self.lock:
+            entries = self.tables.setdefault(table, [])
+            entries.append(entry)
+            entries.sort(key=entry_sort_key)
+            del entries[self.max_entries:]
+            
+            rank = next((index + 1 for index, existing in enumerate(entries) if existing is entry), None)
+        
+        if rank is not None:
+            self.schedule_write()
+        return rank
+    
+    def top(self, n=10, table=None):
+        with self.lock:
+            if table is not None:
+                return [dict(entry) for entry in self.tables.get(table, [])[:n]]
+            
+            entries = [entry for entries in self.tables.values() for entry in entries]
+        
+        entries.sort(key=entry_sort_key)
+        return [dict(entry) for entry in entries[:n]]
+    
+    def highscore(self, table=None):
+        best = self.top(1, table)
+        return best[0]["score"] if best else 0
+    
+    def qualifies(self, score, table=DEFAULT_TABLE):
+        with self.lock:
+            entries = self.tables.get(table, [])
+            return score > 0 and (len(entries) < self.max_entries or score > entries[-1]["score"])
+    
+    def all_entries(self):
+        with self.lock:
+            return [dict(entry) for table in sorted(self.tables) for entry in self.tables[table]]
+    
+    def schedule_write(self):
+        if not self.path:
+            return
+        
+        self.dirty = True
+        if self.write_queue is None:
+            self.dirty = False
+            self.write(self.all_entries())
+        else:
+            self.write_queue.put(True)
+    
+    def write_loop(self):
+        while True:
+            item = self.write_queue.get()
+            
+            if self.dirty:
+                self.dirty = False
+                self.write(self.all_entries())
+            self.write_queue.task_done()
+            
+            if item is None:
+                return
+    
+    def write(self, entries):
+        try:
+            temp_path = self.path + ".tmp"
+            with open(temp_path, 'w') as f:
+                json.dump({"version": LEADERBOARD_VERSION, "entries": entries}, f, indent=2)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, self.path)
+            self.write_count += 1
+        except Exception as e:
+            print(f"Error saving leaderboard: {e}")
+    
+    def flush(self):
+        if self.write_queue is not None:
+            self.write_queue.join()
+    
+    def close(self):
+        if self.writer is not None and self.writer.is_alive():
+            self.write_queue.put(None)
+            self.writer.join(timeout=2.0)
+    
+    def load(self):
+        try:
+            if os.path.exists(self.path):
+                with open(self.path, 'r') as f:
+                    data = json.load(f)
+                for entry in data.get("entries", []):
+                    missing = [field for field in ENTRY_FIELDS if field not in entry]
+                    if missing:
+                        raise ValueError(f"entry {entry!r} is missing {', '.join(missing)}")
+                    self.tables.setdefault(entry.get("table", DEFAULT_TABLE), []).append(entry)
+            elif self.legacy_path and os.path.exists(self.legacy_path):
+                self.migrate_legacy()
+            
+            for entries in self.tables.values():
+                entries.sort(key=entry_sort_key)
+                del entries[self.max_entries:]
+        except Exception as e:
+            print(f"Error loading leaderboard: {e}")
+            self.tables = {}
+            self.set_aside()
+    
+    def set_aside(self):
+        if not os.path.exists(self.path):
+            return
+        
+        corrupt_path = self.path + ".corrupt"
+        try:
+            os.replace(self.path, corrupt_path)
+            print(f"Moved unreadable leaderboard to {corrupt_path}")
+        except OSError as e:
+            print(f"Could not move unreadable leaderboard aside, scores will not be saved: {e}")
+            self.path = None
+    
+    def migrate_legacy(self):
+        with open(self.legacy_path, 'r') as f:
+            highscore = json.load(f).get('highscore', 0)
+        
+        if highscore > 0:
+            self.tables[DEFAULT_TABLE] = [{
+                "player": DEFAULT_PLAYER,
+                "score": highscore,
+                "timestamp": os.path.getmtime(self.legacy_path),
+                "table": DEFAULT_TABLE
+            }]
+            self.write(self.all_entries())
+            print(f"Migrated highscore {highscore} from {self.legacy_path} to {self.path}")
@@ -0,0 +1,190 @@
+import numpy as np
+import pymunk
+import pymunk.batch
+
+from game.ball import Ball
+
+NO_COLLIDE_GROUP = 1
+SPAWN_COLUMNS = 8
+SPAWN_ROWS = 8
+SPAWN_SPACING = 34
+BODY_FIELDS = pymunk.batch.BodyFields.BODY_ID | pymunk.batch.BodyFields.POSITION | pymunk.batch.BodyFields.VELOCITY
+
+class MultiBall:
+    def __init__(self, game_manager, collide=True):
+        self.game_manager = game_manager
+        self.collide = collide
+        self.balls = [game_manager.ball]
+        self.draining = set()
+        
+        self.buffer = pymunk.batch.Buffer()
+        self.body_ids = None
+        self.positions = np.zeros((1, 2))
+        self.velocities = np.zeros((1, 2))
+        self.stuck_frames = np.zeros(1, dtype=np.int32)
+        
+        if not collide:
+            game_manager.ball_shape.filter = pymunk.ShapeFilter(group=NO_COLLIDE_GROUP)
+        self.sync()
+    
+    def spawn_position(self, index):
+        spawn_x, spawn_y = self.game_manager.layout.multiball_spawn
+        row, column = divmod(index % (SPAWN_COLUMNS * SPAWN_ROWS), SPAWN_COLUMNS)
+        x = spawn_x + (column - (SPAWN_COLUMNS - 1) / 2) * SPAWN_SPACING
+        y = spawn_y + row * SPAWN_SPACING
+        return (x, y)
+    
+    def add_ball(self, position=None, velocity=(0, 0)):
+        game_manager = self.game_manager
+        primary = game_manager.ball_shape
+        
+        if position is None:
+            position = self.spawn_position(len(self.balls) - 1)
+        
+        ball = Ball(game_manager.space, position=position, radius=primary.radius)
+        ball.shape.density = primary.density
+        ball.shape.collision_type = primary.collision_type
+        ball.shape.filter = primary.filter
+        ball.body.velocity = velocity
+        
+        self.balls.append(ball)
+        self.body_ids = None
+        self.stuck_frames = np.append(self.stuck_frames, 0).astype(np.int32)
+        
+        if game_manager.profiler:
+            game_manager.enable_profiling(game_manager.profiler)
+        
+        return ball
+    
+    def remove_ball(self, ball):
+        if ball not in self.balls or len(self.balls) == 1:
+            return False
+        
+        game_manager = self.game_manager
+        index = self.balls.index(ball)
+        
+        game_manager.space.remove(ball.body, ball.shape)
+        game_manager.shapes.unregister(ball.shape)
+        del self.balls[index]
+        self.body_ids = None
+        self.stuck_frames = np.delete(self.stuck_frames, index)
+        
+        if index == 0:
+            game_manager.set_primary_ball(self.balls[0])
+        
+        if len(self.balls) == 1:
+            game_manager.end_multiball()
+        else:
+            self.sync()
+        return True
+    
+    def drain(self, ball, immediate=False):
+        if ball is None or ball not in self.balls:
+            return False
+        if ball in self.draining:
+            return True
+        if len(self.balls) - len(self.draining) <= 1:
+            return False
+        
+        game_manager = self.game_manager
+        if immediate:
+            self.remove_ball(ball)
+        else:
+            self.draining.add(ball)
+            game_manager.space.add_post_step_callback(self.remove_drained, ball)
+        
+        game_manager.mqtt.publish_game_status("BALL_DRAINED", len(self.balls) - len(self.draining))
+        return True
+    
+    def remove_drained(self, space, ball):
+        self.draining.discard(ball)
+        self.remove_ball(ball)
+    
+    def sync(self):
+        self.buffer.clear()
+        pymunk.batch.get_space_bodies(self.game_manager.space, BODY_FIELDS, self.buffer)
+        
+        if self.body_ids is None:
+            self.body_ids = np.array([ball.body.id for ball in self.balls], dtype=np.uintp)
+        
+        ids = np.frombuffer(self.buffer.int_buf(), dtype=np.uintp)
+        data = np.frombuffer(self.buffer.float_buf()).reshape(-1, 4)
+        order = np.argsort(ids)
+        rows = data[order[np.searchsorted(ids, self.body_ids, sorter=order)]]
+        
+        self.positions = rows[:, :2]
+        self.velocities = rows[:, 2:]
+    
+    def check_bounds(self):
+        game_manager = self.game_manager
+        self.sync()
+        
+        x, y = self.positions.T
+        
+        layout = game_manager.layout
+        lost = y > layout.out_of_bounds_y
+        
+        lane = layout.plunger_lane
+        lane_center = layout.lane_center()
+        lane_half_size = ((lane["right"] - lane["left"]) / 2 + 15, (lane["bottom"] - lane["top"]) / 2)
+        in_lane = (np.abs(self.positions - lane_center) < lane_half_size).all(axis=1)
+        slow = (np.abs(self.velocities) < (10, 50)).all(axis=1)
+        
+        self.stuck_frames = np.where(in_lane, (self.stuck_frames + 1) * slow, self.stuck_frames)
+        stuck = self.stuck_frames >= game_manager.stuck_steps
+        
+        plunger_pos = game_manager.plunger.body.position
+        offset = self.positions - plunger_pos
+        on_plunger = ((offset * offset).sum(axis=1) < 400) & (y > plunger_pos.y)
+        
+        if not (lost | stuck | on_plunger).any():
+            return
+        
+        self.stuck_frames[stuck] = 0
+        for index in np.flatnonzero((stuck | on_plunger) & ~lost):
+            game_manager.reset_ball(self.balls[index].body)
+        
+        for ball in [self.balls[index] for index in np.flatnonzero(lost)]:
+            if not self.drain(ball, immediate=True):
+                game_manager.ball_out_of_bounds()
+    
+    def telemetry(self):
+        self.sync()
+        return np.hstack((self.positions, self.velocities)).round(2).tolist()
+    
+    def end(self):
+        game_manager = self.game_manager
+        
+        for ball in self.balls[1:]:
+            game_manager.space.remove(ball.body, ball.shape)
+            game_manager.shapes.unregister(ball.shape)
+        
+        self.balls = self.balls[:1]
+        self.body_ids = None
+        self.draining = set()
+        self.stuck_frames = np.zeros(1, dtype=np.int32)
+        game_manager.ball_shape.filter = pymunk.ShapeFilter()
+    
+    def snapshot(self):
+        return {
+            "collide": self.collide,
+            "balls": [ball.snapshot() for ball in self.balls[1:]],
+            "stuck_frames": self.stuck_frames.tolist()
+        }
+    
+    def restore(self, state):
+        while len(self.balls) - 1 > len(state["balls"]):
+            ball = self.balls.pop()
+            self.body_ids = None
+            self.game_manager.space.remove(ball.body, ball.shape)
+            self.game_manager.shapes.unregister(ball.shape)
+        
+        while len(self.balls) - 1 < len(state["balls"]):
+            self.add_ball()
+        
+        for ball, ball_state in zip(self.balls[1:], state["balls"]):
+            ball.restore(ball_state)
+        
+        self.draining = set()
+        self.stuck_frames = np.array(state["stuck_frames"], dtype=np.int32)
+        self.sync()
@@ -1,6 +1,8 @@
 import pymunk
-import pygame
 import math
+from game.shape_registry import ShapeRegistry
+from game.world_builder import reindex_body
+from game.tuning import DEFAULT_TUNING
 
 class Plunger:
     def __init__(self, space, position):
@@ -8,7 +10,7 @@ class Plunger:
         self.position = position
         self.compression = 0
         self.max_compression = 50
-        self.spring_constant = 500.0
+        self.spring_constant = DEFAULT_TUNING["plunger_spring_constant"]
         
         self.body = pymunk.Body(body_type=pymunk.Body.KINEMATIC)
         self.body.position = position
@@ -23,14 +25,19 @@ class Plunger:
         
         self.space.add(self.body, self.shape, self.sensor)
         
+        self.registry = ShapeRegistry.for_space(space)
+        self.registry.register(self.shape, self)
+        self.registry.register(self.sensor, self)
+        
         handler = space.add_collision_handler(1, 3)
         handler.separate = self.on_ball_separate_from_sensor
     
     def on_ball_separate_from_sensor(self, arbiter, space, data):
-        ball_shape = arbiter.shapes[0] if arbiter.shapes[0].collision_type == 1 else arbiter.shapes[1]
+        ball_shape, sensor_shape = arbiter.shapes
+        plunger = self.registry.owner(sensor_shape) or self
         
-        if ball_shape.body.position.y > self.body.position.y and ball_shape.body.velocity.y > 0:
-            ball_shape.body.position = (ball_shape.body.position.x, self.body.position.y - 30)
+        if ball_shape.body.position.y > plunger.body.position.y and ball_shape.body.velocity.y > 0:
+            ball_shape.body.position = (ball_shape.body.position.x, plunger.body.position.y - 30)
             ball_shape.body.velocity = (ball_shape.body.velocity.x, -100)
         
         return True
@@ -38,6 +45,7 @@ class Plunger:
     def compress(self, amount):
         self.compression = min(self.max_compression, amount)
         self.body.position = (self.position[0], self.position[1] + self.compression)
+        reindex_body(self.space, self.body)
     
     def launch(self, ball_body, power=1.0):
         if self.compression > 0:
@@ -58,18 +66,34 @@ class Plunger:
             
             self.compression = 0
             self.body.position = self.position
+            reindex_body(self.space, self.body)
             return True
         return False
     
+    def snapshot(self):
+        return {
+            "compression": self.compression,
+            "position": tuple(self.body.position)
+        }
+    
+    def restore(self, state):
+        self.compression = state["compression"]
+        self.body.position = state["position"]
+        reindex_body(self.space, self.body)
+    
     def draw(self, screen):
+        import pygame
+        
         start_pos = (self.position[0], self.position[1] + self.max_compression)
         end_pos = (self.position[0], self.position[1] + self.compression)
         
-        pygame.draw.line(screen, (100, 100, 100), start_pos, end_pos, 6)
+        rect = pygame.draw.line(screen, (100, 100, 100), start_pos, end_pos, 6)
         
-        pygame.draw.circle(
+        circle_rect = pygame.draw.circle(
             screen,
             (150, 150, 150),
             (int(self.body.position.x), int(self.body.position.y)),
             20
-        )
\ No newline at end of file
+        )
+        
+        return rect.union(circle_rect)
@@ -1,20 +1,47 @@
-from mqtt.mqtt_client import MQTTClient
-from mqtt.topics import SCORE_TOPIC
+import json
+
+from mqtt.pool import MQTTClientPool
+from mqtt.topics import SCORE_TOPIC, BALL_POSITION_TOPIC, BALL_POSITION_FORMAT_TOPIC
+from mqtt.position_codec import get_decoder
 
 class ScorePanel:
-    def __init__(self):
+    def __init__(self, mqtt_client=None):
         self.scores = {"Player": 0}
         self.highscore = 0
-        self.mqtt = MQTTClient()
-        self.mqtt.client.on_message = self.on_message
-        self.mqtt.client.subscribe(SCORE_TOPIC)
-        self.mqtt.start()
+        self.ball_position = None
+        self.position_decoder = get_decoder()
+        
+        self.owns_mqtt = mqtt_client is None
+        self.mqtt = mqtt_client or MQTTClientPool.acquire()
+        self.subscribers = [
+            self.mqtt.subscriber(SCORE_TOPIC, self.on_score),
+            self.mqtt.subscriber(BALL_POSITION_FORMAT_TOPIC, self.on_position_format),
+            self.mqtt.subscriber(BALL_POSITION_TOPIC, self.on_ball_position)
+        ]
+        self.mqtt.start_async()
+    
+    def stop(self):
+        for subscriber in self.subscribers:
+            subscriber.close()
+        self.subscribers = []
+        
+        if self.owns_mqtt:
+            MQTTClientPool.release(self.mqtt)
     
-    def on_message(self, client, userdata, msg):
-        score = int(msg.payload.decode())
+    def on_score(self, payload):
+        score = int(payload)
         self.scores["Player"] += score
 
         if self.scores["Player"] > self.highscore:
             self.highscore = self.scores["Player"]
             
-        print(f"Score: {self.scores['Player']} | Highscore: {self.highscore}")
\ No newline at end of file
+        print(f"Score: {self.scores['Player']} | Highscore: {self.highscore}")
+        
+    def on_position_format(self, payload):
+        self.position_decoder = get_decoder(json.loads(payload))
+        print(f"Ball position encoding: {self.position_decoder.encoding}")
+        
+    def on_ball_position(self, payload):
+        samples = self.position_decoder.decode(payload)
+        if samples:
+            self.ball_position = samples[-1]
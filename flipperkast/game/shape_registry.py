@@ -0,0 +1,26 @@
+class ShapeRegistry:
+    def __init__(self):
+        self.owners = {}
+        
+    @staticmethod
+    def for_space(space):
+        registry = getattr(space, "shape_registry", None)
+        if registry is None:
+            registry = ShapeRegistry()
+            space.shape_registry = registry
+        return registry
+        
+    def register(self, shape, owner):
+        self.owners[shape] = owner
+        
+    def unregister(self, shape):
+        self.owners.pop(shape, None)
+        
+    def owner(self, shape):
+        return self.owners.get(shape)
+        
+    def owners_of_type(self, owner_type):
+        return [owner for owner in self.owners.values() if isinstance(owner, owner_type)]
+        
+    def __len__(self):
+        return len(self.owners)
@@ -0,0 +1,199 @@
+import hashlib
+import json
+import math
+import os
+import pickle
+import tomllib
+
+DEFAULT_TABLE = "default"
+TABLE_FORMAT_VERSION = 1
+TABLES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "tables")
+TABLE_EXTENSIONS = (".json", ".toml")
+CACHE_ENV = "FLIPPERKAST_TABLE_CACHE"
+
+WALL_DEFAULTS = {"radius": 3.0, "elasticity": 0.7, "friction": 0.5}
+SCORING_DEFAULTS = {"bumper_points": 10, "bumper_cooldown": 0.1}
+SENSOR_COLLISION_TYPES = {"drain": 99}
+
+loaded_layouts = {}
+
+def table_cache_dir(environ=None):
+    environ = os.environ if environ is None else environ
+    if CACHE_ENV in environ:
+        return environ[CACHE_ENV] or None
+    
+    base = environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "flipperkast", "tables")
+
+def point(value, name):
+    if not isinstance(value, (list, tuple)) or len(value) != 2:
+        raise ValueError(f"{name} must be an [x, y] pair, got {value!r}")
+    return (value[0], value[1])
+
+def arc_segments(arc, wall):
+    center = point(arc["center"], f"arc {arc.get('id')} center")
+    radius = arc["radius"]
+    count = arc.get("segments", 20)
+    start = math.radians(arc["start"])
+    span = math.radians(arc["end"]) - start
+    
+    points = []
+    for i in range(count + 1):
+        angle = start + (i * span / count)
+        points.append((center[0] + radius * math.cos(angle), center[1] + radius * math.sin(angle)))
+    
+    return [dict(wall, id=f"{arc.get('id', 'arc')}_{i}", a=points[i], b=points[i + 1], sensor=None, visible=True)
+            for i in range(count)]
+
+def compile_wall(entry, wall):
+    if entry.get("type", "segment") == "arc":
+        return arc_segments(entry, dict(wall, **{key: entry[key] for key in ("elasticity", "friction") if key in entry}))
+    
+    sensor = entry.get("sensor")
+    if sensor is not None and sensor not in SENSOR_COLLISION_TYPES:
+        raise ValueError(f"Unknown sensor type {sensor!r} for wall {entry.get('id')}")
+    
+    segment = dict(wall, **{key: entry[key] for key in ("radius", "elasticity", "friction") if key in entry})
+    segment.update(
+        id=entry.get("id"),
+        a=point(entry["a"], f"wall {entry.get('id')} a"),
+        b=point(entry["b"], f"wall {entry.get('id')} b"),
+        sensor=sensor,
+        visible=entry.get("visible", True)
+    )
+    return [segment]
+
+class TableLayout:
+    def __init__(self, name, walls, bumpers, flippers, plunger, ball, plunger_lane, multiball_spawn,
+                 out_of_bounds_y, source_hash=None):
+        self.name = name
+        self.walls = walls
+        self.bumpers = bumpers
+        self.flippers = flippers
+        self.plunger = plunger
+        self.ball = ball
+        self.plunger_lane = plunger_lane
+        self.multiball_spawn = multiball_spawn
+        self.out_of_bounds_y = out_of_bounds_y
+        self.source_hash = source_hash
+        self.cache_key = None
+    
+    @staticmethod
+    def from_dict(data, source_hash=None):
+        name = data.get("name", DEFAULT_TABLE)
+        
+        try:
+            wall = dict(WALL_DEFAULTS, **data.get("wall", {}))
+            walls = [segment for entry in data["walls"] for segment in compile_wall(entry, wall)]
+            
+            scoring = dict(SCORING_DEFAULTS, **data.get("scoring", {}))
+            bumpers = [{
+                "id": bumper["id"],
+                "position": point(bumper["position"], f"bumper {bumper['id']} position"),
+                "radius": bumper.get("radius", 20),
+                "points": bumper.get("points", scoring["bumper_points"]),
+                "cooldown": bumper.get("cooldown", scoring["bumper_cooldown"])
+            } for bumper in data.get("bumpers", [])]
+            
+            flippers = {flipper["side"]: point(flipper["position"], f"{flipper['side']} flipper position")
+                        for flipper in data["flippers"]}
+            if sorted(flippers) != ["left", "right"]:
+                raise ValueError(f"expected one left and one right flipper, got {sorted(flippers)}")
+            
+            ball = {
+                "position": point(data["ball"]["position"], "ball position"),
+                "radius": data["ball"].get("radius", 15),
+                "density": data["ball"].get("density", 0.02)
+            }
+            lane = {side: data["plunger_lane"][side] for side in ("left", "right", "top", "bottom")}
+            
+            return TableLayout(
+                name, walls, bumpers, flippers,
+                {"position": point(data["plunger"]["position"], "plunger position")},
+                ball, lane,
+                point(data["multiball_spawn"], "multiball_spawn"),
+                data["out_of_bounds_y"],
+                source_hash
+            )
+        except KeyError as e:
+            raise ValueError(f"Table {name} is missing required field {e}") from e
+        except ValueError as e:
+            raise ValueError(f"Table {name}: {e}") from e
+    
+    def lane_center(self):
+        lane = self.plunger_lane
+        return ((lane["left"] + lane["right"]) / 2, (lane["top"] + lane["bottom"]) / 2)
+
+def table_path(table):
+    if os.path.isfile(table):
+        return table
+    
+    for extension in TABLE_EXTENSIONS:
+        path = os.path.join(TABLES_DIR, table + extension)
+        if os.path.isfile(path):
+            return path
+    
+    raise FileNotFoundError(f"No table definition named {table} in {TABLES_DIR}")
+
+def parse_table(path):
+    with open(path, 'rb') as f:
+        source = f.read()
+    
+    if path.endswith(".toml"):
+        data = tomllib.loads(source.decode("utf-8"))
+    else:
+        data = json.loads(source)
+    
+    data.setdefault("name", os.path.splitext(os.path.basename(path))[0])
+    return TableLayout.from_dict(data, hashlib.sha256(source).hexdigest())
+
+def cache_path(path, cache_dir):
+    name = os.path.splitext(os.path.basename(path))[0]
+    digest = hashlib.sha1(os.path.abspath(path).encode("utf-8")).hexdigest()[:8]
+    return os.path.join(cache_dir, f"{name}-{digest}.pickle")
+
+def read_cache(path, key):
+    try:
+        with open(path, 'rb') as f:
+            cached_key, layout = pickle.load(f)
+    except (OSError, EOFError, AttributeError, ValueError, pickle.UnpicklingError):
+        return None
+    
+    return layout if cached_key == key else None
+
+def write_cache(path, key, layout):
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(temp_path, 'wb') as f:
+            pickle.dump((key, layout), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, path)
+    except OSError as e:
+        print(f"Could not write table cache {path}: {e}")
+
+def load_table(table=DEFAULT_TABLE, cache_dir=None):
+    if isinstance(table, TableLayout):
+        return table
+    
+    if cache_dir is None:
+        cache_dir = table_cache_dir()
+    
+    path = table_path(table)
+    stat = os.stat(path)
+    key = (TABLE_FORMAT_VERSION, stat.st_mtime_ns, stat.st_size)
+    
+    layout = loaded_layouts.get(path)
+    if layout is not None and layout.cache_key == key:
+        return layout
+    
+    compiled_path = cache_path(path, cache_dir) if cache_dir else None
+    layout = read_cache(compiled_path, key) if compiled_path else None
+    
+    if layout is None:
+        layout = parse_table(path)
+        layout.cache_key = key
+        if compiled_path:
+            write_cache(compiled_path, key, layout)
+    
+    loaded_layouts[path] = layout
+    return layout
@@ -0,0 +1,16 @@
+DEFAULT_TUNING = {
+    "bumper_elasticity": 1.2,
+    "bumper_kick": 150,
+    "flipper_impulse": 500,
+    "flipper_speed_factor": 0.8,
+    "plunger_spring_constant": 500.0,
+    "damping": 0.95
+}
+
+def make_tuning(overrides=None):
+    overrides = overrides or {}
+    unknown = sorted(set(overrides) - set(DEFAULT_TUNING))
+    if unknown:
+        raise ValueError(f"Unknown tuning parameters: {', '.join(unknown)}")
+    
+    return dict(DEFAULT_TUNING, **overrides)
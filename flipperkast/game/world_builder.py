@@ -0,0 +1,76 @@
+import math
+import pymunk
+
+from game.tuning import DEFAULT_TUNING
+
+QUALITY_PRESETS = {
+    "low": {"physics_rate": 45.0, "iterations": 6},
+    "standard": {"physics_rate": 90.0, "iterations": 10},
+    "high": {"physics_rate": 180.0, "iterations": 20}
+}
+DEFAULT_QUALITY = "standard"
+
+FRAME_SIM_TIME = 2 / 90.0
+TIME_SCALE = 120.0 / 90.0
+STUCK_TIMEOUT = 0.34
+MAX_CATCH_UP_TIME = 8 / 90.0
+
+SPATIAL_HASH_MIN_BALLS = 1000
+SPATIAL_HASH_CELL_RADII = 4
+SPATIAL_HASH_MIN_CELLS = 1000
+
+def reindex_after_step(space, body):
+    space.reindex_shapes_for_body(body)
+
+def reindex_body(space, body):
+    if getattr(space, "stepping", False):
+        space.add_post_step_callback(reindex_after_step, body)
+    else:
+        space.reindex_shapes_for_body(body)
+
+def step_space(space, dt):
+    space.stepping = True
+    try:
+        space.step(dt)
+    finally:
+        space.stepping = False
+
+class WorldBuilder:
+    def __init__(self, quality=DEFAULT_QUALITY, use_spatial_hash=None):
+        if quality not in QUALITY_PRESETS:
+            raise ValueError(f"Unknown physics quality: {quality}")
+        
+        self.quality = quality
+        self.use_spatial_hash = use_spatial_hash
+        
+        preset = QUALITY_PRESETS[quality]
+        self.physics_rate = preset["physics_rate"]
+        self.iterations = preset["iterations"]
+        self.substeps = max(1, round(self.physics_rate * FRAME_SIM_TIME))
+    
+    def create_space(self, damping=DEFAULT_TUNING["damping"]):
+        space = pymunk.Space()
+        space.gravity = (0.0, 500.0)
+        space.damping = damping
+        space.iterations = self.iterations
+        return space
+    
+    def configure_timing(self, game_manager):
+        game_manager.physics_rate = self.physics_rate
+        game_manager.substeps = self.substeps
+        game_manager.time_scale = TIME_SCALE
+        game_manager.stuck_steps = math.ceil(STUCK_TIMEOUT * self.physics_rate)
+        game_manager.max_steps_per_frame = max(1, round(MAX_CATCH_UP_TIME * self.physics_rate))
+    
+    def tune_broad_phase(self, space, ball_radius, ball_count=1):
+        wanted = self.use_spatial_hash
+        if wanted is None:
+            wanted = ball_count >= SPATIAL_HASH_MIN_BALLS
+        
+        if wanted and getattr(space, "spatial_hash_cell_size", None) is None:
+            cell_size = ball_radius * SPATIAL_HASH_CELL_RADII
+            cells = max(SPATIAL_HASH_MIN_CELLS, len(space.shapes) * 10)
+            space.use_spatial_hash(cell_size, cells)
+            space.spatial_hash_cell_size = cell_size
+        
+        return getattr(space, "spatial_hash_cell_size", None) is not None
@@ -0,0 +1,112 @@
+import csv
+import json
+import time
+from collections import deque
+
+from mqtt.topics import METRICS_TOPIC
+
+def percentile(samples, fraction):
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+class Timer:
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+        self.start = 0.0
+        
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+        
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.profiler.record(self.name, time.perf_counter() - self.start)
+        return False
+
+class Profiler:
+    def __init__(self, history=600):
+        self.history = history
+        self.frame_times = {}
+        self.frame_calls = {}
+        self.current_times = {}
+        self.current_calls = {}
+        self.total_calls = {}
+        self.frames = 0
+        
+    def record(self, name, seconds):
+        self.current_times[name] = self.current_times.get(name, 0.0) + seconds
+        self.count(name)
+        
+    def count(self, name, amount=1):
+        self.current_calls[name] = self.current_calls.get(name, 0) + amount
+        self.total_calls[name] = self.total_calls.get(name, 0) + amount
+        
+    def timer(self, name):
+        return Timer(self, name)
+        
+    def wrap(self, name, function):
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                self.record(name, time.perf_counter() - start)
+        
+        timed.profiled_function = function
+        return timed
+        
+    def end_frame(self):
+        for name in set(self.frame_calls) | set(self.current_calls):
+            if name not in self.frame_calls:
+                self.frame_calls[name] = deque(maxlen=self.history)
+                self.frame_times[name] = deque(maxlen=self.history)
+            self.frame_calls[name].append(self.current_calls.get(name, 0))
+            self.frame_times[name].append(self.current_times.get(name, 0.0) * 1000)
+        
+        self.current_times = {}
+        self.current_calls = {}
+        self.frames += 1
+        
+    def summary(self):
+        steps = self.total_calls.get("physics.step", 0)
+        metrics = {}
+        
+        for name, samples in self.frame_times.items():
+            samples = list(samples)
+            calls = list(self.frame_calls[name])
+            metrics[name] = {
+                "p50_ms": percentile(samples, 0.50),
+                "p95_ms": percentile(samples, 0.95),
+                "p99_ms": percentile(samples, 0.99),
+                "max_ms": max(samples) if samples else 0.0,
+                "calls_per_frame": sum(calls) / len(calls) if calls else 0.0,
+                "calls_per_step": self.total_calls[name] / steps if steps else None,
+                "total_calls": self.total_calls[name]
+            }
+        
+        return {"frames": self.frames, "steps": steps, "metrics": metrics}
+    
+    def write_json(self, path):
+        with open(path, 'w') as f:
+            json.dump(self.summary(), f, indent=2)
+            
+    def write_csv(self, path):
+        summary = self.summary()
+        fields = ["p50_ms", "p95_ms", "p99_ms", "max_ms", "calls_per_frame", "calls_per_step", "total_calls"]
+        
+        with open(path, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(["name"] + fields)
+            for name in sorted(summary["metrics"]):
+                writer.writerow([name] + [summary["metrics"][name][field] for field in fields])
+                
+    def write(self, path):
+        if path.endswith(".csv"):
+            self.write_csv(path)
+        else:
+            self.write_json(path)
+            
+    def publish(self, mqtt_client):
+        return mqtt_client.publish(METRICS_TOPIC, self.summary())
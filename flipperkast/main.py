@@ -1,9 +1,54 @@
-from game.game_manager import GameManager
-from display import Display
+import sys
+import time
 
-def main():
-    game_manager = GameManager()
+def report_startup(started, timings):
+    steps = ", ".join(f"{name} {seconds * 1000:.1f} ms" for name, seconds in timings)
+    print(f"Startup: {steps}, total {(time.perf_counter() - started) * 1000:.1f} ms")
+
+def option_value(name, default=None):
+    if name not in sys.argv:
+        return None
+    index = sys.argv.index(name)
+    return sys.argv[index + 1] if len(sys.argv) > index + 1 else default
+
+def main(profile_path=None, record_path=None, quality=None, table=None, position_encoding=None,
+         stream_positions=False):
+    started = time.perf_counter()
+    timings = []
+    
+    if position_encoding:
+        from mqtt.position_codec import check_encoding
+        check_encoding(position_encoding)
+    
+    mark = time.perf_counter()
+    from game.game_manager import GameManager
+    from game.world_builder import WorldBuilder, DEFAULT_QUALITY
+    from game.table_loader import DEFAULT_TABLE
+    timings.append(("import game", time.perf_counter() - mark))
+    
+    mark = time.perf_counter()
+    game_manager = GameManager(world=WorldBuilder(quality or DEFAULT_QUALITY), table=table or DEFAULT_TABLE)
+    timings.append(("build world", time.perf_counter() - mark))
+    
+    if position_encoding:
+        game_manager.mqtt.set_position_encoding(position_encoding)
+    if stream_positions:
+        game_manager.enable_position_streaming()
+    
+    if record_path:
+        game_manager.start_recording(record_path)
     
+    profiler = None
+    if profile_path:
+        from instrumentation.profiler import Profiler
+        profiler = Profiler()
+        game_manager.enable_profiling(profiler)
+    
+    mark = time.perf_counter()
+    from display import Display
+    timings.append(("import display", time.perf_counter() - mark))
+    
+    mark = time.perf_counter()
     display = Display(
         game_manager.space,
         game_manager.ball_shape,
@@ -11,11 +56,96 @@ def main():
         bumpers=game_manager.bumpers,
         plunger=game_manager.plunger
     )
+    timings.append(("open window", time.perf_counter() - mark))
+    report_startup(started, timings)
     
     try:
         display.run(game_manager)
     finally:
+        if profiler:
+            profiler.write(profile_path)
+            profiler.publish(game_manager.mqtt)
+            game_manager.mqtt.flush(force=True)
+            print(f"Profile written to {profile_path}")
         game_manager.stop()
+        if record_path:
+            print(f"Replay written to {record_path}")
+
+def main_headless(profile_path=None, table=None):
+    from game.table_loader import DEFAULT_TABLE
+    from simulation.headless import HeadlessRunner
+    
+    runner = HeadlessRunner(table=table or DEFAULT_TABLE)
+    
+    profiler = None
+    if profile_path:
+        from instrumentation.profiler import Profiler
+        profiler = Profiler()
+        runner.game_manager.enable_profiling(profiler)
+    
+    result = runner.run()
+    print(f"Headless game finished: {result}")
+    
+    if profiler:
+        profiler.write(profile_path)
+        print(f"Profile written to {profile_path}")
+
+def main_replay(path):
+    from simulation.replay import ReplayPlayer
+    
+    player = ReplayPlayer(path)
+    result = player.run()
+    print(f"Replay finished: {result}")
+    
+    for mismatch in player.mismatches:
+        print(f"Checkpoint mismatch at step {mismatch['step']}: expected {mismatch['expected']}, got {mismatch['actual']}")
+
+def main_batch(count, table=None):
+    from game.table_loader import DEFAULT_TABLE
+    from simulation.batch import BatchEngine
+    
+    engine = BatchEngine(layout=table or DEFAULT_TABLE)
+    summary = engine.run_games(count)["summary"]
+    print(f"Batch of {count} games finished: {summary}")
+
+def main_sweep(spec_path):
+    import json
+    from game.table_loader import DEFAULT_TABLE
+    from simulation.sweep import SweepRunner, DEFAULT_SWEEP_CACHE, format_result
+    
+    with open(spec_path, 'r') as f:
+        spec = json.load(f)
+    
+    runner = SweepRunner(
+        games=spec.get("games", 50),
+        base_seed=spec.get("base_seed", 0),
+        max_frames=spec.get("max_frames", 13500),
+        processes=spec.get("processes"),
+        layout=spec.get("table", DEFAULT_TABLE),
+        cache_path=spec.get("cache", DEFAULT_SWEEP_CACHE)
+    )
+    results = runner.run_spec(spec)
+    
+    for result in sorted(results, key=lambda result: result["summary"]["time_in_play_mean"], reverse=True):
+        print(format_result(result))
+    
+    if spec.get("output"):
+        with open(spec["output"], 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"Sweep results written to {spec['output']}")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    if "--batch" in sys.argv:
+        index = sys.argv.index("--batch")
+        count = int(sys.argv[index + 1]) if len(sys.argv) > index + 1 else 100
+        main_batch(count, option_value("--table"))
+    elif "--sweep" in sys.argv:
+        main_sweep(option_value("--sweep", "sweep.json"))
+    elif "--replay" in sys.argv:
+        main_replay(option_value("--replay", "replay.jsonl"))
+    elif "--headless" in sys.argv:
+        main_headless(option_value("--profile", "profile.json"), option_value("--table"))
+    else:
+        main(option_value("--profile", "profile.json"), option_value("--record", "replay.jsonl"),
+             option_value("--quality", "standard"), option_value("--table"),
+             option_value("--position-encoding", "binary"), "--dead-reckoning" in sys.argv)
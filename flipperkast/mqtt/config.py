@@ -0,0 +1,47 @@
+import os
+
+DEFAULT_BROKER = "broker.hivemq.com"
+DEFAULT_PORT = 1883
+DEFAULT_KEEPALIVE = 60
+
+TRANSPORT_TCP = "tcp"
+TRANSPORT_WEBSOCKETS = "websockets"
+TRANSPORT_LOOPBACK = "loopback"
+
+ENV_PREFIX = "FLIPPERKAST_MQTT_"
+
+class MQTTConfig:
+    def __init__(self, broker=DEFAULT_BROKER, port=DEFAULT_PORT, client_id=None, qos=0,
+                 transport=TRANSPORT_TCP, keepalive=DEFAULT_KEEPALIVE):
+        if qos not in (0, 1, 2):
+            raise ValueError(f"MQTT QoS must be 0, 1 or 2, got {qos}")
+        if transport not in (TRANSPORT_TCP, TRANSPORT_WEBSOCKETS, TRANSPORT_LOOPBACK):
+            raise ValueError(f"Unknown MQTT transport: {transport}")
+        
+        self.broker = broker
+        self.port = port
+        self.client_id = client_id
+        self.qos = qos
+        self.transport = transport
+        self.keepalive = keepalive
+    
+    @staticmethod
+    def from_env(environ=None):
+        environ = os.environ if environ is None else environ
+        
+        def value(name, default, convert=str):
+            raw = environ.get(ENV_PREFIX + name)
+            return convert(raw) if raw else default
+        
+        return MQTTConfig(
+            broker=value("BROKER", DEFAULT_BROKER),
+            port=value("PORT", DEFAULT_PORT, int),
+            client_id=value("CLIENT_ID", None),
+            qos=value("QOS", 0, int),
+            transport=value("TRANSPORT", TRANSPORT_TCP),
+            keepalive=value("KEEPALIVE", DEFAULT_KEEPALIVE, int)
+        )
+    
+    @staticmethod
+    def loopback(broker="local", client_id=None):
+        return MQTTConfig(broker=broker, port=0, client_id=client_id, transport=TRANSPORT_LOOPBACK)
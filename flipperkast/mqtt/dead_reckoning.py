@@ -0,0 +1,90 @@
+import time
+
+KEYFRAME = "keyframe"
+CORRECTION = "correction"
+
+def predict(sample, t, gravity):
+    dt = t - sample["timestamp"]
+    x = sample["x"] + sample["vx"] * dt + 0.5 * gravity[0] * dt * dt
+    y = sample["y"] + sample["vy"] * dt + 0.5 * gravity[1] * dt * dt
+    return x, y
+
+class DeadReckoningPublisher:
+    def __init__(self, gravity=(0.0, 500.0), tolerance=4.0, keyframe_interval=1.0, epoch=None):
+        self.gravity = gravity
+        self.tolerance = tolerance
+        self.keyframe_interval = keyframe_interval
+        self.epoch = time.time() if epoch is None else epoch
+        self.last_sample = None
+        self.last_keyframe_time = None
+        self.sent_count = 0
+        self.skipped_count = 0
+        
+    def rebase(self, t, now=None):
+        self.epoch = (time.time() if now is None else now) - t
+        self.last_sample = None
+        self.last_keyframe_time = None
+        
+    def update(self, x, y, velocity_x, velocity_y, t):
+        sample = {"x": x, "y": y, "vx": velocity_x, "vy": velocity_y, "timestamp": t}
+        
+        if self.last_keyframe_time is None or t - self.last_keyframe_time >= self.keyframe_interval:
+            self.last_keyframe_time = t
+            return self.accept(sample, KEYFRAME)
+        
+        predicted_x, predicted_y = predict(self.last_sample, t, self.gravity)
+        error_sq = (predicted_x - x) ** 2 + (predicted_y - y) ** 2
+        
+        if error_sq > self.tolerance * self.tolerance:
+            return self.accept(sample, CORRECTION)
+        
+        self.skipped_count += 1
+        return None
+    
+    def accept(self, sample, kind):
+        self.last_sample = sample
+        self.sent_count += 1
+        return kind
+
+class PositionExtrapolator:
+    def __init__(self, gravity=(0.0, 500.0), blend_time=0.1, max_extrapolation=0.5):
+        self.gravity = gravity
+        self.blend_time = blend_time
+        self.max_extrapolation = max_extrapolation
+        self.previous_sample = None
+        self.current_sample = None
+        self.received_at = None
+        
+    def add_sample(self, sample, received_at=None):
+        if self.current_sample and sample["timestamp"] < self.current_sample["timestamp"]:
+            return
+            
+        self.previous_sample = self.current_sample
+        self.current_sample = sample
+        self.received_at = time.time() if received_at is None else received_at
+        
+    def position_at(self, t):
+        if self.current_sample is None:
+            return None
+            
+        t_current = min(t, self.current_sample["timestamp"] + self.max_extrapolation)
+        x, y = predict(self.current_sample, t_current, self.gravity)
+        
+        if self.previous_sample is None or self.blend_time <= 0:
+            return x, y
+            
+        gap = self.current_sample["timestamp"] - self.previous_sample["timestamp"]
+        blend = (t - self.current_sample["timestamp"]) / self.blend_time
+        if blend >= 1.0 or gap > self.max_extrapolation:
+            return x, y
+            
+        old_x, old_y = predict(self.previous_sample, t, self.gravity)
+        blend = max(0.0, blend)
+        return old_x + (x - old_x) * blend, old_y + (y - old_y) * blend
+        
+    def position_now(self, now=None):
+        if self.current_sample is None:
+            return None
+            
+        now = time.time() if now is None else now
+        return self.position_at(self.current_sample["timestamp"] + (now - self.received_at))
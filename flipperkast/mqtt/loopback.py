@@ -0,0 +1,179 @@
+import threading
+
+MQTT_ERR_SUCCESS = 0
+MQTT_ERR_NO_CONN = 4
+
+def topic_matches(subscription, topic):
+    sub_levels = subscription.split("/")
+    topic_levels = topic.split("/")
+    
+    for index, level in enumerate(sub_levels):
+        if level == "#":
+            return True
+        if index >= len(topic_levels):
+            return False
+        if level != "+" and level != topic_levels[index]:
+            return False
+    
+    return len(sub_levels) == len(topic_levels)
+
+class LoopbackMessage:
+    def __init__(self, topic, payload, qos=0, retain=False):
+        self.topic = topic
+        self.payload = payload
+        self.qos = qos
+        self.retain = retain
+
+class LoopbackResult:
+    def __init__(self, rc, mid=0):
+        self.rc = rc
+        self.mid = mid
+
+class LoopbackBroker:
+    brokers = {}
+    brokers_lock = threading.Lock()
+    
+    def __init__(self, name="local"):
+        self.name = name
+        self.clients = []
+        self.subscriptions = {}
+        self.retained = {}
+        self.lock = threading.RLock()
+        self.message_count = 0
+    
+    @staticmethod
+    def named(name="local"):
+        with LoopbackBroker.brokers_lock:
+            if name not in LoopbackBroker.brokers:
+                LoopbackBroker.brokers[name] = LoopbackBroker(name)
+            return LoopbackBroker.brokers[name]
+    
+    def connect(self, client):
+        with self.lock:
+            if client not in self.clients:
+                self.clients.append(client)
+                self.subscriptions[client] = []
+    
+    def disconnect(self, client):
+        with self.lock:
+            if client in self.clients:
+                self.clients.remove(client)
+                del self.subscriptions[client]
+    
+    def subscribe(self, client, topic, qos=0):
+        with self.lock:
+            if topic not in self.subscriptions[client]:
+                self.subscriptions[client].append(topic)
+            retained = [message for retained_topic, message in self.retained.items()
+                        if topic_matches(topic, retained_topic)]
+        
+        for message in retained:
+            client.deliver(message)
+    
+    def unsubscribe(self, client, topic):
+        with self.lock:
+            if topic in self.subscriptions.get(client, []):
+                self.subscriptions[client].remove(topic)
+    
+    def publish(self, topic, payload, qos=0, retain=False):
+        if isinstance(payload, str):
+            payload = payload.encode()
+        elif payload is None:
+            payload = b""
+        
+        message = LoopbackMessage(topic, payload, qos, retain)
+        
+        with self.lock:
+            self.message_count += 1
+            if retain:
+                if payload:
+                    self.retained[topic] = message
+                else:
+                    self.retained.pop(topic, None)
+            
+            receivers = [client for client in self.clients
+                         if any(topic_matches(subscription, topic) for subscription in self.subscriptions[client])]
+        
+        delivered = LoopbackMessage(topic, payload, qos, False)
+        for client in receivers:
+            client.deliver(delivered)
+        
+        return len(receivers)
+
+class LoopbackClient:
+    def __init__(self, client_id="", broker=None):
+        self.client_id = client_id
+        self.broker = broker
+        self.connected = False
+        self.stopped = threading.Event()
+        
+        self.on_connect = None
+        self.on_message = None
+        self.on_disconnect = None
+        
+        self.next_mid = 0
+        self.pending_host = None
+    
+    def reconnect_delay_set(self, min_delay=1, max_delay=120):
+        pass
+    
+    def connect(self, host, port=0, keepalive=60):
+        if self.broker is None:
+            self.broker = LoopbackBroker.named(host)
+        
+        self.broker.connect(self)
+        self.connected = True
+        self.stopped.clear()
+        
+        if self.on_connect:
+            self.on_connect(self, None, {}, 0)
+        return MQTT_ERR_SUCCESS
+    
+    def connect_async(self, host, port=0, keepalive=60):
+        self.pending_host = host
+    
+    def loop_start(self):
+        return self.connect(self.pending_host)
+    
+    def loop_forever(self):
+        self.stopped.wait()
+    
+    def loop_stop(self):
+        self.stopped.set()
+    
+    def disconnect(self):
+        if self.connected:
+            self.broker.disconnect(self)
+            self.connected = False
+            if self.on_disconnect:
+                self.on_disconnect(self, None, 0)
+        self.stopped.set()
+        return MQTT_ERR_SUCCESS
+    
+    def is_connected(self):
+        return self.connected
+    
+    def publish(self, topic, payload=None, qos=0, retain=False):
+        self.next_mid += 1
+        if not self.connected:
+            return LoopbackResult(MQTT_ERR_NO_CONN, self.next_mid)
+        
+        self.broker.publish(topic, payload, qos, retain)
+        return LoopbackResult(MQTT_ERR_SUCCESS, self.next_mid)
+    
+    def subscribe(self, topic, qos=0):
+        self.next_mid += 1
+        if not self.connected:
+            return MQTT_ERR_NO_CONN, self.next_mid
+        
+        self.broker.subscribe(self, topic, qos)
+        return MQTT_ERR_SUCCESS, self.next_mid
+    
+    def unsubscribe(self, topic):
+        if self.connected:
+            self.broker.unsubscribe(self, topic)
+        return MQTT_ERR_SUCCESS, self.next_mid
+    
+    def deliver(self, message):
+        if self.on_message:
+            self.on_message(self, None, message)
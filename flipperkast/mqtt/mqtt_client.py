@@ -3,69 +3,174 @@ import time
 import threading
 import json
 
-from mqtt.topics import SCORE_TOPIC, BUMPER_HIT_TOPIC, BALL_POSITION_TOPIC, GAME_STATUS_TOPIC
+from mqtt.topics import SCORE_TOPIC, BUMPER_HIT_TOPIC, BALL_POSITION_TOPIC, GAME_STATUS_TOPIC, BALL_POSITION_FORMAT_TOPIC
+from mqtt.position_codec import BallPositionEncoder, ENCODING_JSON, check_encoding
+from mqtt.offline_queue import OfflineQueue
+from mqtt.config import MQTTConfig, TRANSPORT_LOOPBACK
+
+BATCH_FORMAT = "flipperkast.batch"
+BATCH_VERSION = 1
+BATCH_PREFIX = '{"format":"%s"' % BATCH_FORMAT
+
+def pack_batch(topic, messages):
+    if len(messages) == 1:
+        return messages[0]
+    
+    if all(isinstance(message, bytes) for message in messages):
+        return b"".join(messages)
+    
+    if topic == SCORE_TOPIC:
+        return str(sum(int(message) for message in messages))
+    
+    return json.dumps({"format": BATCH_FORMAT, "version": BATCH_VERSION, "messages": messages}, separators=(",", ":"))
+
+def is_batch(payload):
+    return isinstance(payload, str) and payload.startswith(BATCH_PREFIX)
+
+def unpack_batch(payload):
+    data = json.loads(payload)
+    if isinstance(data, dict) and data.get("format") == BATCH_FORMAT:
+        return data["messages"]
+    return [data]
+
+def split_batch(payload):
+    if not is_batch(payload):
+        return [payload]
+    return [message if isinstance(message, str) else json.dumps(message) for message in unpack_batch(payload)]
+
+class MQTTOutbox:
+    def __init__(self, flush_interval=0.0, max_batch_size=50):
+        self.flush_interval = flush_interval
+        self.max_batch_size = max_batch_size
+        self.pending = {}
+        self.last_flush = 0
+        
+    def add(self, topic, message):
+        if topic not in self.pending:
+            self.pending[topic] = []
+        self.pending[topic].append(message)
+        
+        return len(self.pending[topic]) >= self.max_batch_size
+        
+    def is_due(self, now):
+        return bool(self.pending) and now - self.last_flush >= self.flush_interval
+        
+    def drain(self, now):
+        batches = [(topic, pack_batch(topic, messages)) for topic, messages in self.pending.items()]
+        self.pending = {}
+        self.last_flush = now
+        return batches
+        
+    def __len__(self):
+        return sum(len(messages) for messages in self.pending.values())
+
+class TopicPublisher:
+    def __init__(self, mqtt_client, topic, retain=False):
+        self.mqtt_client = mqtt_client
+        self.topic = topic
+        self.retain = retain
+        
+    def publish(self, message):
+        return self.mqtt_client.publish(self.topic, message, retain=self.retain)
+
+class TopicSubscriber:
+    def __init__(self, mqtt_client, topic, callback):
+        self.mqtt_client = mqtt_client
+        self.topic = topic
+        self.callback = callback
+        self.closed = False
+        mqtt_client.subscribe(topic, self.on_payload)
+        
+    def on_payload(self, payload):
+        for message in split_batch(payload):
+            self.callback(message)
+        
+    def close(self):
+        if not self.closed:
+            self.mqtt_client.unsubscribe(self.topic, self.on_payload)
+            self.closed = True
 
 class MQTTClient:
-    def __init__(self, broker="broker.hivemq.com", port=1883, client_id=None):
-        self.client_id = client_id or f"pinball_client_{int(time.time())}"
+    def __init__(self, broker=None, port=None, client_id=None,
+                 offline_queue_size=1000, offline_queue_path=None, config=None):
+        config = config or MQTTConfig.from_env()
         
-        self.client = mqtt.Client(client_id=self.client_id)
+        self.broker = broker or config.broker
+        self.port = port or config.port
+        self.client_id = client_id or config.client_id or f"pinball_client_{int(time.time())}"
+        self.qos = config.qos
+        self.transport = config.transport
+        self.keepalive = config.keepalive
+        
+        self.client = self.create_client()
         
         self.client.on_connect = self.on_connect
         self.client.on_message = self.on_message
         self.client.on_disconnect = self.on_disconnect
         
-        self.broker = broker
-        self.port = port
-        
         self.subscribed_topics = []
         self.topic_callbacks = {}
         
         self.running = False
         self.thread = None
+        self.async_loop = False
+        
+        self.reconnect_min_delay = 1
+        self.reconnect_max_delay = 60
+        self.client.reconnect_delay_set(min_delay=self.reconnect_min_delay, max_delay=self.reconnect_max_delay)
         
-        self.reconnect_delay = 5
-        self.max_reconnect_attempts = 12
+        self.offline_queue = OfflineQueue(offline_queue_size, offline_queue_path, latest_only_topics=(BALL_POSITION_TOPIC,))
+        self.send_lock = threading.RLock()
+        self.offline = False
         
         self.last_ball_position = {"x": 0, "y": 0, "vx": 0, "vy": 0}
         self.ball_position_update_interval = 50
         self.last_position_update_time = 0
         
+        self.outbox = None
+        self.position_encoder = None
+        self.profiler = None
+        
+    def create_client(self):
+        if self.transport == TRANSPORT_LOOPBACK:
+            from mqtt.loopback import LoopbackClient
+            return LoopbackClient(client_id=self.client_id)
+        
+        return mqtt.Client(client_id=self.client_id, transport=self.transport)
+        
     def on_connect(self, client, userdata, flags, rc):
         if rc == 0:
             print(f"MQTT Connected to {self.broker} successfully")
             for topic in self.subscribed_topics:
-                client.subscribe(topic)
+                client.subscribe(topic, qos=self.qos)
                 print(f"Subscribed to topic: {topic}")
+            if self.position_encoder:
+                self.publish_position_format()
+            self.replay_offline_queue()
         else:
             print(f"MQTT Connection failed with code {rc}")
             
     def on_disconnect(self, client, userdata, rc):
         if rc != 0:
-            print(f"MQTT Unexpected disconnection, will try to reconnect")
-            self.reconnect()
-            
-    def reconnect(self):
-        attempts = 0
-        while not self.client.is_connected() and attempts < self.max_reconnect_attempts:
-            try:
-                print(f"Attempting to reconnect to MQTT broker ({attempts+1}/{self.max_reconnect_attempts})...")
-                self.client.reconnect()
-                return True
-            except Exception as e:
-                print(f"Reconnection attempt failed: {e}")
-                time.sleep(self.reconnect_delay)
-                attempts += 1
-        
-        if not self.client.is_connected():
-            print("Failed to reconnect to MQTT broker after multiple attempts")
-            return False
+            print(f"MQTT Unexpected disconnection, reconnecting in the background")
             
-        return True
+    def replay_offline_queue(self):
+        with self.send_lock:
+            messages = self.offline_queue.drain()
+            self.offline = False
+            for topic, payload, retain in messages:
+                self.publish_now(topic, payload, retain)
+                
+        if messages:
+            print(f"Replayed {len(messages)} queued MQTT messages")
+        return len(messages)
         
     def on_message(self, client, userdata, msg):
         topic = msg.topic
-        payload = msg.payload.decode()
+        try:
+            payload = msg.payload.decode()
+        except UnicodeDecodeError:
+            payload = msg.payload
         
         print(f"MQTT Message received: {topic} - {payload}")
         
@@ -81,43 +186,107 @@ class MQTTClient:
             return
             
         try:
-            self.client.connect(self.broker, self.port, 60)
+            self.client.connect(self.broker, self.port, self.keepalive)
             self.running = True
             
             self.thread = threading.Thread(target=self.client.loop_forever)
             self.thread.daemon = True
             self.thread.start()
             print(f"MQTT client started, connected to {self.broker}:{self.port}")
+        except Exception as e:
+            print(f"Failed to connect to MQTT broker: {e}, retrying in the background")
+            self.start_async()
+            
+    def start_async(self):
+        if self.running:
+            return
             
-            self.publish_game_status("READY")
+        try:
+            self.client.connect_async(self.broker, self.port, self.keepalive)
+            self.client.loop_start()
+            self.running = True
+            self.async_loop = True
+            print(f"MQTT client connecting to {self.broker}:{self.port} in the background")
         except Exception as e:
-            print(f"Failed to connect to MQTT broker: {e}")
+            print(f"Failed to start MQTT client: {e}")
             
     def stop(self):
         if not self.running:
             return
         
         try:
-            self.publish_game_status("STOPPED")
+            self.flush(force=True)
         except:
             pass
             
         self.client.disconnect()
         self.running = False
         
-        if self.thread:
+        if self.async_loop:
+            self.client.loop_stop()
+            self.async_loop = False
+        elif self.thread:
             self.thread.join(timeout=1.0)
             
-    def publish(self, topic, message):
-        if not self.running:
-            print("MQTT client not running")
-            return False
+        self.offline_queue.flush()
             
-        try:
-            if isinstance(message, dict):
-                message = json.dumps(message)
+    def enable_outbox(self, flush_interval=0.0, max_batch_size=50):
+        if self.outbox is None:
+            self.outbox = MQTTOutbox(flush_interval, max_batch_size)
+        
+    def flush(self, force=False):
+        if self.outbox is None:
+            return 0
+            
+        now = time.time()
+        if not force and not self.outbox.is_due(now):
+            return 0
+            
+        start = time.perf_counter()
+        batches = self.outbox.drain(now)
+        for topic, payload in batches:
+            self.send(topic, payload)
+        if self.profiler:
+            self.profiler.record("mqtt.flush", time.perf_counter() - start)
+            
+        return len(batches)
+            
+    def publish(self, topic, message, retain=False):
+        if retain:
+            return self.send(topic, message, retain=True)
+            
+        if self.outbox is not None:
+            if self.outbox.add(topic, message):
+                self.flush(force=True)
+            return True
+            
+        return self.send(topic, message)
+        
+    def send(self, topic, message, retain=False):
+        if isinstance(message, dict):
+            message = json.dumps(message)
+            
+        with self.send_lock:
+            if not self.running or not self.client.is_connected():
+                self.queue_offline(topic, message, retain)
+                return False
                 
-            result = self.client.publish(topic, message)
+            return self.publish_now(topic, message, retain)
+            
+    def publish_now(self, topic, message, retain=False):
+        try:
+            start = time.perf_counter()
+            options = {}
+            if self.qos:
+                options["qos"] = self.qos
+            if retain:
+                options["retain"] = True
+            result = self.client.publish(topic, message, **options)
+            if self.profiler:
+                self.profiler.record("mqtt.publish", time.perf_counter() - start)
+            if result.rc == mqtt.MQTT_ERR_NO_CONN:
+                self.queue_offline(topic, message, retain)
+                return False
             if result.rc != mqtt.MQTT_ERR_SUCCESS:
                 print(f"Failed to publish message to {topic}, result code: {result.rc}")
                 return False
@@ -127,6 +296,13 @@ class MQTTClient:
             print(f"Failed to publish MQTT message: {e}")
             return False
             
+    def queue_offline(self, topic, message, retain=False):
+        if not self.offline:
+            self.offline = True
+            print("MQTT client offline, queueing messages until reconnected")
+            
+        self.offline_queue.put(topic, message, retain)
+            
     def subscribe(self, topic, callback=None):
         if topic not in self.subscribed_topics:
             self.subscribed_topics.append(topic)
@@ -145,7 +321,7 @@ class MQTTClient:
                     self.topic_callbacks[topic] = []
                 self.topic_callbacks[topic].append(callback)
                 
-            result, _ = self.client.subscribe(topic)
+            result, _ = self.client.subscribe(topic, qos=self.qos)
             
             if result == mqtt.MQTT_ERR_SUCCESS:
                 print(f"Successfully subscribed to {topic}")
@@ -158,6 +334,33 @@ class MQTTClient:
             print(f"Failed to subscribe to MQTT topic: {e}")
             return False
     
+    def unsubscribe(self, topic, callback=None):
+        callbacks = self.topic_callbacks.get(topic, [])
+        if callback in callbacks:
+            callbacks.remove(callback)
+        if callbacks:
+            return True
+            
+        self.topic_callbacks.pop(topic, None)
+        if topic in self.subscribed_topics:
+            self.subscribed_topics.remove(topic)
+            
+        if not self.running:
+            return True
+            
+        try:
+            result, _ = self.client.unsubscribe(topic)
+            return result == mqtt.MQTT_ERR_SUCCESS
+        except Exception as e:
+            print(f"Failed to unsubscribe from MQTT topic: {e}")
+            return False
+            
+    def publisher(self, topic, retain=False):
+        return TopicPublisher(self, topic, retain)
+        
+    def subscriber(self, topic, callback):
+        return TopicSubscriber(self, topic, callback)
+    
     def update_ball_position(self, ball_shape):
         current_time = time.time() * 1000
         
@@ -186,14 +389,36 @@ class MQTTClient:
                 
         return False
             
-    def publish_ball_position(self, x, y, velocity_x, velocity_y):
+    def set_position_encoding(self, encoding):
+        if check_encoding(encoding) == ENCODING_JSON:
+            self.position_encoder = None
+        else:
+            self.position_encoder = BallPositionEncoder(encoding)
+            
+        self.publish_position_format()
+        
+    def publish_position_format(self):
+        if self.position_encoder:
+            announcement = self.position_encoder.format_announcement()
+        else:
+            announcement = {"encoding": ENCODING_JSON}
+            
+        return self.publish(BALL_POSITION_FORMAT_TOPIC, announcement, retain=True)
+            
+    def publish_ball_position(self, x, y, velocity_x, velocity_y, timestamp=None, keyframe=False):
+        if self.position_encoder:
+            payload = self.position_encoder.encode(x, y, velocity_x, velocity_y, timestamp, keyframe)
+            return self.publish(BALL_POSITION_TOPIC, payload)
+            
         data = {
             "x": x,
             "y": y,
             "vx": velocity_x,
             "vy": velocity_y,
-            "timestamp": time.time()
+            "timestamp": time.time() if timestamp is None else timestamp
         }
+        if keyframe:
+            data["keyframe"] = True
         return self.publish(BALL_POSITION_TOPIC, data)
         
     def publish_score_update(self, points):
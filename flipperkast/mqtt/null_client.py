@@ -0,0 +1,50 @@
+class NullMQTTClient:
+    def __init__(self):
+        self.running = False
+        self.published_count = 0
+        self.profiler = None
+        
+    def start(self):
+        pass
+        
+    def start_async(self):
+        pass
+        
+    def stop(self):
+        pass
+        
+    def enable_outbox(self, flush_interval=0.0, max_batch_size=50):
+        pass
+        
+    def flush(self, force=False):
+        return 0
+        
+    def publish(self, topic, message, retain=False):
+        self.published_count += 1
+        return False
+        
+    def subscribe(self, topic, callback=None):
+        return False
+        
+    def unsubscribe(self, topic, callback=None):
+        return False
+        
+    def publisher(self, topic, retain=False):
+        from mqtt.mqtt_client import TopicPublisher
+        return TopicPublisher(self, topic, retain)
+        
+    def subscriber(self, topic, callback):
+        from mqtt.mqtt_client import TopicSubscriber
+        return TopicSubscriber(self, topic, callback)
+        
+    def publish_ball_position(self, x, y, velocity_x, velocity_y, timestamp=None, keyframe=False):
+        return self.publish(None, None)
+        
+    def publish_score_update(self, points):
+        return self.publish(None, None)
+        
+    def publish_bumper_hit(self, bumper_id, points):
+        return self.publish(None, None)
+        
+    def publish_game_status(self, status, value=None):
+        return self.publish(None, None)
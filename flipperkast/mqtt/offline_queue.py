@@ -0,0 +1,142 @@
+import base64
+import json
+import os
+import queue
+import threading
+from collections import deque
+
+class OfflineQueue:
+    def __init__(self, max_size=1000, path=None, latest_only_topics=(), background=True):
+        self.max_size = max_size
+        self.path = path
+        self.messages = deque(maxlen=max_size)
+        self.latest_only_topics = set(latest_only_topics)
+        self.latest = {}
+        self.dropped_count = 0
+        self.appended_since_compact = 0
+        
+        self.write_queue = None
+        self.writer = None
+        
+        if self.path:
+            self.load()
+            if background:
+                self.write_queue = queue.Queue()
+                self.writer = threading.Thread(target=self.write_loop)
+                self.writer.daemon = True
+                self.writer.start()
+            
+    def put(self, topic, payload, retain=False):
+        message = (topic, payload, retain)
+        self.store(message)
+        
+        if self.path and topic not in self.latest_only_topics:
+            self.appended_since_compact += 1
+            if self.appended_since_compact >= self.max_size:
+                self.appended_since_compact = 0
+                self.schedule(self.write_to_disk, list(self.messages))
+            else:
+                self.schedule(self.append_to_disk, message)
+            
+    def store(self, message):
+        topic = message[0]
+        if topic in self.latest_only_topics:
+            if topic in self.latest:
+                self.dropped_count += 1
+            self.latest[topic] = message
+            return
+            
+        if len(self.messages) == self.max_size:
+            self.dropped_count += 1
+        self.messages.append(message)
+        
+    def pending(self):
+        return list(self.messages) + list(self.latest.values())
+        
+    def drain(self):
+        messages = self.pending()
+        self.messages.clear()
+        self.latest.clear()
+        
+        if self.path:
+            self.appended_since_compact = 0
+            self.schedule(self.write_to_disk, [])
+            
+        return messages
+        
+    def schedule(self, write, argument):
+        if self.write_queue is None:
+            write(argument)
+        else:
+            self.write_queue.put((write, argument))
+            
+    def write_loop(self):
+        while True:
+            item = self.write_queue.get()
+            if item is not None:
+                write, argument = item
+                write(argument)
+            self.write_queue.task_done()
+            
+            if item is None:
+                return
+                
+    def flush(self):
+        if self.write_queue is not None:
+            self.write_queue.join()
+            
+    def close(self):
+        if self.writer is not None and self.writer.is_alive():
+            self.write_queue.put(None)
+            self.writer.join(timeout=2.0)
+    
+    def __len__(self):
+        return len(self.messages) + len(self.latest)
+    
+    def encode(self, message):
+        topic, payload, retain = message
+        record = {"topic": topic, "retain": retain}
+        
+        if isinstance(payload, bytes):
+            record["payload_b64"] = base64.b64encode(payload).decode()
+        else:
+            record["payload"] = payload
+            
+        return json.dumps(record)
+    
+    def decode(self, line):
+        record = json.loads(line)
+        
+        if "payload_b64" in record:
+            payload = base64.b64decode(record["payload_b64"])
+        else:
+            payload = record["payload"]
+            
+        return record["topic"], payload, record.get("retain", False)
+        
+    def append_to_disk(self, message):
+        try:
+            with open(self.path, 'a') as f:
+                f.write(self.encode(message) + "\n")
+        except Exception as e:
+            print(f"Error writing offline MQTT queue: {e}")
+            
+    def write_to_disk(self, messages):
+        try:
+            temp_path = self.path + ".tmp"
+            with open(temp_path, 'w') as f:
+                for message in messages:
+                    f.write(self.encode(message) + "\n")
+            os.replace(temp_path, self.path)
+        except Exception as e:
+            print(f"Error writing offline MQTT queue: {e}")
+            
+    def load(self):
+        try:
+            if os.path.exists(self.path):
+                with open(self.path, 'r') as f:
+                    for line in f:
+                        if line.strip():
+                            self.store(self.decode(line))
+        except Exception as e:
+            print(f"Error loading offline MQTT queue: {e}")
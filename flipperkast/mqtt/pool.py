@@ -0,0 +1,49 @@
+import threading
+
+from mqtt import mqtt_client
+from mqtt.config import MQTTConfig
+
+def pool_key(config):
+    return (config.transport, config.broker, config.port)
+
+class MQTTClientPool:
+    clients = {}
+    references = {}
+    lock = threading.Lock()
+    
+    @staticmethod
+    def acquire(config=None):
+        config = config or MQTTConfig.from_env()
+        key = pool_key(config)
+        
+        with MQTTClientPool.lock:
+            client = MQTTClientPool.clients.get(key)
+            if client is None:
+                client = mqtt_client.MQTTClient(config=config)
+                MQTTClientPool.clients[key] = client
+                MQTTClientPool.references[key] = 0
+            MQTTClientPool.references[key] += 1
+            return client
+    
+    @staticmethod
+    def release(client):
+        with MQTTClientPool.lock:
+            key = next((key for key, pooled in MQTTClientPool.clients.items() if pooled is client), None)
+            if key is None:
+                return False
+            
+            MQTTClientPool.references[key] -= 1
+            if MQTTClientPool.references[key] > 0:
+                return False
+            
+            del MQTTClientPool.clients[key]
+            del MQTTClientPool.references[key]
+        
+        client.stop()
+        return True
+    
+    @staticmethod
+    def reference_count(client):
+        with MQTTClientPool.lock:
+            return next((MQTTClientPool.references[key] for key, pooled in MQTTClientPool.clients.items()
+                         if pooled is client), 0)
@@ -0,0 +1,104 @@
+import json
+import struct
+import time
+
+ENCODING_JSON = "json"
+ENCODING_BINARY = "binary"
+POSITION_ENCODINGS = (ENCODING_JSON, ENCODING_BINARY)
+
+POSITION_FORMAT_VERSION = 1
+
+# Binary payloads start with this byte; it can never start a UTF-8 text payload
+BINARY_MAGIC = 0xB1
+
+FLAG_KEYFRAME = 0x01
+
+# magic, flags, sequence number, milliseconds since the stream epoch, x, y, vx, vy
+POSITION_RECORD = struct.Struct("<BBHIffff")
+
+def check_encoding(encoding):
+    if encoding not in POSITION_ENCODINGS:
+        raise ValueError(f"Unknown position encoding {encoding!r}, expected one of {', '.join(POSITION_ENCODINGS)}")
+    return encoding
+
+class BallPositionEncoder:
+    def __init__(self, encoding=ENCODING_BINARY, epoch=None):
+        self.encoding = check_encoding(encoding)
+        self.epoch = time.time() if epoch is None else epoch
+        self.sequence = 0
+        
+    def encode(self, x, y, velocity_x, velocity_y, timestamp=None, keyframe=False):
+        if timestamp is None:
+            timestamp = time.time()
+            
+        if self.encoding == ENCODING_JSON:
+            data = {"x": x, "y": y, "vx": velocity_x, "vy": velocity_y, "timestamp": timestamp}
+            if keyframe:
+                data["keyframe"] = True
+            return data
+        
+        offset_ms = max(0, int((timestamp - self.epoch) * 1000)) & 0xFFFFFFFF
+        flags = FLAG_KEYFRAME if keyframe else 0
+        payload = POSITION_RECORD.pack(BINARY_MAGIC, flags, self.sequence,
+                                       offset_ms, x, y, velocity_x, velocity_y)
+        self.sequence = (self.sequence + 1) & 0xFFFF
+        return payload
+        
+    def format_announcement(self):
+        announcement = {"encoding": self.encoding, "version": POSITION_FORMAT_VERSION}
+        
+        if self.encoding == ENCODING_BINARY:
+            announcement["layout"] = POSITION_RECORD.format
+            announcement["record_size"] = POSITION_RECORD.size
+            announcement["epoch"] = self.epoch
+            
+        return announcement
+
+class JsonPositionDecoder:
+    encoding = ENCODING_JSON
+    
+    def decode(self, payload):
+        if isinstance(payload, bytes):
+            payload = payload.decode()
+            
+        data = json.loads(payload)
+        if isinstance(data, dict) and "messages" in data:
+            return data["messages"]
+        return data if isinstance(data, list) else [data]
+
+class BinaryPositionDecoder:
+    encoding = ENCODING_BINARY
+    
+    def __init__(self, epoch=0.0):
+        self.epoch = epoch
+        self.fallback = JsonPositionDecoder()
+        
+    def decode(self, payload):
+        if not isinstance(payload, bytes) or not payload or payload[0] != BINARY_MAGIC:
+            return self.fallback.decode(payload)
+            
+        if len(payload) % POSITION_RECORD.size != 0:
+            raise ValueError(f"Ball position payload of {len(payload)} bytes is not a whole number of records")
+            
+        samples = []
+        for magic, flags, sequence, offset_ms, x, y, vx, vy in POSITION_RECORD.iter_unpack(payload):
+            samples.append({
+                "x": x,
+                "y": y,
+                "vx": vx,
+                "vy": vy,
+                "timestamp": self.epoch + offset_ms / 1000.0,
+                "seq": sequence,
+                "keyframe": bool(flags & FLAG_KEYFRAME)
+            })
+        return samples
+
+def get_decoder(announcement=None):
+    if not announcement or announcement.get("encoding") != ENCODING_BINARY:
+        return JsonPositionDecoder()
+        
+    if announcement.get("version") != POSITION_FORMAT_VERSION:
+        print(f"Unsupported ball position format version {announcement.get('version')}, falling back to JSON")
+        return JsonPositionDecoder()
+        
+    return BinaryPositionDecoder(announcement.get("epoch", 0.0))
@@ -2,4 +2,7 @@
 SCORE_TOPIC = "flipperkast/scores"
 BUMPER_HIT_TOPIC = "flipperkast/bumper_hit"
 BALL_POSITION_TOPIC = "flipperkast/ball_position"
-GAME_STATUS_TOPIC = "flipperkast/game_status"
\ No newline at end of file
+BALL_POSITIONS_TOPIC = "flipperkast/ball_positions"
+GAME_STATUS_TOPIC = "flipperkast/game_status"
+BALL_POSITION_FORMAT_TOPIC = "flipperkast/ball_position/format"
+METRICS_TOPIC = "flipperkast/metrics"
@@ -1,11 +1,30 @@
+import os
 import unittest
 import sys
 
+os.environ.setdefault("FLIPPERKAST_TABLE_CACHE", "")
+
 from tests.test_ball import TestBall
 from tests.test_bumper import TestBumper
 from tests.test_mqtt_client import TestMQTTClient
 from tests.test_game_manager import TestGameManager
 from tests.test_physics import TestPinballPhysics
+from tests.test_headless import TestHeadlessRunner
+from tests.test_batch import TestBatchEngine
+from tests.test_position_codec import TestPositionCodec
+from tests.test_dead_reckoning import TestDeadReckoning
+from tests.test_offline_queue import TestOfflineQueue
+from tests.test_text_cache import TestTextCache
+from tests.test_shape_registry import TestShapeRegistry
+from tests.test_profiler import TestProfiler
+from tests.test_replay import TestReplay
+from tests.test_leaderboard import TestLeaderboard
+from tests.test_loopback import TestLoopback
+from tests.test_pool import TestMQTTClientPool
+from tests.test_multiball import TestMultiBall
+from tests.test_world_builder import TestWorldBuilder
+from tests.test_table_loader import TestTableLoader
+from tests.test_sweep import TestSweep
 
 def create_test_suite():
     loader = unittest.TestLoader()
@@ -16,6 +35,22 @@ def create_test_suite():
     test_suite.addTest(loader.loadTestsFromTestCase(TestMQTTClient))
     test_suite.addTest(loader.loadTestsFromTestCase(TestGameManager))
     test_suite.addTest(loader.loadTestsFromTestCase(TestPinballPhysics))
+    test_suite.addTest(loader.loadTestsFromTestCase(TestHeadlessRunner))
+    test_suite.addTest(loader.loadTestsFromTestCase(TestBatchEngine))
+    test_suite.addTest(loader.loadTestsFromTestCase(TestPositionCodec))
+    test_suite.addTest(loader.loadTestsFromTestCase(TestDeadReckoning))
+    test_suite.addTest(loader.loadTestsFromTestCase(TestOfflineQueue))
+    test_suite.addTest(loader.loadTestsFromTestCase(TestTextCache))
+    test_suite.addTest(loader.loadTestsFromTestCase(TestShapeRegistry))
+    test_suite.addTest(loader.loadTestsFromTestCase(TestProfiler))
+    test_suite.addTest(loader.loadTestsFromTestCase(TestReplay))
+    test_suite.addTest(loader.loadTestsFromTestCase(TestLeaderboard))
+    test_suite.addTest(loader.loadTestsFromTestCase(TestLoopback))
+    test_suite.addTest(loader.loadTestsFromTestCase(TestMQTTClientPool))
+    test_suite.addTest(loader.loadTestsFromTestCase(TestMultiBall))
+    test_suite.addTest(loader.loadTestsFromTestCase(TestWorldBuilder))
+    test_suite.addTest(loader.loadTestsFromTestCase(TestTableLoader))
+    test_suite.addTest(loader.loadTestsFromTestCase(TestSweep))
     
     return test_suite
 
@@ -0,0 +1,83 @@
+import multiprocessing
+import statistics
+
+from game.table_loader import DEFAULT_TABLE, load_table
+from game.tuning import make_tuning
+from simulation.headless import HeadlessRunner, AutoPlayInput
+
+worker_runner = None
+
+def get_runner():
+    global worker_runner
+    if worker_runner is None:
+        worker_runner = HeadlessRunner()
+    return worker_runner
+
+def run_table(table):
+    runner = get_runner()
+    runner.reset(table["seed"], table["input_source"], table.get("layout"), table.get("tuning"))
+    runner.max_frames = table["max_frames"]
+    result = runner.run()
+    result["seed"] = table["seed"]
+    
+    return result
+
+def aggregate_results(results):
+    if not results:
+        return {"tables": 0}
+    
+    scores = [result["score"] for result in results]
+    drained = [result for result in results if result["drained"]]
+    quartiles = statistics.quantiles(scores, n=4) if len(scores) > 1 else [scores[0]] * 3
+    drain_times = [result["sim_time"] for result in drained]
+    
+    bumper_hits = {}
+    for result in results:
+        for bumper_id, hits in result["bumper_hits"].items():
+            bumper_hits[bumper_id] = bumper_hits.get(bumper_id, 0) + hits
+    
+    return {
+        "tables": len(results),
+        "score_mean": statistics.mean(scores),
+        "score_median": statistics.median(scores),
+        "score_min": min(scores),
+        "score_max": max(scores),
+        "score_stdev": statistics.pstdev(scores),
+        "score_quartiles": quartiles,
+        "time_in_play_mean": statistics.mean(result["sim_time"] for result in results),
+        "drain_rate": len(drained) / len(results),
+        "drain_time_mean": statistics.mean(drain_times) if drain_times else None,
+        "drain_time_median": statistics.median(drain_times) if drain_times else None,
+        "bumper_hits": bumper_hits,
+        "bumper_hits_total": sum(bumper_hits.values())
+    }
+
+class BatchEngine:
+    def __init__(self, processes=None, max_frames=13500, layout=DEFAULT_TABLE, tuning=None):
+        self.processes = processes or multiprocessing.cpu_count()
+        self.max_frames = max_frames
+        self.layout = load_table(layout)
+        self.tuning = make_tuning(tuning)
+        
+    def make_tables(self, count, base_seed=0, input_factory=AutoPlayInput, tuning=None):
+        tuning = make_tuning(tuning) if tuning is not None else self.tuning
+        return [
+            {"seed": base_seed + i, "input_source": input_factory(), "max_frames": self.max_frames,
+             "layout": self.layout, "tuning": tuning}
+            for i in range(count)
+        ]
+        
+    def run(self, tables):
+        if self.processes == 1:
+            results = [run_table(table) for table in tables]
+        else:
+            with multiprocessing.Pool(self.processes) as pool:
+                results = pool.map(run_table, tables, chunksize=max(1, len(tables) // (self.processes * 4)))
+        
+        return {
+            "results": results,
+            "summary": aggregate_results(results)
+        }
+        
+    def run_games(self, count, base_seed=0, input_factory=AutoPlayInput):
+        return self.run(self.make_tables(count, base_seed, input_factory))
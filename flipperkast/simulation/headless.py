@@ -0,0 +1,102 @@
+from game.game_manager import GameManager
+from game.table_loader import DEFAULT_TABLE
+from game.inputs import (LEFT_FLIPPER_ACTIVATE, LEFT_FLIPPER_DEACTIVATE, RIGHT_FLIPPER_ACTIVATE,
+                         RIGHT_FLIPPER_DEACTIVATE, PLUNGER_COMPRESS, PLUNGER_LAUNCH)
+from mqtt.null_client import NullMQTTClient
+
+class ScriptedInput:
+    def __init__(self, events=None):
+        self.events = sorted(events or [], key=lambda event: event[0])
+        self.index = 0
+        
+    def poll(self, frame, game_manager):
+        actions = []
+        while self.index < len(self.events) and self.events[self.index][0] <= frame:
+            _, action, value = self.events[self.index]
+            actions.append((action, value))
+            self.index += 1
+        return actions
+
+class AutoPlayInput:
+    def __init__(self, launch_power=1.0, flip_distance=70, hold_frames=8):
+        self.launch_power = launch_power
+        self.flip_distance = flip_distance
+        self.hold_frames = hold_frames
+        self.launched = False
+        self.left_hold = 0
+        self.right_hold = 0
+        
+    def poll(self, frame, game_manager):
+        actions = []
+        
+        if not self.launched:
+            self.launched = True
+            actions.append((PLUNGER_COMPRESS, game_manager.plunger.max_compression))
+            actions.append((PLUNGER_LAUNCH, self.launch_power))
+            return actions
+        
+        ball_pos = game_manager.ball_shape.body.position
+        
+        for flipper in game_manager.get_flippers():
+            near = (ball_pos - flipper.body.position).length < self.flip_distance
+            
+            if flipper.is_left:
+                self.left_hold = self.update_hold(actions, near, self.left_hold,
+                                                  LEFT_FLIPPER_ACTIVATE, LEFT_FLIPPER_DEACTIVATE)
+            else:
+                self.right_hold = self.update_hold(actions, near, self.right_hold,
+                                                   RIGHT_FLIPPER_ACTIVATE, RIGHT_FLIPPER_DEACTIVATE)
+        
+        return actions
+    
+    def update_hold(self, actions, near, hold, activate, deactivate):
+        if near and hold == 0:
+            actions.append((activate, None))
+            return self.hold_frames
+        
+        if hold > 0:
+            hold -= 1
+            if hold == 0:
+                actions.append((deactivate, None))
+        
+        return hold
+
+class HeadlessRunner:
+    def __init__(self, game_manager=None, input_source=None, max_frames=13500, seed=None, table=DEFAULT_TABLE,
+                 tuning=None):
+        self.game_manager = game_manager or GameManager(mqtt_client=NullMQTTClient(), leaderboard_path=None, seed=seed,
+                                                        table=table, tuning=tuning)
+        self.input_source = input_source or AutoPlayInput()
+        self.max_frames = max_frames
+        self.frame = 0
+        
+    def reset(self, seed=None, input_source=None, table=None, tuning=None):
+        self.game_manager.new_game(seed, table, tuning)
+        self.input_source = input_source or AutoPlayInput()
+        self.frame = 0
+        
+    def step(self):
+        for action, value in self.input_source.poll(self.frame, self.game_manager):
+            self.game_manager.apply_input(action, value)
+        
+        self.game_manager.update()
+        self.frame += 1
+        
+        if self.game_manager.profiler:
+            self.game_manager.profiler.end_frame()
+        
+    def run(self):
+        while not self.game_manager.game_over and self.frame < self.max_frames:
+            self.step()
+        
+        return self.result()
+    
+    def result(self):
+        return {
+            "score": self.game_manager.score,
+            "frames": self.frame,
+            "steps": self.game_manager.step_count,
+            "sim_time": self.game_manager.sim_time,
+            "drained": self.game_manager.game_over,
+            "bumper_hits": {bumper.bumper_id: bumper.hit_count for bumper in self.game_manager.bumpers}
+        }
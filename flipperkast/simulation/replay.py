@@ -0,0 +1,193 @@
+import json
+
+from game.game_manager import GameManager
+from game.table_loader import DEFAULT_TABLE
+from game.world_builder import WorldBuilder, QUALITY_PRESETS, DEFAULT_QUALITY
+from mqtt.null_client import NullMQTTClient
+
+REPLAY_FORMAT_VERSION = 1
+
+def checkpoint_state(game_manager):
+    body = game_manager.ball_shape.body
+    return {
+        "score": game_manager.score,
+        "game_over": game_manager.game_over,
+        "ball": [body.position.x, body.position.y, body.velocity.x, body.velocity.y],
+        "flippers": [flipper.body.angle for flipper in game_manager.get_flippers()]
+    }
+
+class ReplayRecorder:
+    def __init__(self, path, checkpoint_interval=90):
+        self.path = path
+        self.checkpoint_interval = checkpoint_interval
+        self.file = None
+        self.input_count = 0
+        self.checkpoint_count = 0
+    
+    def start(self, game_manager):
+        if game_manager.step_count > 0:
+            print(f"Recording started at step {game_manager.step_count}, replay will start from a fresh game")
+        
+        self.file = open(self.path, 'w')
+        self.write({
+            "type": "header",
+            "version": REPLAY_FORMAT_VERSION,
+            "seed": game_manager.seed,
+            "table": game_manager.table,
+            "table_hash": game_manager.layout.source_hash,
+            "tuning": game_manager.tuning,
+            "quality": game_manager.world.quality,
+            "use_spatial_hash": game_manager.world.use_spatial_hash,
+            "physics_rate": game_manager.physics_rate,
+            "substeps": game_manager.substeps,
+            "iterations": game_manager.space.iterations,
+            "checkpoint_interval": self.checkpoint_interval
+        })
+    
+    def write(self, entry):
+        self.file.write(json.dumps(entry, separators=(",", ":")) + "\n")
+    
+    def record_input(self, step, action, value):
+        if self.file:
+            self.write(["i", step, action, value])
+            self.input_count += 1
+    
+    def after_step(self, game_manager):
+        if self.file and game_manager.step_count % self.checkpoint_interval == 0:
+            self.write(["c", game_manager.step_count, checkpoint_state(game_manager)])
+            self.file.flush()
+            self.checkpoint_count += 1
+    
+    def close(self, game_manager):
+        if self.file:
+            self.write(["e", game_manager.step_count, checkpoint_state(game_manager)])
+            self.file.close()
+            self.file = None
+
+class Replay:
+    def __init__(self, header, inputs, checkpoints, end_step=None):
+        self.header = header
+        self.inputs = inputs
+        self.checkpoints = checkpoints
+        self.end_step = end_step
+    
+    @staticmethod
+    def load(path):
+        header = None
+        inputs = {}
+        checkpoints = {}
+        end_step = None
+        
+        with open(path, 'r') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    print(f"Skipping truncated replay line in {path}")
+                    break
+                
+                if isinstance(entry, dict):
+                    header = entry
+                elif entry[0] == "i":
+                    inputs.setdefault(entry[1], []).append((entry[2], entry[3]))
+                elif entry[0] == "c":
+                    checkpoints[entry[1]] = entry[2]
+                elif entry[0] == "e":
+                    end_step = entry[1]
+                    checkpoints[entry[1]] = entry[2]
+        
+        if header is None:
+            raise ValueError(f"Replay {path} has no header")
+        
+        return Replay(header, inputs, checkpoints, end_step)
+    
+    def last_step(self):
+        if self.end_step is not None:
+            return self.end_step
+        steps = list(self.inputs) + list(self.checkpoints)
+        return max(steps) if steps else 0
+
+class ReplayPlayer:
+    def __init__(self, replay):
+        if isinstance(replay, str):
+            replay = Replay.load(replay)
+        self.replay = replay
+        self.mismatches = []
+        self.snapshots = {}
+        self.exact = True
+        self.game_manager = None
+        self.reset()
+    
+    def recorded_quality(self):
+        header = self.replay.header
+        if "quality" in header:
+            return header["quality"]
+        
+        for quality, preset in QUALITY_PRESETS.items():
+            if preset["physics_rate"] == header["physics_rate"]:
+                return quality
+        return DEFAULT_QUALITY
+    
+    def reset(self):
+        header = self.replay.header
+        world = WorldBuilder(self.recorded_quality(), header.get("use_spatial_hash"))
+        self.game_manager = GameManager(mqtt_client=NullMQTTClient(), leaderboard_path=None, seed=header["seed"],
+                                        table=header.get("table", DEFAULT_TABLE), world=world, tuning=header.get("tuning"))
+        if header.get("table_hash", self.game_manager.layout.source_hash) != self.game_manager.layout.source_hash:
+            print(f"Table {self.game_manager.table} changed since recording, replay may diverge")
+        if header.get("iterations", world.iterations) != world.iterations:
+            print(f"Replay was recorded with {header['iterations']} solver iterations, playing back with {world.iterations}")
+        self.mismatches = []
+        self.snapshots.setdefault(0, self.game_manager.snapshot())
+        self.exact = True
+    
+    def step(self):
+        game_manager = self.game_manager
+        
+        for action, value in self.replay.inputs.get(game_manager.step_count, ()):
+            game_manager.apply_input(action, value)
+        
+        game_manager.step()
+        
+        expected = self.replay.checkpoints.get(game_manager.step_count)
+        if expected is not None and self.exact:
+            actual = checkpoint_state(game_manager)
+            if actual != expected:
+                self.mismatches.append({"step": game_manager.step_count, "expected": expected, "actual": actual})
+            self.snapshots.setdefault(game_manager.step_count, game_manager.snapshot())
+    
+    def seek(self, step):
+        current = self.game_manager.step_count
+        nearest = max((known for known in self.snapshots if known <= step), default=0)
+        
+        if step < current or nearest > current:
+            self.game_manager.restore(self.snapshots[nearest])
+            self.exact = False
+        
+        while self.game_manager.step_count < step:
+            self.step()
+        
+        return self.game_manager
+    
+    def seek_checkpoint(self, index):
+        steps = sorted(self.replay.checkpoints)
+        return self.seek(steps[index])
+    
+    def run(self):
+        if not self.exact:
+            self.reset()
+        
+        while self.game_manager.step_count < self.replay.last_step():
+            self.step()
+        
+        return {
+            "score": self.game_manager.score,
+            "steps": self.game_manager.step_count,
+            "sim_time": self.game_manager.sim_time,
+            "drained": self.game_manager.game_over,
+            "checkpoints": len(self.replay.checkpoints),
+            "mismatches": len(self.mismatches)
+        }
@@ -0,0 +1,122 @@
+import hashlib
+import itertools
+import json
+import os
+import random
+
+from game.table_loader import DEFAULT_TABLE
+from game.tuning import DEFAULT_TUNING, make_tuning
+from simulation.batch import BatchEngine, aggregate_results
+
+SWEEP_CACHE_VERSION = 1
+DEFAULT_SWEEP_CACHE = "sweep_cache.json"
+
+def grid_configs(grid):
+    names = sorted(grid)
+    return [dict(zip(names, values)) for values in itertools.product(*(grid[name] for name in names))]
+
+def random_configs(ranges, samples, seed=0):
+    rng = random.Random(seed)
+    configs = []
+    
+    for _ in range(samples):
+        config = {}
+        for name in sorted(ranges):
+            low, high = ranges[name]
+            if isinstance(low, int) and isinstance(high, int):
+                config[name] = rng.randint(low, high)
+            else:
+                config[name] = rng.uniform(low, high)
+        configs.append(config)
+    
+    return configs
+
+def spec_configs(spec):
+    if "grid" in spec:
+        configs = grid_configs(spec["grid"])
+    elif "random" in spec:
+        configs = random_configs(spec["random"], spec.get("samples", 20), spec.get("seed", 0))
+    else:
+        raise ValueError("Sweep spec needs a 'grid' or 'random' section")
+    
+    for config in configs:
+        make_tuning(config)
+    return configs
+
+class SweepRunner:
+    def __init__(self, games=50, base_seed=0, max_frames=13500, processes=None, layout=DEFAULT_TABLE,
+                 cache_path=DEFAULT_SWEEP_CACHE):
+        self.games = games
+        self.base_seed = base_seed
+        self.engine = BatchEngine(processes=processes, max_frames=max_frames, layout=layout)
+        self.cache_path = cache_path
+        self.cache = self.load_cache()
+    
+    def config_key(self, config):
+        key = {
+            "version": SWEEP_CACHE_VERSION,
+            "tuning": make_tuning(config),
+            "table": self.engine.layout.source_hash,
+            "games": self.games,
+            "base_seed": self.base_seed,
+            "max_frames": self.engine.max_frames
+        }
+        encoded = json.dumps(key, sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+    
+    def load_cache(self):
+        if not self.cache_path or not os.path.exists(self.cache_path):
+            return {}
+        
+        try:
+            with open(self.cache_path, 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Could not read sweep cache {self.cache_path}: {e}")
+            return {}
+    
+    def save_cache(self):
+        if not self.cache_path:
+            return
+        
+        temp_path = self.cache_path + ".tmp"
+        with open(temp_path, 'w') as f:
+            json.dump(self.cache, f, indent=2)
+        os.replace(temp_path, self.cache_path)
+    
+    def run(self, configs):
+        keys = [self.config_key(config) for config in configs]
+        pending = {}
+        for config, key in zip(configs, keys):
+            if key not in self.cache and key not in pending:
+                pending[key] = config
+        
+        tables = []
+        for key, config in pending.items():
+            for table in self.engine.make_tables(self.games, self.base_seed, tuning=config):
+                table["config_key"] = key
+                tables.append(table)
+        
+        if tables:
+            results = self.engine.run(tables)["results"]
+            for key, config in pending.items():
+                games = [result for table, result in zip(tables, results) if table["config_key"] == key]
+                self.cache[key] = {"config": config, "summary": aggregate_results(games)}
+            self.save_cache()
+        
+        return [
+            {"config": config, "key": key, "cached": key not in pending, "summary": self.cache[key]["summary"]}
+            for config, key in zip(configs, keys)
+        ]
+    
+    def run_spec(self, spec):
+        return self.run(spec_configs(spec))
+
+def format_result(result):
+    summary = result["summary"]
+    changed = {name: value for name, value in result["config"].items() if value != DEFAULT_TUNING[name]}
+    label = ", ".join(f"{name}={value:g}" for name, value in sorted(changed.items())) or "defaults"
+    
+    return (f"{label}: time in play {summary['time_in_play_mean']:.1f} s, "
+            f"score mean {summary['score_mean']:.1f} (quartiles {', '.join(f'{q:g}' for q in summary['score_quartiles'])}), "
+            f"drain rate {summary['drain_rate']:.2f}" + (" [cached]" if result["cached"] else ""))
@@ -0,0 +1,31 @@
+import unittest
+from simulation.batch import BatchEngine, aggregate_results
+
+class TestBatchEngine(unittest.TestCase):
+    def test_same_seed_gives_same_game(self):
+        engine = BatchEngine(processes=1, max_frames=300)
+        
+        first = engine.run_games(2, base_seed=7)["results"]
+        second = engine.run_games(2, base_seed=7)["results"]
+        
+        self.assertEqual([r["seed"] for r in first], [7, 8])
+        self.assertEqual([r["score"] for r in first], [r["score"] for r in second])
+        self.assertEqual([r["frames"] for r in first], [r["frames"] for r in second])
+        
+    def test_aggregate_results(self):
+        results = [
+            {"score": 10, "drained": True, "sim_time": 4.0, "bumper_hits": {"a": 1, "b": 0}},
+            {"score": 30, "drained": False, "sim_time": 9.0, "bumper_hits": {"a": 2, "b": 1}}
+        ]
+        
+        summary = aggregate_results(results)
+        
+        self.assertEqual(summary["tables"], 2)
+        self.assertEqual(summary["score_mean"], 20)
+        self.assertEqual(summary["drain_rate"], 0.5)
+        self.assertEqual(summary["drain_time_mean"], 4.0)
+        self.assertEqual(summary["bumper_hits"], {"a": 3, "b": 1})
+        self.assertEqual(summary["bumper_hits_total"], 4)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,60 @@
+import unittest
+from mqtt.dead_reckoning import DeadReckoningPublisher, PositionExtrapolator, KEYFRAME, CORRECTION
+
+GRAVITY = (0.0, 500.0)
+
+def ballistic(t, x0=100.0, y0=100.0, vx=200.0, vy=-300.0):
+    return x0 + vx * t, y0 + vy * t + 0.5 * GRAVITY[1] * t * t, vx, vy + GRAVITY[1] * t
+
+class TestDeadReckoning(unittest.TestCase):
+    def setUp(self):
+        self.publisher = DeadReckoningPublisher(GRAVITY, tolerance=2.0, keyframe_interval=1.0, epoch=0.0)
+        
+    def test_ballistic_flight_only_sends_keyframes(self):
+        kinds = []
+        for frame in range(90):
+            t = frame / 45.0
+            kinds.append(self.publisher.update(*ballistic(t), t))
+            
+        sent = [kind for kind in kinds if kind]
+        self.assertEqual(sent, [KEYFRAME, KEYFRAME])
+        self.assertEqual(self.publisher.skipped_count, 88)
+        
+    def test_bounce_sends_correction(self):
+        self.assertEqual(self.publisher.update(*ballistic(0.0), 0.0), KEYFRAME)
+        
+        x, y, vx, vy = ballistic(0.1)
+        self.assertIsNone(self.publisher.update(x, y, vx, vy, 0.1))
+        
+        x, y, vx, vy = ballistic(0.2)
+        self.assertEqual(self.publisher.update(x - 10, y, -vx, vy, 0.2), CORRECTION)
+        
+    def test_extrapolator_reconstructs_flight(self):
+        extrapolator = PositionExtrapolator(GRAVITY, blend_time=0.0)
+        x, y, vx, vy = ballistic(0.0)
+        extrapolator.add_sample({"x": x, "y": y, "vx": vx, "vy": vy, "timestamp": 0.0}, received_at=0.0)
+        
+        expected_x, expected_y, _, _ = ballistic(0.3)
+        
+        self.assertAlmostEqual(extrapolator.position_at(0.3)[0], expected_x, places=6)
+        self.assertAlmostEqual(extrapolator.position_at(0.3)[1], expected_y, places=6)
+        self.assertAlmostEqual(extrapolator.position_now(0.3)[1], expected_y, places=6)
+        
+    def test_extrapolator_blends_corrections(self):
+        extrapolator = PositionExtrapolator((0.0, 0.0), blend_time=0.2)
+        extrapolator.add_sample({"x": 0.0, "y": 0.0, "vx": 100.0, "vy": 0.0, "timestamp": 0.0})
+        extrapolator.add_sample({"x": 20.0, "y": 0.0, "vx": -100.0, "vy": 0.0, "timestamp": 0.1})
+        
+        self.assertAlmostEqual(extrapolator.position_at(0.1)[0], 10.0)
+        self.assertAlmostEqual(extrapolator.position_at(0.2)[0], 15.0)
+        self.assertAlmostEqual(extrapolator.position_at(0.3)[0], 0.0)
+        
+    def test_extrapolator_ignores_stale_samples(self):
+        extrapolator = PositionExtrapolator(GRAVITY)
+        extrapolator.add_sample({"x": 5.0, "y": 5.0, "vx": 0.0, "vy": 0.0, "timestamp": 2.0})
+        extrapolator.add_sample({"x": 1.0, "y": 1.0, "vx": 0.0, "vy": 0.0, "timestamp": 1.0})
+        
+        self.assertEqual(extrapolator.current_sample["timestamp"], 2.0)
+
+if __name__ == '__main__':
+    unittest.main()
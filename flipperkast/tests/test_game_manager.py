@@ -3,13 +3,16 @@ from unittest.mock import MagicMock, patch
 import pymunk
 import json
 import os
+import time
 from game.game_manager import GameManager
+from game.inputs import LEFT_FLIPPER_ACTIVATE, PLUNGER_COMPRESS, PLUNGER_LAUNCH
+from mqtt.null_client import NullMQTTClient
 
 class TestGameManager(unittest.TestCase):
-    @patch('mqtt.mqtt_client.MQTTClient')
-    def setUp(self, mock_mqtt_client):
+    @patch('mqtt.pool.MQTTClientPool.acquire')
+    def setUp(self, mock_acquire):
         self.mock_mqtt = MagicMock()
-        mock_mqtt_client.return_value = self.mock_mqtt
+        mock_acquire.return_value = self.mock_mqtt
         
         self.mock_mqtt.publish_game_status = MagicMock()
         self.mock_mqtt.publish_ball_position = MagicMock()
@@ -51,35 +54,124 @@ class TestGameManager(unittest.TestCase):
         
         self.mock_mqtt.publish_ball_position.assert_called_once_with(100, 200, 10, -20)
         
-    @patch('json.dump')
-    @patch('builtins.open', new_callable=unittest.mock.mock_open)
-    def test_save_highscore(self, mock_open, mock_json_dump):
-        score = 100
+    def test_position_streaming_publishes_keyframe(self):
+        self.game_manager.ball_shape = self.game_manager.ball.shape
+        self.game_manager.enable_position_streaming(tolerance=4.0, keyframe_interval=1.0)
         
-        self.game_manager.save_highscore(score)
+        self.game_manager.update()
+        self.game_manager.update()
         
-        mock_open.assert_called_once_with('highscore.json', 'w')
-        mock_json_dump.assert_called_once_with({'highscore': score}, mock_open())
-        self.mock_mqtt.publish_game_status.assert_called_with("NEW_HIGHSCORE", score)
+        self.mock_mqtt.publish_ball_position.assert_called_once()
+        self.assertTrue(self.mock_mqtt.publish_ball_position.call_args[1]["keyframe"])
         
-    def test_on_bumper_hit_post(self):
-        mock_arbiter = MagicMock()
-        mock_arbiter.shapes = [MagicMock(), MagicMock()]
-        mock_arbiter.shapes[1].collision_type = 98
+    def test_position_stream_timestamps_follow_wall_clock(self):
+        self.game_manager.ball_shape = self.game_manager.ball.shape
+        start = self.game_manager.snapshot()
+        for _ in range(90):
+            self.game_manager.update()
+        
+        self.game_manager.enable_position_streaming()
+        self.game_manager.update()
+        self.assertAlmostEqual(self.mock_mqtt.publish_ball_position.call_args[1]["timestamp"], time.time(), delta=0.5)
+        
+        self.game_manager.restore(start)
+        self.game_manager.update()
+        self.assertTrue(self.mock_mqtt.publish_ball_position.call_args[1]["keyframe"])
+        self.assertAlmostEqual(self.mock_mqtt.publish_ball_position.call_args[1]["timestamp"], time.time(), delta=0.5)
+        
+    @patch('mqtt.pool.MQTTClientPool.release')
+    def test_stop_leaves_injected_client_running(self, mock_release):
+        client = MagicMock()
+        game_manager = GameManager(client, leaderboard_path=None)
+        game_manager.stop()
+        
+        client.publish_game_status.assert_called_with("STOPPED")
+        client.flush.assert_called_with(force=True)
+        client.stop.assert_not_called()
+        mock_release.assert_not_called()
+        
+    def test_advance_runs_fixed_steps_and_keeps_remainder(self):
+        self.game_manager.ball_shape = self.game_manager.ball.shape
+        
+        steps = self.game_manager.advance(0.04)
+        
+        self.assertEqual(steps, 4)
+        self.assertEqual(self.game_manager.step_count, 4)
+        self.assertAlmostEqual(self.game_manager.interpolation_alpha, 0.8, places=6)
+        
+        steps = self.game_manager.advance(0.005)
+        
+        self.assertEqual(steps, 1)
+        self.assertAlmostEqual(self.game_manager.sim_time, 5 / 90.0, places=9)
         
-        mock_bumper = MagicMock()
-        mock_bumper.shape = mock_arbiter.shapes[1]
-        self.game_manager.bumpers = [mock_bumper]
+    def test_advance_caps_catch_up_steps(self):
+        self.game_manager.ball_shape = self.game_manager.ball.shape
+        
+        steps = self.game_manager.advance(2.0)
+        
+        self.assertEqual(steps, self.game_manager.max_steps_per_frame)
+        self.assertLess(self.game_manager.accumulator, 1.0 / self.game_manager.physics_rate)
+        
+    def test_interpolated_ball_position(self):
+        self.game_manager.ball_shape = self.game_manager.ball.shape
+        body = self.game_manager.ball_shape.body
+        self.game_manager.previous_ball_position = pymunk.Vec2d(100, 100)
+        body.position = (110, 120)
+        self.game_manager.interpolation_alpha = 0.5
+        
+        self.assertEqual(self.game_manager.interpolated_ball_position(), pymunk.Vec2d(105, 110))
+        
+    def test_record_score_submits_to_leaderboard(self):
+        self.game_manager.leaderboard = MagicMock()
+        self.game_manager.leaderboard.submit.return_value = 1
+        self.game_manager.score = 100
+        
+        rank = self.game_manager.record_score()
+        
+        self.assertEqual(rank, 1)
+        self.assertEqual(self.game_manager.highscore, 100)
+        self.game_manager.leaderboard.submit.assert_called_once_with(100, "Player", "default")
+        self.mock_mqtt.publish_game_status.assert_called_with("NEW_HIGHSCORE", 100)
+        
+    def make_bumper_arbiter(self):
+        bumper = self.game_manager.bumpers[0]
+        ball_body = self.game_manager.ball.body
+        ball_body.position = bumper.body.position + (0, -30)
+        ball_body.velocity = (0, 100)
+        
+        mock_arbiter = MagicMock()
+        mock_arbiter.shapes = (self.game_manager.ball.shape, bumper.shape)
+        return mock_arbiter, bumper
         
+    def test_on_bumper_hit_begin(self):
+        mock_arbiter, bumper = self.make_bumper_arbiter()
         self.game_manager.display = MagicMock()
         
-        result = self.game_manager.on_bumper_hit_post(mock_arbiter, None, None)
+        result = self.game_manager.on_bumper_hit_begin(mock_arbiter, None, None)
         
         self.assertTrue(result)
         self.assertEqual(self.game_manager.score, 10)
         self.game_manager.display.update_score.assert_called_once_with(10)
-        mock_bumper.hit.assert_called_once()
+        self.assertTrue(bumper.is_hit)
+        self.assertEqual(bumper.hit_count, 1)
         self.mock_mqtt.publish_score_update.assert_called_once_with(10)
+        self.assertLess(self.game_manager.ball.body.velocity.y, 0)
+        
+    def test_bumper_hit_is_debounced(self):
+        mock_arbiter, bumper = self.make_bumper_arbiter()
+        
+        self.game_manager.on_bumper_hit_begin(mock_arbiter, None, None)
+        self.game_manager.sim_time += bumper.cooldown / 2
+        self.game_manager.on_bumper_hit_begin(mock_arbiter, None, None)
+        
+        self.assertEqual(self.game_manager.score, 10)
+        self.mock_mqtt.publish_score_update.assert_called_once_with(10)
+        
+        self.game_manager.sim_time += bumper.cooldown
+        self.game_manager.on_bumper_hit_begin(mock_arbiter, None, None)
+        
+        self.assertEqual(self.game_manager.score, 20)
+        self.assertEqual(bumper.hit_count, 2)
         
     def test_on_ball_drained(self):
         mock_arbiter = MagicMock()
@@ -102,6 +194,74 @@ class TestGameManager(unittest.TestCase):
             self.mock_ball_shape.body, 0.8)
         self.mock_mqtt.publish_game_status.assert_any_call("STARTED")
         self.mock_mqtt.publish_game_status.assert_called_with("BALL_LAUNCHED", 0.8)
+        
+    def test_snapshot_restore_round_trip(self):
+        game_manager = GameManager(NullMQTTClient(), leaderboard_path=None, seed=1)
+        game_manager.apply_input(PLUNGER_COMPRESS, 50)
+        game_manager.apply_input(PLUNGER_LAUNCH, 1.0)
+        for _ in range(60):
+            game_manager.update()
+        
+        snapshot = json.loads(json.dumps(game_manager.snapshot()))
+        ball_position = game_manager.ball_shape.body.position
+        
+        game_manager.apply_input(LEFT_FLIPPER_ACTIVATE)
+        game_manager.bumpers[0].hit()
+        game_manager.score += 50
+        for _ in range(30):
+            game_manager.update()
+        
+        game_manager.restore(snapshot)
+        
+        self.assertEqual(game_manager.ball_shape.body.position, ball_position)
+        self.assertEqual(json.loads(json.dumps(game_manager.snapshot())), snapshot)
+        self.assertFalse(game_manager.left_flipper.motor_active)
+        self.assertNotIn(game_manager.left_flipper.motor, game_manager.space.constraints)
+        
+    def test_restore_continues_identically(self):
+        game_manager = GameManager(NullMQTTClient(), leaderboard_path=None, seed=2)
+        game_manager.apply_input(PLUNGER_COMPRESS, 50)
+        game_manager.apply_input(PLUNGER_LAUNCH, 1.0)
+        for _ in range(40):
+            game_manager.update()
+        
+        snapshot = game_manager.snapshot()
+        for _ in range(10):
+            game_manager.update()
+        expected = game_manager.ball_shape.body.position
+        
+        game_manager.restore(snapshot)
+        for _ in range(10):
+            game_manager.update()
+        
+        self.assertEqual(game_manager.step_count, snapshot["step_count"] + 20)
+        self.assertAlmostEqual(game_manager.ball_shape.body.position.x, expected.x, places=6)
+        self.assertAlmostEqual(game_manager.ball_shape.body.position.y, expected.y, places=6)
+        
+    def test_new_game_resets_dynamic_state(self):
+        game_manager = GameManager(NullMQTTClient(), leaderboard_path=None, seed=1)
+        space = game_manager.space
+        game_manager.apply_input(LEFT_FLIPPER_ACTIVATE)
+        game_manager.bumpers[0].hit()
+        game_manager.score = 120
+        game_manager.highscore = 120
+        game_manager.game_over = True
+        for _ in range(20):
+            game_manager.update()
+        
+        game_manager.new_game(seed=9)
+        
+        self.assertIs(game_manager.space, space)
+        self.assertEqual(game_manager.seed, 9)
+        self.assertEqual(game_manager.score, 0)
+        self.assertEqual(game_manager.highscore, 120)
+        self.assertFalse(game_manager.game_over)
+        self.assertFalse(game_manager.game_started)
+        self.assertEqual(game_manager.step_count, 0)
+        self.assertFalse(game_manager.left_flipper.motor_active)
+        self.assertFalse(game_manager.bumpers[0].is_hit)
+        self.assertEqual(game_manager.bumpers[0].hit_count, 0)
+        self.assertEqual(game_manager.ball_shape.body.position, game_manager.initial_state["ball"]["position"])
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
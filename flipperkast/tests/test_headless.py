@@ -0,0 +1,93 @@
+import unittest
+from game.game_manager import GameManager
+from game.inputs import LEFT_FLIPPER_ACTIVATE, LEFT_FLIPPER_DEACTIVATE, PLUNGER_COMPRESS, PLUNGER_LAUNCH
+from mqtt.null_client import NullMQTTClient
+from simulation.headless import HeadlessRunner, ScriptedInput, AutoPlayInput
+
+class TestHeadlessRunner(unittest.TestCase):
+    def setUp(self):
+        self.game_manager = GameManager(mqtt_client=NullMQTTClient(), leaderboard_path=None)
+        
+    def test_scripted_input_emits_events_in_frame_order(self):
+        script = ScriptedInput([
+            (5, LEFT_FLIPPER_DEACTIVATE, None),
+            (0, LEFT_FLIPPER_ACTIVATE, None),
+            (5, PLUNGER_LAUNCH, 0.5)
+        ])
+        
+        self.assertEqual(script.poll(0, self.game_manager), [(LEFT_FLIPPER_ACTIVATE, None)])
+        self.assertEqual(script.poll(4, self.game_manager), [])
+        self.assertEqual(script.poll(5, self.game_manager),
+                         [(LEFT_FLIPPER_DEACTIVATE, None), (PLUNGER_LAUNCH, 0.5)])
+        
+    def test_apply_input_drives_flippers_and_plunger(self):
+        self.game_manager.apply_input(LEFT_FLIPPER_ACTIVATE)
+        self.assertTrue(self.game_manager.left_flipper.motor_active)
+        
+        self.game_manager.apply_input(LEFT_FLIPPER_DEACTIVATE)
+        self.assertFalse(self.game_manager.left_flipper.motor_active)
+        
+        self.game_manager.apply_input(PLUNGER_COMPRESS, 30)
+        self.assertEqual(self.game_manager.plunger.compression, 30)
+        
+        self.game_manager.apply_input(PLUNGER_LAUNCH, 1.0)
+        self.assertEqual(self.game_manager.plunger.compression, 0)
+        self.assertTrue(self.game_manager.game_started)
+        
+    def test_run_advances_simulation_without_display(self):
+        runner = HeadlessRunner(self.game_manager, AutoPlayInput(), max_frames=200)
+        
+        result = runner.run()
+        
+        self.assertLessEqual(result["frames"], 200)
+        self.assertEqual(result["steps"], result["frames"] * 2)
+        self.assertAlmostEqual(result["sim_time"], result["steps"] / 90.0, places=6)
+        self.assertIn("top_left", result["bumper_hits"])
+        self.assertIsNone(self.game_manager.display)
+        
+    def test_run_stops_when_game_over(self):
+        self.game_manager.game_over = True
+        runner = HeadlessRunner(self.game_manager, ScriptedInput())
+        
+        result = runner.run()
+        
+        self.assertEqual(result["frames"], 0)
+        self.assertTrue(result["drained"])
+        
+    def test_headless_does_not_import_network_or_graphics(self):
+        import subprocess
+        import sys
+        
+        code = ("import sys; from simulation.headless import HeadlessRunner; HeadlessRunner(max_frames=1).run(); "
+                "print(any(name.split('.')[0] in ('paho', 'pygame') for name in sys.modules))")
+        output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True).stdout
+        
+        self.assertEqual(output.strip().splitlines()[-1], "False")
+        
+    def test_reset_reuses_game_manager(self):
+        runner = HeadlessRunner(self.game_manager, max_frames=3000)
+        runner.reset(seed=4)
+        runner.run()
+        space = self.game_manager.space
+        
+        runner.reset(seed=5)
+        
+        self.assertIs(runner.game_manager.space, space)
+        self.assertEqual(runner.frame, 0)
+        self.assertEqual(self.game_manager.score, 0)
+        self.assertFalse(self.game_manager.game_over)
+        
+    def test_reset_game_matches_fresh_game(self):
+        runner = HeadlessRunner(self.game_manager, max_frames=2000)
+        runner.reset(seed=3)
+        runner.run()
+        
+        runner.reset(seed=4)
+        reused = runner.run()
+        fresh = HeadlessRunner(max_frames=2000, seed=4).run()
+        
+        self.assertEqual(reused["score"], fresh["score"])
+        self.assertEqual(reused["steps"], fresh["steps"])
+
+if __name__ == '__main__':
+    unittest.main()
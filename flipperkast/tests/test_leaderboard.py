@@ -0,0 +1,126 @@
+import unittest
+from unittest.mock import patch
+import os
+import json
+import tempfile
+from game.leaderboard import Leaderboard
+from game.game_manager import GameManager
+from mqtt.null_client import NullMQTTClient
+
+class TestLeaderboard(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, "leaderboard.json")
+        self.legacy_path = os.path.join(self.temp_dir.name, "highscore.json")
+        
+    def tearDown(self):
+        self.temp_dir.cleanup()
+        
+    def test_keeps_top_entries_in_order(self):
+        leaderboard = Leaderboard(None, max_entries=3)
+        
+        for score in (50, 200, 10, 120, 80):
+            leaderboard.submit(score, timestamp=score)
+            
+        self.assertEqual([entry["score"] for entry in leaderboard.top()], [200, 120, 80])
+        self.assertEqual(leaderboard.highscore(), 200)
+        
+    def test_submit_returns_rank(self):
+        leaderboard = Leaderboard(None, max_entries=2)
+        
+        self.assertEqual(leaderboard.submit(100), 1)
+        self.assertEqual(leaderboard.submit(300), 1)
+        self.assertEqual(leaderboard.submit(200), 2)
+        self.assertIsNone(leaderboard.submit(50))
+        self.assertIsNone(leaderboard.submit(0))
+        
+    def test_top_per_table(self):
+        leaderboard = Leaderboard(None)
+        leaderboard.submit(100, "ann", "classic")
+        leaderboard.submit(300, "bob", "space")
+        leaderboard.submit(200, "cor", "classic")
+        
+        classic = leaderboard.top(5, "classic")
+        
+        self.assertEqual([entry["player"] for entry in classic], ["cor", "ann"])
+        self.assertEqual(leaderboard.top(1)[0]["player"], "bob")
+        self.assertEqual(leaderboard.highscore("space"), 300)
+        self.assertEqual(leaderboard.top(5, "unknown"), [])
+        self.assertTrue(leaderboard.qualifies(50, "classic"))
+        
+    def test_background_writes_are_persisted(self):
+        leaderboard = Leaderboard(self.path, legacy_path=None)
+        leaderboard.submit(150, "ann", "classic")
+        leaderboard.submit(90, "bob", "classic")
+        leaderboard.flush()
+        
+        self.assertFalse(os.path.exists(self.path + ".tmp"))
+        reloaded = Leaderboard(self.path, legacy_path=None, background=False)
+        self.assertEqual([entry["score"] for entry in reloaded.top(table="classic")], [150, 90])
+        leaderboard.close()
+        self.assertFalse(leaderboard.writer.is_alive())
+        
+    def test_synchronous_writes(self):
+        leaderboard = Leaderboard(self.path, legacy_path=None, background=False)
+        leaderboard.submit(70)
+        
+        with open(self.path) as f:
+            data = json.load(f)
+            
+        self.assertEqual(data["version"], 1)
+        self.assertEqual(data["entries"][0]["score"], 70)
+        
+    def test_migrates_legacy_highscore(self):
+        with open(self.legacy_path, 'w') as f:
+            json.dump({'highscore': 420}, f)
+            
+        leaderboard = Leaderboard(self.path, legacy_path=self.legacy_path, background=False)
+        
+        self.assertEqual(leaderboard.highscore(), 420)
+        self.assertTrue(os.path.exists(self.path))
+        
+    def test_corrupt_file_starts_empty(self):
+        with open(self.path, 'w') as f:
+            f.write("{not json")
+            
+        leaderboard = Leaderboard(self.path, legacy_path=None, background=False)
+        
+        self.assertEqual(leaderboard.top(), [])
+        
+    def test_corrupt_file_is_moved_aside_before_writing(self):
+        with open(self.path, 'w') as f:
+            f.write("{not json")
+            
+        leaderboard = Leaderboard(self.path, legacy_path=None, background=False)
+        leaderboard.submit(100, timestamp=1.0)
+        
+        with open(self.path + ".corrupt") as f:
+            self.assertEqual(f.read(), "{not json")
+        self.assertEqual(Leaderboard(self.path, legacy_path=None, background=False).highscore(), 100)
+        
+    def test_entry_with_missing_fields_is_moved_aside(self):
+        content = json.dumps({"entries": [{"player": "a", "score": 5, "table": "default"}]})
+        with open(self.path, 'w') as f:
+            f.write(content)
+            
+        game_manager = GameManager(NullMQTTClient(), leaderboard_path=self.path, seed=1)
+        game_manager.leaderboard.close()
+        
+        self.assertEqual(game_manager.leaderboard.top(), [])
+        with open(self.path + ".corrupt") as f:
+            self.assertEqual(f.read(), content)
+        
+    def test_corrupt_file_is_not_overwritten_when_it_cannot_be_moved(self):
+        with open(self.path, 'w') as f:
+            f.write("{not json")
+            
+        with patch('os.replace', side_effect=PermissionError("read-only")):
+            leaderboard = Leaderboard(self.path, legacy_path=None, background=False)
+        leaderboard.submit(100, timestamp=1.0)
+        
+        with open(self.path) as f:
+            self.assertEqual(f.read(), "{not json")
+        self.assertEqual(leaderboard.highscore(), 100)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,129 @@
+import unittest
+import json
+from mqtt.config import MQTTConfig, TRANSPORT_LOOPBACK
+from mqtt.loopback import LoopbackBroker, LoopbackClient, topic_matches
+from mqtt.mqtt_client import MQTTClient
+from mqtt.topics import SCORE_TOPIC, GAME_STATUS_TOPIC, BALL_POSITION_FORMAT_TOPIC
+from game.score_panel import ScorePanel
+
+class TestLoopback(unittest.TestCase):
+    def setUp(self):
+        self.broker = LoopbackBroker(self.id())
+        LoopbackBroker.brokers[self.id()] = self.broker
+        
+    def tearDown(self):
+        LoopbackBroker.brokers.pop(self.id(), None)
+        
+    def make_client(self):
+        return MQTTClient(config=MQTTConfig.loopback(self.id()))
+        
+    def test_topic_matches_wildcards(self):
+        self.assertTrue(topic_matches("flipperkast/scores", "flipperkast/scores"))
+        self.assertTrue(topic_matches("flipperkast/+", "flipperkast/scores"))
+        self.assertTrue(topic_matches("flipperkast/#", "flipperkast/ball_position/format"))
+        self.assertTrue(topic_matches("#", "flipperkast/scores"))
+        self.assertFalse(topic_matches("flipperkast/+", "flipperkast/ball_position/format"))
+        self.assertFalse(topic_matches("flipperkast/scores/+", "flipperkast/scores"))
+        
+    def test_retained_message_is_delivered_on_subscribe(self):
+        publisher = LoopbackClient(broker=self.broker)
+        subscriber = LoopbackClient(broker=self.broker)
+        received = []
+        subscriber.on_message = lambda client, userdata, message: received.append(message)
+        publisher.connect(self.id())
+        subscriber.connect(self.id())
+        
+        publisher.publish("flipperkast/ball_position/format", '{"encoding": "json"}', retain=True)
+        subscriber.subscribe("flipperkast/#")
+        
+        self.assertEqual(received[0].payload, b'{"encoding": "json"}')
+        self.assertTrue(received[0].retain)
+        
+    def test_publish_without_connection_fails(self):
+        client = LoopbackClient(broker=self.broker)
+        
+        self.assertEqual(client.publish("a", "b").rc, 4)
+        
+    def test_mqtt_clients_talk_over_loopback(self):
+        game = self.make_client()
+        panel_client = self.make_client()
+        game.start()
+        panel = ScorePanel(panel_client)
+        self.assertTrue(panel_client.async_loop)
+        statuses = []
+        panel_client.subscribe(GAME_STATUS_TOPIC, lambda payload: statuses.append(json.loads(payload)["status"]))
+        
+        game.publish_score_update(10)
+        game.publish_score_update(25)
+        game.publish_game_status("STARTED")
+        
+        self.assertEqual(panel.scores["Player"], 35)
+        self.assertEqual(statuses, ["STARTED"])
+        
+        game.stop()
+        panel_client.stop()
+        self.assertEqual(self.broker.clients, [])
+        
+    def test_start_async_over_loopback_replays_queued_messages(self):
+        client = self.make_client()
+        received = []
+        listener = LoopbackClient(broker=self.broker)
+        listener.on_message = lambda c, userdata, message: received.append(message.payload)
+        listener.connect(self.id())
+        listener.subscribe(SCORE_TOPIC)
+        
+        client.running = True
+        client.publish_score_update(5)
+        client.running = False
+        client.start_async()
+        
+        self.assertEqual(received, [b"5"])
+        client.stop()
+        
+    def test_position_format_is_retained(self):
+        client = self.make_client()
+        client.start()
+        client.set_position_encoding("binary")
+        
+        self.assertIn(BALL_POSITION_FORMAT_TOPIC, self.broker.retained)
+        client.stop()
+        
+    def test_config_from_env(self):
+        config = MQTTConfig.from_env({
+            "FLIPPERKAST_MQTT_BROKER": "venue.local",
+            "FLIPPERKAST_MQTT_PORT": "8883",
+            "FLIPPERKAST_MQTT_CLIENT_ID": "table-3",
+            "FLIPPERKAST_MQTT_QOS": "1",
+            "FLIPPERKAST_MQTT_TRANSPORT": "loopback"
+        })
+        
+        self.assertEqual(config.broker, "venue.local")
+        self.assertEqual(config.port, 8883)
+        self.assertEqual(config.client_id, "table-3")
+        self.assertEqual(config.qos, 1)
+        self.assertEqual(config.transport, TRANSPORT_LOOPBACK)
+        
+    def test_config_defaults_and_validation(self):
+        config = MQTTConfig.from_env({})
+        
+        self.assertEqual(config.broker, "broker.hivemq.com")
+        self.assertEqual(config.port, 1883)
+        self.assertEqual(config.qos, 0)
+        
+        with self.assertRaises(ValueError):
+            MQTTConfig(qos=3)
+        with self.assertRaises(ValueError):
+            MQTTConfig(transport="carrier-pigeon")
+            
+    def test_client_uses_config(self):
+        client = MQTTClient(config=MQTTConfig(broker="venue.local", port=8883, client_id="table-3", qos=1,
+                                              transport=TRANSPORT_LOOPBACK))
+        
+        self.assertEqual(client.broker, "venue.local")
+        self.assertEqual(client.port, 8883)
+        self.assertEqual(client.client_id, "table-3")
+        self.assertEqual(client.qos, 1)
+        self.assertIsInstance(client.client, LoopbackClient)
+
+if __name__ == '__main__':
+    unittest.main()
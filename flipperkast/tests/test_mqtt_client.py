@@ -2,8 +2,8 @@ import unittest
 from unittest.mock import MagicMock, patch
 import json
 import time
-from mqtt.mqtt_client import MQTTClient
-from mqtt.topics import SCORE_TOPIC, BUMPER_HIT_TOPIC, BALL_POSITION_TOPIC, GAME_STATUS_TOPIC
+from mqtt.mqtt_client import MQTTClient, unpack_batch, BATCH_FORMAT
+from mqtt.topics import SCORE_TOPIC, BUMPER_HIT_TOPIC, BALL_POSITION_TOPIC, GAME_STATUS_TOPIC, BALL_POSITION_FORMAT_TOPIC
 
 class TestMQTTClient(unittest.TestCase):
     @patch('paho.mqtt.client.Client')
@@ -31,6 +31,19 @@ class TestMQTTClient(unittest.TestCase):
         mock_thread.assert_called_once()
         mock_thread_instance.start.assert_called_once()
         
+    def test_start_async_connects_in_background(self):
+        self.mqtt.start_async()
+        
+        self.mock_client.connect_async.assert_called_once_with("test.broker", 1883, 60)
+        self.mock_client.loop_start.assert_called_once()
+        self.mock_client.connect.assert_not_called()
+        self.assertTrue(self.mqtt.running)
+        
+        self.mqtt.stop()
+        
+        self.mock_client.loop_stop.assert_called_once()
+        self.assertFalse(self.mqtt.running)
+        
     def test_stop(self):
         self.mqtt.running = True
         self.mqtt.thread = MagicMock()
@@ -134,11 +147,173 @@ class TestMQTTClient(unittest.TestCase):
         result = self.mqtt.subscribe("test/topic", callback)
         
         self.assertTrue(result)
-        self.mock_client.subscribe.assert_called_once_with("test/topic")
+        self.mock_client.subscribe.assert_called_once_with("test/topic", qos=0)
         self.assertEqual(len(self.mqtt.subscribed_topics), 1)
         self.assertEqual(self.mqtt.subscribed_topics[0], "test/topic")
         self.assertEqual(len(self.mqtt.topic_callbacks["test/topic"]), 1)
         self.assertEqual(self.mqtt.topic_callbacks["test/topic"][0], callback)
+        
+    def test_outbox_queues_until_flush(self):
+        self.mqtt.running = True
+        self.mock_client.publish.return_value.rc = 0
+        self.mqtt.enable_outbox()
+        
+        self.assertTrue(self.mqtt.publish_score_update(10))
+        self.assertTrue(self.mqtt.publish_score_update(10))
+        self.mqtt.publish_bumper_hit("top_left", 10)
+        self.mqtt.publish_bumper_hit("top_right", 10)
+        self.mock_client.publish.assert_not_called()
+        
+        self.assertEqual(self.mqtt.flush(), 2)
+        
+        self.assertEqual(self.mock_client.publish.call_count, 2)
+        self.mock_client.publish.assert_any_call(SCORE_TOPIC, "20")
+        bumper_payload = self.mock_client.publish.call_args_list[1][0][1]
+        self.assertEqual(json.loads(bumper_payload)["format"], BATCH_FORMAT)
+        self.assertEqual([hit["id"] for hit in unpack_batch(bumper_payload)], ["top_left", "top_right"])
+        
+    def test_topic_subscriber_unwraps_batches(self):
+        self.mqtt.running = True
+        self.mock_client.publish.return_value.rc = 0
+        self.mqtt.enable_outbox()
+        
+        received = []
+        self.mqtt.subscriber(GAME_STATUS_TOPIC, received.append)
+        
+        self.mqtt.publish_game_status("STARTED")
+        self.mqtt.publish_game_status("BALL_LAUNCHED", 1.0)
+        self.mqtt.flush()
+        self.mqtt.publish_game_status("GAME_OVER", 30)
+        self.mqtt.flush()
+        
+        for call in self.mock_client.publish.call_args_list:
+            self.mqtt.on_message(None, None, MagicMock(topic=call[0][0], payload=call[0][1].encode()))
+        
+        self.assertEqual([json.loads(payload)["status"] for payload in received], ["STARTED", "BALL_LAUNCHED", "GAME_OVER"])
+        
+    def test_outbox_single_message_is_unchanged(self):
+        self.mqtt.running = True
+        self.mock_client.publish.return_value.rc = 0
+        self.mqtt.enable_outbox()
+        
+        self.mqtt.publish("test/topic", {"key": "value"})
+        self.mqtt.flush()
+        
+        self.mock_client.publish.assert_called_once_with("test/topic", json.dumps({"key": "value"}))
+        
+    def test_outbox_flushes_when_batch_is_full(self):
+        self.mqtt.running = True
+        self.mock_client.publish.return_value.rc = 0
+        self.mqtt.enable_outbox(flush_interval=60.0, max_batch_size=3)
+        
+        self.mqtt.publish_score_update(10)
+        self.mqtt.publish_score_update(10)
+        self.mock_client.publish.assert_not_called()
+        
+        self.mqtt.publish_score_update(10)
+        self.mock_client.publish.assert_called_once_with(SCORE_TOPIC, "30")
+        
+    def test_outbox_respects_flush_interval(self):
+        self.mqtt.running = True
+        self.mock_client.publish.return_value.rc = 0
+        self.mqtt.enable_outbox(flush_interval=0.5)
+        
+        with patch('time.time', return_value=1000.0):
+            self.mqtt.publish_score_update(10)
+            self.assertEqual(self.mqtt.flush(), 1)
+            self.mqtt.publish_score_update(10)
+            
+        with patch('time.time', return_value=1000.2):
+            self.assertEqual(self.mqtt.flush(), 0)
+            
+        with patch('time.time', return_value=1000.6):
+            self.assertEqual(self.mqtt.flush(), 1)
+        
+    def test_binary_ball_position(self):
+        self.mqtt.running = True
+        self.mock_client.publish.return_value.rc = 0
+        
+        self.mqtt.set_position_encoding("binary")
+        self.mqtt.publish_ball_position(100, 200, 10, -20)
+        
+        format_call, position_call = self.mock_client.publish.call_args_list
+        self.assertEqual(format_call[0][0], BALL_POSITION_FORMAT_TOPIC)
+        self.assertTrue(format_call[1]["retain"])
+        self.assertEqual(json.loads(format_call[0][1])["encoding"], "binary")
+        self.assertEqual(position_call[0][0], BALL_POSITION_TOPIC)
+        self.assertIsInstance(position_call[0][1], bytes)
+        
+    def test_unknown_position_encoding_is_rejected(self):
+        with self.assertRaises(ValueError):
+            self.mqtt.set_position_encoding("bogus")
+            
+        self.assertIsNone(self.mqtt.position_encoder)
+        self.mock_client.publish.assert_not_called()
+        
+    def test_publish_while_disconnected_is_queued(self):
+        self.mqtt.running = True
+        self.mock_client.is_connected.return_value = False
+        
+        self.assertFalse(self.mqtt.publish_score_update(10))
+        self.assertFalse(self.mqtt.publish("test/topic", {"key": "value"}))
+        
+        self.mock_client.publish.assert_not_called()
+        self.assertEqual(len(self.mqtt.offline_queue), 2)
+        
+    def test_queued_messages_are_replayed_in_order_on_connect(self):
+        self.mqtt.running = True
+        self.mock_client.is_connected.return_value = False
+        self.mqtt.publish_score_update(10)
+        self.mqtt.publish_score_update(20)
+        
+        self.mock_client.is_connected.return_value = True
+        self.mock_client.publish.return_value.rc = 0
+        self.mqtt.on_connect(self.mock_client, None, None, 0)
+        
+        self.assertEqual(self.mock_client.publish.call_args_list[0][0], (SCORE_TOPIC, "10"))
+        self.assertEqual(self.mock_client.publish.call_args_list[1][0], (SCORE_TOPIC, "20"))
+        self.assertEqual(len(self.mqtt.offline_queue), 0)
+        
+    def test_position_samples_do_not_evict_queued_events(self):
+        self.mqtt.running = True
+        self.mock_client.is_connected.return_value = False
+        
+        self.mqtt.publish_score_update(10)
+        for i in range(2000):
+            self.mqtt.send(BALL_POSITION_TOPIC, str(i))
+        self.mqtt.publish_game_status("game_over")
+        
+        queued = self.mqtt.offline_queue.drain()
+        self.assertEqual([topic for topic, _, _ in queued], [SCORE_TOPIC, GAME_STATUS_TOPIC, BALL_POSITION_TOPIC])
+        self.assertEqual(queued[2][1], "1999")
+        
+    def test_start_with_broker_down_retries_in_background(self):
+        self.mock_client.connect.side_effect = ConnectionRefusedError("broker down")
+        self.mock_client.is_connected.return_value = False
+        
+        self.mqtt.start()
+        
+        self.assertTrue(self.mqtt.running)
+        self.mock_client.connect_async.assert_called_once_with("test.broker", 1883, 60)
+        self.mock_client.loop_start.assert_called_once()
+        
+        self.mqtt.publish_score_update(10)
+        self.assertEqual(len(self.mqtt.offline_queue), 1)
+        
+        self.mock_client.is_connected.return_value = True
+        self.mock_client.publish.return_value.rc = 0
+        self.mqtt.on_connect(self.mock_client, None, None, 0)
+        
+        self.mock_client.publish.assert_called_once_with(SCORE_TOPIC, "10")
+        self.assertEqual(len(self.mqtt.offline_queue), 0)
+        
+    def test_unexpected_disconnect_does_not_block(self):
+        with patch('time.sleep') as mock_sleep:
+            self.mqtt.on_disconnect(self.mock_client, None, 7)
+            
+        mock_sleep.assert_not_called()
+        self.mock_client.reconnect.assert_not_called()
+        self.mock_client.reconnect_delay_set.assert_called_once_with(min_delay=1, max_delay=60)
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,141 @@
+import unittest
+from unittest.mock import MagicMock, patch
+import json
+import numpy as np
+from game.game_manager import GameManager
+from mqtt.null_client import NullMQTTClient
+from mqtt.topics import BALL_POSITIONS_TOPIC
+
+class TestMultiBall(unittest.TestCase):
+    def setUp(self):
+        self.game_manager = GameManager(NullMQTTClient(), leaderboard_path=None, seed=4)
+    
+    def test_start_multiball_adds_balls(self):
+        bodies = len(self.game_manager.space.bodies)
+        
+        multiball = self.game_manager.start_multiball(4)
+        multiball.sync()
+        
+        self.assertEqual(len(multiball.balls), 4)
+        self.assertEqual(len(self.game_manager.space.bodies), bodies + 3)
+        self.assertEqual(multiball.positions.shape, (4, 2))
+        self.assertEqual(len(self.game_manager.ball_positions()), 3)
+    
+    def test_arrays_match_bodies(self):
+        multiball = self.game_manager.start_multiball(5)
+        for _ in range(10):
+            self.game_manager.update()
+        
+        multiball.sync()
+        expected = [tuple(ball.body.position) + tuple(ball.body.velocity) for ball in multiball.balls]
+        
+        np.testing.assert_array_equal(np.hstack((multiball.positions, multiball.velocities)), expected)
+    
+    def test_lost_ball_does_not_end_game_until_last(self):
+        multiball = self.game_manager.start_multiball(3)
+        first, second, third = multiball.balls
+        
+        second.body.position = (400, 1500)
+        self.game_manager.check_ball_bounds()
+        
+        self.assertFalse(self.game_manager.game_over)
+        self.assertEqual(multiball.balls, [first, third])
+        self.assertNotIn(second.body, self.game_manager.space.bodies)
+        
+        first.body.position = (400, 1500)
+        self.game_manager.check_ball_bounds()
+        
+        self.assertFalse(self.game_manager.game_over)
+        self.assertIs(self.game_manager.ball, third)
+        self.assertIs(self.game_manager.ball_shape, third.shape)
+        self.assertIsNone(self.game_manager.multiball)
+        
+        third.body.position = (400, 1500)
+        self.game_manager.check_ball_bounds()
+        
+        self.assertTrue(self.game_manager.game_over)
+    
+    def test_drain_sensor_removes_ball_after_step(self):
+        multiball = self.game_manager.start_multiball(2)
+        extra = multiball.balls[1]
+        arbiter = MagicMock()
+        arbiter.shapes = (extra.shape, None)
+        
+        self.game_manager.on_ball_drained(arbiter, self.game_manager.space, None)
+        self.game_manager.on_ball_drained(arbiter, self.game_manager.space, None)
+        
+        self.assertIn(extra.body, self.game_manager.space.bodies)
+        self.game_manager.step()
+        
+        self.assertNotIn(extra.body, self.game_manager.space.bodies)
+        self.assertFalse(self.game_manager.game_over)
+        self.assertIsNone(self.game_manager.multiball)
+    
+    def test_stuck_balls_are_reset_in_batch(self):
+        multiball = self.game_manager.start_multiball(3)
+        lane_x, _ = self.game_manager.layout.lane_center()
+        
+        for ball in multiball.balls[1:]:
+            ball.body.position = (lane_x, self.game_manager.layout.plunger_lane["bottom"] - 50)
+        
+        with patch.object(self.game_manager, 'reset_ball') as reset_ball:
+            for _ in range(31):
+                for ball in multiball.balls[1:]:
+                    ball.body.velocity = (0, 0)
+                self.game_manager.check_ball_bounds()
+        
+        reset_ball.assert_any_call(multiball.balls[1].body)
+        reset_ball.assert_any_call(multiball.balls[2].body)
+        self.assertEqual(multiball.stuck_frames.tolist(), [0, 0, 0])
+    
+    def test_position_telemetry_is_batched(self):
+        self.game_manager.mqtt = MagicMock()
+        self.game_manager.start_multiball(3)
+        
+        self.game_manager.publish_ball_position()
+        
+        topic, payload = self.game_manager.mqtt.publish.call_args[0]
+        self.assertEqual(topic, BALL_POSITIONS_TOPIC)
+        self.assertEqual(len(payload["balls"]), 3)
+        self.assertEqual(len(payload["balls"][0]), 4)
+    
+    def test_balls_without_collision_share_a_group(self):
+        multiball = self.game_manager.start_multiball(3, collide=False)
+        
+        groups = {ball.shape.filter.group for ball in multiball.balls}
+        self.assertEqual(len(groups), 1)
+        self.assertNotEqual(groups, {0})
+        
+        self.game_manager.end_multiball()
+        self.assertEqual(self.game_manager.ball_shape.filter.group, 0)
+    
+    def test_snapshot_restore_and_new_game(self):
+        bodies = len(self.game_manager.space.bodies)
+        self.game_manager.start_multiball(4)
+        for _ in range(20):
+            self.game_manager.update()
+        
+        snapshot = json.loads(json.dumps(self.game_manager.snapshot()))
+        self.game_manager.end_multiball()
+        self.game_manager.restore(snapshot)
+        
+        self.assertEqual(len(self.game_manager.multiball.balls), 4)
+        self.assertEqual(json.loads(json.dumps(self.game_manager.snapshot())), snapshot)
+        
+        self.game_manager.new_game(seed=4)
+        
+        self.assertIsNone(self.game_manager.multiball)
+        self.assertEqual(len(self.game_manager.space.bodies), bodies)
+    
+    def test_multiball_is_deterministic(self):
+        def play():
+            game_manager = GameManager(NullMQTTClient(), leaderboard_path=None, seed=8)
+            game_manager.start_multiball(4)
+            for _ in range(120):
+                game_manager.update()
+            return game_manager.snapshot()["multiball"]
+        
+        self.assertEqual(play(), play())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,84 @@
+import unittest
+import os
+import threading
+import tempfile
+from mqtt.offline_queue import OfflineQueue
+
+class TestOfflineQueue(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, "mqtt_queue.jsonl")
+        
+    def tearDown(self):
+        self.temp_dir.cleanup()
+        
+    def test_queue_is_bounded(self):
+        queue = OfflineQueue(max_size=3)
+        
+        for i in range(5):
+            queue.put("test/topic", str(i))
+            
+        self.assertEqual(len(queue), 3)
+        self.assertEqual(queue.dropped_count, 2)
+        self.assertEqual([payload for _, payload, _ in queue.drain()], ["2", "3", "4"])
+        self.assertEqual(len(queue), 0)
+        
+    def test_disk_backed_queue_survives_restart(self):
+        queue = OfflineQueue(max_size=10, path=self.path)
+        queue.put("test/topic", '{"a": 1}')
+        queue.put("test/binary", b"\xb1\x00\x01", retain=True)
+        queue.flush()
+        
+        restored = OfflineQueue(max_size=10, path=self.path)
+        
+        self.assertEqual(restored.drain(), [
+            ("test/topic", '{"a": 1}', False),
+            ("test/binary", b"\xb1\x00\x01", True)
+        ])
+        restored.flush()
+        self.assertEqual(len(OfflineQueue(max_size=10, path=self.path)), 0)
+        
+    def test_disk_file_is_compacted(self):
+        queue = OfflineQueue(max_size=2, path=self.path)
+        
+        for i in range(6):
+            queue.put("test/topic", str(i))
+        queue.flush()
+            
+        with open(self.path) as f:
+            self.assertLessEqual(len(f.readlines()), 4)
+        self.assertEqual([payload for _, payload, _ in OfflineQueue(max_size=2, path=self.path, background=False).drain()], ["4", "5"])
+        
+    def test_position_samples_keep_only_the_latest(self):
+        queue = OfflineQueue(max_size=3, path=self.path, latest_only_topics=("test/position",))
+        queue.put("test/score", "10")
+        for i in range(50):
+            queue.put("test/position", str(i))
+        queue.put("test/status", "game_over")
+        queue.flush()
+        
+        self.assertEqual(len(queue), 3)
+        self.assertEqual(queue.dropped_count, 49)
+        
+        restored = OfflineQueue(max_size=3, path=self.path, latest_only_topics=("test/position",), background=False)
+        self.assertEqual([payload for _, payload, _ in restored.drain()], ["10", "game_over"])
+        
+    def test_disk_writes_happen_off_the_calling_thread(self):
+        queue = OfflineQueue(max_size=10, path=self.path)
+        writers = []
+        append_to_disk = queue.append_to_disk
+        
+        def record_thread(message):
+            writers.append(threading.current_thread())
+            append_to_disk(message)
+            
+        queue.append_to_disk = record_thread
+        queue.put("test/topic", "1")
+        queue.flush()
+        queue.close()
+        
+        self.assertEqual(writers, [queue.writer])
+        self.assertEqual(OfflineQueue(max_size=10, path=self.path, background=False).drain(), [("test/topic", "1", False)])
+
+if __name__ == '__main__':
+    unittest.main()
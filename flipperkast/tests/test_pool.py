@@ -0,0 +1,112 @@
+import unittest
+from unittest.mock import patch
+import os
+from mqtt.config import MQTTConfig
+from mqtt.loopback import LoopbackBroker, LoopbackClient
+from mqtt.mqtt_client import unpack_batch
+from mqtt.pool import MQTTClientPool
+from mqtt.topics import SCORE_TOPIC, GAME_STATUS_TOPIC
+from game.game_manager import GameManager
+from game.score_panel import ScorePanel
+
+class TestMQTTClientPool(unittest.TestCase):
+    def setUp(self):
+        self.broker = LoopbackBroker(self.id())
+        LoopbackBroker.brokers[self.id()] = self.broker
+        self.config = MQTTConfig.loopback(self.id())
+        
+        self.environ = patch.dict(os.environ, {
+            "FLIPPERKAST_MQTT_TRANSPORT": "loopback",
+            "FLIPPERKAST_MQTT_BROKER": self.id()
+        })
+        self.environ.start()
+    
+    def tearDown(self):
+        self.environ.stop()
+        LoopbackBroker.brokers.pop(self.id(), None)
+    
+    def listen(self, topic):
+        received = []
+        listener = LoopbackClient(broker=self.broker)
+        listener.on_message = lambda client, userdata, message: received.append(message.payload.decode())
+        listener.connect(self.id())
+        listener.subscribe(topic)
+        return received
+    
+    def test_acquire_shares_one_client_per_broker(self):
+        first = MQTTClientPool.acquire(self.config)
+        second = MQTTClientPool.acquire(self.config)
+        
+        self.assertIs(first, second)
+        self.assertEqual(MQTTClientPool.reference_count(first), 2)
+        
+        first.start()
+        self.assertFalse(MQTTClientPool.release(first))
+        self.assertTrue(first.running)
+        
+        self.assertTrue(MQTTClientPool.release(second))
+        self.assertFalse(first.running)
+        self.assertEqual(MQTTClientPool.reference_count(first), 0)
+        self.assertIsNot(MQTTClientPool.acquire(self.config), first)
+        MQTTClientPool.release(MQTTClientPool.acquire(self.config))
+    
+    def test_release_unknown_client_is_ignored(self):
+        self.assertFalse(MQTTClientPool.release(object()))
+    
+    def test_game_and_score_panel_share_a_connection(self):
+        statuses = self.listen(GAME_STATUS_TOPIC)
+        
+        game_manager = GameManager(leaderboard_path=None)
+        panel = ScorePanel()
+        
+        self.assertIs(panel.mqtt, game_manager.mqtt)
+        self.assertEqual(len(self.broker.clients), 2)
+        
+        bumper = game_manager.bumpers[0]
+        game_manager.on_bumper_scored(bumper)
+        game_manager.mqtt.flush(force=True)
+        self.assertEqual(panel.scores["Player"], bumper.points)
+        
+        panel.stop()
+        self.assertTrue(game_manager.mqtt.running)
+        game_manager.stop()
+        self.assertEqual(len(self.broker.clients), 1)
+        
+        status_names = [status["status"] for payload in statuses for status in unpack_batch(payload)]
+        self.assertEqual(status_names.count("READY"), 1)
+        self.assertEqual(status_names.count("STOPPED"), 1)
+    
+    def test_game_stop_is_delivered_while_the_panel_holds_the_client(self):
+        statuses = self.listen(GAME_STATUS_TOPIC)
+        
+        game_manager = GameManager(leaderboard_path=None)
+        panel = ScorePanel()
+        
+        game_manager.stop()
+        
+        self.assertTrue(panel.mqtt.running)
+        status_names = [status["status"] for payload in statuses for status in unpack_batch(payload)]
+        self.assertEqual(status_names, ["READY", "STOPPED"])
+        
+        panel.stop()
+        self.assertFalse(panel.mqtt.running)
+    
+    def test_topic_subscriber_close_keeps_other_callbacks(self):
+        client = MQTTClientPool.acquire(self.config)
+        client.start()
+        first = []
+        second = []
+        first_subscriber = client.subscriber(SCORE_TOPIC, first.append)
+        client.subscriber(SCORE_TOPIC, second.append)
+        publisher = client.publisher(SCORE_TOPIC)
+        
+        publisher.publish("5")
+        first_subscriber.close()
+        publisher.publish("7")
+        
+        self.assertEqual(first, ["5"])
+        self.assertEqual(second, ["5", "7"])
+        MQTTClientPool.release(client)
+
+if __name__ == '__main__':
+    unittest.main()
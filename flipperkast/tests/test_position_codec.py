@@ -0,0 +1,57 @@
+import unittest
+import json
+from mqtt.position_codec import (BallPositionEncoder, BinaryPositionDecoder, JsonPositionDecoder,
+                                 get_decoder, POSITION_RECORD, ENCODING_BINARY, ENCODING_JSON)
+from mqtt.mqtt_client import pack_batch
+from mqtt.topics import BALL_POSITION_TOPIC
+
+class TestPositionCodec(unittest.TestCase):
+    def setUp(self):
+        self.encoder = BallPositionEncoder(ENCODING_BINARY, epoch=1000.0)
+        self.decoder = get_decoder(self.encoder.format_announcement())
+        
+    def test_binary_record_is_fixed_size(self):
+        payload = self.encoder.encode(100.5, 200.25, 10.0, -20.0, timestamp=1001.5)
+        
+        self.assertIsInstance(payload, bytes)
+        self.assertEqual(len(payload), POSITION_RECORD.size)
+        self.assertLess(len(payload), len(json.dumps({"x": 100.5, "y": 200.25, "vx": 10.0,
+                                                      "vy": -20.0, "timestamp": 1001.5})))
+        
+    def test_unknown_encoding_is_rejected(self):
+        with self.assertRaises(ValueError):
+            BallPositionEncoder("bogus")
+        
+    def test_binary_round_trip(self):
+        payload = self.encoder.encode(100.5, 200.25, 10.0, -20.0, timestamp=1001.5, keyframe=True)
+        
+        sample = self.decoder.decode(payload)[0]
+        
+        self.assertIsInstance(self.decoder, BinaryPositionDecoder)
+        self.assertAlmostEqual(sample["x"], 100.5, places=3)
+        self.assertAlmostEqual(sample["y"], 200.25, places=3)
+        self.assertAlmostEqual(sample["vx"], 10.0, places=3)
+        self.assertAlmostEqual(sample["vy"], -20.0, places=3)
+        self.assertAlmostEqual(sample["timestamp"], 1001.5, places=3)
+        self.assertEqual(sample["seq"], 0)
+        self.assertTrue(sample["keyframe"])
+        
+    def test_batched_records_decode_in_order(self):
+        payloads = [self.encoder.encode(i, i, 0, 0, timestamp=1000.0 + i) for i in range(3)]
+        
+        samples = self.decoder.decode(pack_batch(BALL_POSITION_TOPIC, payloads))
+        
+        self.assertEqual([sample["seq"] for sample in samples], [0, 1, 2])
+        self.assertEqual([sample["x"] for sample in samples], [0, 1, 2])
+        
+    def test_json_fallback(self):
+        self.assertIsInstance(get_decoder(None), JsonPositionDecoder)
+        self.assertIsInstance(get_decoder({"encoding": ENCODING_BINARY, "version": 99}), JsonPositionDecoder)
+        
+        payload = json.dumps({"x": 1, "y": 2, "vx": 3, "vy": 4, "timestamp": 5})
+        
+        self.assertEqual(self.decoder.decode(payload)[0]["x"], 1)
+        self.assertEqual(get_decoder().decode(payload.encode())[0]["vy"], 4)
+
+if __name__ == '__main__':
+    unittest.main()
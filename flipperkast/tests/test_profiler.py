@@ -0,0 +1,104 @@
+import os
+import json
+import random
+import tempfile
+import unittest
+
+from instrumentation.profiler import Profiler, percentile
+from mqtt.null_client import NullMQTTClient
+from mqtt.topics import METRICS_TOPIC
+from game.game_manager import GameManager
+
+class RecordingClient(NullMQTTClient):
+    def __init__(self):
+        super().__init__()
+        self.messages = []
+        
+    def publish(self, topic, message, retain=False):
+        self.messages.append((topic, message))
+        return True
+
+class TestProfiler(unittest.TestCase):
+    def test_percentile(self):
+        samples = list(range(1, 101))
+        
+        self.assertEqual(percentile(samples, 0.50), 51)
+        self.assertEqual(percentile(samples, 0.99), 100)
+        self.assertEqual(percentile([], 0.95), 0.0)
+        
+    def test_frame_histogram(self):
+        profiler = Profiler()
+        
+        for frame in range(10):
+            profiler.record("draw.ball", 0.001 * (frame + 1))
+            profiler.end_frame()
+            
+        metric = profiler.summary()["metrics"]["draw.ball"]
+        self.assertAlmostEqual(metric["p50_ms"], 6.0)
+        self.assertAlmostEqual(metric["max_ms"], 10.0)
+        self.assertEqual(metric["total_calls"], 10)
+        self.assertEqual(metric["calls_per_frame"], 1.0)
+        
+    def test_history_is_bounded(self):
+        profiler = Profiler(history=5)
+        
+        for frame in range(20):
+            profiler.record("draw.ball", 0.001)
+            profiler.end_frame()
+            
+        self.assertEqual(len(profiler.frame_times["draw.ball"]), 5)
+        self.assertEqual(profiler.total_calls["draw.ball"], 20)
+        
+    def test_wrap_times_calls(self):
+        profiler = Profiler()
+        wrapped = profiler.wrap("callback.test", lambda a, b: a + b)
+        
+        self.assertEqual(wrapped(1, 2), 3)
+        self.assertEqual(profiler.total_calls["callback.test"], 1)
+        
+    def test_game_manager_profiling(self):
+        random.seed(0)
+        game_manager = GameManager(NullMQTTClient(), leaderboard_path=None)
+        profiler = Profiler()
+        game_manager.enable_profiling(profiler)
+        game_manager.enable_profiling(profiler)
+        
+        handler = game_manager.space.add_collision_handler(1, 98)
+        self.assertFalse(hasattr(handler.begin.profiled_function, "profiled_function"))
+        
+        for _ in range(5):
+            game_manager.update()
+            profiler.end_frame()
+            
+        summary = profiler.summary()
+        self.assertEqual(summary["steps"], 10)
+        self.assertEqual(summary["metrics"]["physics.step"]["calls_per_step"], 1.0)
+        
+    def test_write_json_and_csv(self):
+        profiler = Profiler()
+        profiler.record("physics.step", 0.002)
+        profiler.end_frame()
+        
+        with tempfile.TemporaryDirectory() as directory:
+            json_path = os.path.join(directory, "profile.json")
+            csv_path = os.path.join(directory, "profile.csv")
+            profiler.write(json_path)
+            profiler.write(csv_path)
+            
+            with open(json_path) as f:
+                self.assertIn("physics.step", json.load(f)["metrics"])
+            with open(csv_path) as f:
+                lines = f.read().splitlines()
+            self.assertTrue(lines[0].startswith("name,p50_ms"))
+            self.assertTrue(lines[1].startswith("physics.step,"))
+            
+    def test_publish_to_metrics_topic(self):
+        profiler = Profiler()
+        client = RecordingClient()
+        
+        profiler.publish(client)
+        
+        self.assertEqual(client.messages[0][0], METRICS_TOPIC)
+
+if __name__ == '__main__':
+    unittest.main()
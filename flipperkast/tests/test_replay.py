@@ -0,0 +1,118 @@
+import os
+import tempfile
+import unittest
+
+from game.game_manager import GameManager
+from mqtt.null_client import NullMQTTClient
+from game.world_builder import WorldBuilder
+from simulation.headless import HeadlessRunner, AutoPlayInput, ScriptedInput
+from simulation.replay import Replay, ReplayPlayer, checkpoint_state
+
+class TestReplay(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "replay.jsonl")
+        
+    def tearDown(self):
+        self.directory.cleanup()
+        
+    def record_game(self, seed=3, max_frames=900):
+        runner = HeadlessRunner(input_source=AutoPlayInput(), max_frames=max_frames, seed=seed)
+        runner.game_manager.start_recording(self.path, checkpoint_interval=60)
+        result = runner.run()
+        final_state = checkpoint_state(runner.game_manager)
+        runner.game_manager.stop_recording()
+        return result, final_state
+        
+    def test_seeded_games_are_identical(self):
+        first = HeadlessRunner(max_frames=900, seed=11).run()
+        second = HeadlessRunner(max_frames=900, seed=11).run()
+        
+        self.assertEqual(first["score"], second["score"])
+        self.assertEqual(first["steps"], second["steps"])
+        
+    def test_recording_contains_seed_inputs_and_checkpoints(self):
+        self.record_game()
+        
+        replay = Replay.load(self.path)
+        
+        self.assertEqual(replay.header["seed"], 3)
+        self.assertEqual(replay.inputs[0][0][0], "plunger_compress")
+        self.assertIn(60, replay.checkpoints)
+        self.assertIsNotNone(replay.end_step)
+        
+    def test_replay_reproduces_game(self):
+        result, final_state = self.record_game()
+        
+        player = ReplayPlayer(self.path)
+        replayed = player.run()
+        
+        self.assertEqual(player.mismatches, [])
+        self.assertEqual(replayed["score"], result["score"])
+        self.assertEqual(replayed["steps"], result["steps"])
+        self.assertEqual(checkpoint_state(player.game_manager), final_state)
+        
+    def test_replay_keeps_the_recorded_quality(self):
+        for quality in ("low", "high"):
+            game_manager = GameManager(NullMQTTClient(), leaderboard_path=None, seed=1, world=WorldBuilder(quality))
+            runner = HeadlessRunner(game_manager, input_source=ScriptedInput([]), max_frames=100)
+            game_manager.start_recording(self.path, checkpoint_interval=5)
+            runner.run()
+            game_manager.stop_recording()
+            
+            player = ReplayPlayer(self.path)
+            player.run()
+            
+            self.assertEqual(player.game_manager.world.quality, quality)
+            self.assertEqual(player.game_manager.stuck_steps, game_manager.stuck_steps)
+            self.assertEqual(player.mismatches, [])
+        
+    def test_replay_detects_divergence(self):
+        self.record_game()
+        
+        player = ReplayPlayer(self.path)
+        player.game_manager.ball_shape.body.position = (300, 300)
+        player.run()
+        
+        self.assertGreater(len(player.mismatches), 0)
+        
+    def test_seek_to_checkpoint_and_back(self):
+        self.record_game()
+        replay = Replay.load(self.path)
+        player = ReplayPlayer(replay)
+        
+        game_manager = player.seek_checkpoint(2)
+        self.assertEqual(game_manager.step_count, 180)
+        self.assertEqual(checkpoint_state(game_manager), replay.checkpoints[180])
+        
+        game_manager = player.seek(60)
+        self.assertEqual(game_manager.step_count, 60)
+        self.assertEqual(checkpoint_state(game_manager), replay.checkpoints[60])
+        
+    def test_seek_uses_snapshots(self):
+        self.record_game()
+        player = ReplayPlayer(self.path)
+        player.run()
+        game_manager = player.game_manager
+        
+        player.seek(120)
+        
+        self.assertIs(player.game_manager, game_manager)
+        self.assertIn(120, player.snapshots)
+        self.assertFalse(player.exact)
+        
+        player.run()
+        self.assertTrue(player.exact)
+        self.assertEqual(player.mismatches, [])
+        
+    def test_bumper_jitter_uses_game_seed(self):
+        first = GameManager(NullMQTTClient(), leaderboard_path=None, seed=5)
+        second = GameManager(NullMQTTClient(), leaderboard_path=None, seed=5)
+        
+        first.bumpers[0].hit()
+        second.bumpers[0].hit()
+        
+        self.assertEqual(first.bumpers[0].body.position, second.bumpers[0].body.position)
+
+if __name__ == '__main__':
+    unittest.main()
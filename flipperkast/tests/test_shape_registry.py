@@ -0,0 +1,45 @@
+import unittest
+from unittest.mock import MagicMock
+import pymunk
+from game.shape_registry import ShapeRegistry
+from game.ball import Ball
+from game.bumper import Bumper
+from game.flipper import Flipper
+from game.plunger import Plunger
+
+class TestShapeRegistry(unittest.TestCase):
+    def setUp(self):
+        self.space = pymunk.Space()
+        self.registry = ShapeRegistry.for_space(self.space)
+        self.ball = Ball(self.space, position=(300, 300), radius=15)
+        self.bumper = Bumper(self.space, 100, 100, radius=20, collision_type=98)
+        self.left_flipper = Flipper(self.space, (325, 640), is_left=True)
+        self.right_flipper = Flipper(self.space, (475, 640), is_left=False)
+        self.plunger = Plunger(self.space, (670, 650))
+        
+    def test_registry_is_shared_per_space(self):
+        self.assertIs(ShapeRegistry.for_space(self.space), self.registry)
+        self.assertIsNot(ShapeRegistry.for_space(pymunk.Space()), self.registry)
+        
+    def test_objects_register_their_shapes(self):
+        self.assertIs(self.registry.owner(self.ball.shape), self.ball)
+        self.assertIs(self.registry.owner(self.bumper.shape), self.bumper)
+        self.assertIs(self.registry.owner(self.left_flipper.shape), self.left_flipper)
+        self.assertIs(self.registry.owner(self.plunger.shape), self.plunger)
+        self.assertIs(self.registry.owner(self.plunger.sensor), self.plunger)
+        self.assertEqual(self.registry.owners_of_type(Flipper), [self.left_flipper, self.right_flipper])
+        
+    def test_flipper_handler_uses_the_flipper_that_was_hit(self):
+        self.left_flipper.motor_active = True
+        
+        arbiter = MagicMock()
+        arbiter.shapes = (self.left_flipper.shape, self.ball.shape)
+        arbiter.contact_point_set.points[0].point_a = self.left_flipper.body.position
+        
+        self.right_flipper.on_ball_hit(arbiter, self.space, None)
+        
+        self.assertGreater(self.ball.body.velocity.x, 0)
+        self.assertLess(self.ball.body.velocity.y, 0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+import unittest
+from unittest.mock import patch
+import os
+import tempfile
+from game.game_manager import GameManager
+from game.tuning import DEFAULT_TUNING, make_tuning
+from mqtt.null_client import NullMQTTClient
+from simulation.headless import HeadlessRunner
+from simulation.sweep import SweepRunner, grid_configs, random_configs, spec_configs
+
+class TestSweep(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.cache_path = os.path.join(self.temp_dir.name, "sweep_cache.json")
+    
+    def tearDown(self):
+        self.temp_dir.cleanup()
+    
+    def test_tuning_is_applied_to_the_world(self):
+        tuning = {"bumper_elasticity": 0.9, "bumper_kick": 80, "flipper_impulse": 650, "plunger_spring_constant": 420.0,
+                  "damping": 0.9}
+        game_manager = GameManager(NullMQTTClient(), leaderboard_path=None, seed=1, tuning=tuning)
+        
+        self.assertEqual(game_manager.space.damping, 0.9)
+        self.assertEqual(game_manager.plunger.spring_constant, 420.0)
+        self.assertEqual({bumper.shape.elasticity for bumper in game_manager.bumpers}, {0.9})
+        self.assertEqual({bumper.kick for bumper in game_manager.bumpers}, {80})
+        self.assertEqual({flipper.impulse for flipper in game_manager.get_flippers()}, {650})
+        self.assertEqual(game_manager.tuning["flipper_speed_factor"], DEFAULT_TUNING["flipper_speed_factor"])
+    
+    def test_unknown_tuning_parameter_is_rejected(self):
+        with self.assertRaises(ValueError):
+            make_tuning({"gravity": 900})
+        with self.assertRaises(ValueError):
+            spec_configs({"grid": {"gravity": [500, 900]}})
+    
+    def test_retuned_game_matches_fresh_game(self):
+        tuning = {"bumper_kick": 200, "damping": 0.9}
+        fresh = HeadlessRunner(max_frames=600, seed=3, tuning=tuning).run()
+        
+        runner = HeadlessRunner(max_frames=600)
+        runner.run()
+        runner.reset(3, tuning=tuning)
+        
+        self.assertEqual(runner.run(), fresh)
+    
+    def test_grid_and_random_configs(self):
+        grid = grid_configs({"damping": [0.9, 0.95], "bumper_kick": [100, 150, 200]})
+        self.assertEqual(len(grid), 6)
+        self.assertIn({"bumper_kick": 200, "damping": 0.9}, grid)
+        
+        configs = random_configs({"bumper_kick": [100, 200], "damping": [0.9, 0.99]}, 5, seed=2)
+        self.assertEqual(configs, random_configs({"bumper_kick": [100, 200], "damping": [0.9, 0.99]}, 5, seed=2))
+        for config in configs:
+            self.assertIsInstance(config["bumper_kick"], int)
+            self.assertTrue(100 <= config["bumper_kick"] <= 200)
+            self.assertTrue(0.9 <= config["damping"] <= 0.99)
+    
+    def test_sweep_results_are_cached_by_config(self):
+        spec = {"grid": {"bumper_kick": [100, 200]}}
+        runner = SweepRunner(games=2, max_frames=200, processes=1, cache_path=self.cache_path)
+        
+        first = runner.run_spec(spec)
+        self.assertEqual([result["cached"] for result in first], [False, False])
+        self.assertEqual(first[0]["summary"]["tables"], 2)
+        self.assertIn("time_in_play_mean", first[0]["summary"])
+        self.assertIn("score_quartiles", first[0]["summary"])
+        
+        reloaded = SweepRunner(games=2, max_frames=200, processes=1, cache_path=self.cache_path)
+        with patch.object(reloaded.engine, 'run', wraps=reloaded.engine.run) as run:
+            second = reloaded.run_spec({"grid": {"bumper_kick": [100, 200, 150]}})
+        
+        self.assertEqual([result["cached"] for result in second], [True, True, False])
+        self.assertEqual(second[1]["summary"], first[1]["summary"])
+        self.assertEqual(len(run.call_args[0][0]), 2)
+        
+        other_games = SweepRunner(games=3, max_frames=200, processes=1, cache_path=self.cache_path)
+        self.assertNotEqual(other_games.config_key({"bumper_kick": 100}), reloaded.config_key({"bumper_kick": 100}))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,169 @@
+import unittest
+from unittest.mock import patch
+import os
+import json
+import tempfile
+import pymunk
+from game import table_loader
+from game.table_loader import load_table, table_path, TableLayout
+from game.game_manager import GameManager
+from mqtt.null_client import NullMQTTClient
+
+SMALL_TABLE_TOML = """
+name = "small"
+multiball_spawn = [200, 100]
+out_of_bounds_y = 900
+
+[[walls]]
+id = "top"
+type = "arc"
+center = [200, 200]
+radius = 150
+start = 180
+end = 360
+segments = 4
+
+[[walls]]
+id = "drain"
+a = [100, 400]
+b = [300, 400]
+sensor = "drain"
+
+[[bumpers]]
+id = "middle"
+position = [200, 200]
+points = 50
+
+[[flippers]]
+side = "left"
+position = [150, 440]
+
+[[flippers]]
+side = "right"
+position = [250, 440]
+
+[plunger]
+position = [340, 450]
+
+[plunger_lane]
+left = 320
+right = 360
+top = 400
+bottom = 500
+
+[ball]
+position = [340, 420]
+"""
+
+class TestTableLoader(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.cache_dir = os.path.join(self.temp_dir.name, "cache")
+        table_loader.loaded_layouts.clear()
+    
+    def tearDown(self):
+        table_loader.loaded_layouts.clear()
+        self.temp_dir.cleanup()
+    
+    def write_table(self, name, content):
+        path = os.path.join(self.temp_dir.name, name)
+        with open(path, 'w') as f:
+            f.write(content)
+        return path
+    
+    def default_data(self):
+        with open(table_path("default"), 'r') as f:
+            return json.load(f)
+    
+    def test_default_table_builds_the_classic_layout(self):
+        game_manager = GameManager(NullMQTTClient(), leaderboard_path=None, seed=1)
+        segments = [shape for shape in game_manager.space.shapes if isinstance(shape, pymunk.Segment)]
+        
+        self.assertEqual(game_manager.table, "default")
+        self.assertEqual(len(segments), 30)
+        self.assertEqual([shape.collision_type for shape in segments if shape.sensor], [99])
+        self.assertEqual([bumper.bumper_id for bumper in game_manager.bumpers],
+                         ["top_left", "top_right", "left_side", "right_side", "bottom_left_corner", "bottom_right_corner"])
+        self.assertEqual(tuple(game_manager.ball_shape.body.position), (670, 620))
+        self.assertEqual(game_manager.layout.lane_center(), (670, 675))
+    
+    def test_toml_tables_are_supported(self):
+        layout = load_table(self.write_table("small.toml", SMALL_TABLE_TOML), cache_dir=self.cache_dir)
+        
+        self.assertEqual(layout.name, "small")
+        self.assertEqual(len(layout.walls), 5)
+        self.assertAlmostEqual(layout.walls[0]["a"][0], 50)
+        self.assertAlmostEqual(layout.walls[3]["b"][0], 350)
+        self.assertEqual(layout.bumpers[0]["points"], 50)
+        self.assertEqual(layout.bumpers[0]["cooldown"], 0.1)
+        self.assertEqual(layout.ball["radius"], 15)
+    
+    def test_compiled_layout_is_loaded_from_cache(self):
+        path = self.write_table("small.toml", SMALL_TABLE_TOML)
+        first = load_table(path, cache_dir=self.cache_dir)
+        table_loader.loaded_layouts.clear()
+        
+        with patch('game.table_loader.parse_table') as parse_table:
+            cached = load_table(path, cache_dir=self.cache_dir)
+        
+        parse_table.assert_not_called()
+        self.assertEqual(cached.source_hash, first.source_hash)
+        self.assertEqual(cached.walls, first.walls)
+    
+    def test_cache_is_rebuilt_when_the_table_changes(self):
+        path = self.write_table("small.toml", SMALL_TABLE_TOML)
+        first = load_table(path, cache_dir=self.cache_dir)
+        
+        self.write_table("small.toml", SMALL_TABLE_TOML.replace("points = 50", "points = 500"))
+        changed = load_table(path, cache_dir=self.cache_dir)
+        
+        self.assertNotEqual(changed.source_hash, first.source_hash)
+        self.assertEqual(changed.bumpers[0]["points"], 500)
+    
+    def test_cache_lives_outside_the_source_tree(self):
+        self.assertEqual(table_loader.table_cache_dir({"XDG_CACHE_HOME": "/tmp/xdg"}), "/tmp/xdg/flipperkast/tables")
+        self.assertEqual(table_loader.table_cache_dir({"FLIPPERKAST_TABLE_CACHE": self.cache_dir}), self.cache_dir)
+        self.assertIsNone(table_loader.table_cache_dir({"FLIPPERKAST_TABLE_CACHE": ""}))
+        
+        path = self.write_table("small.toml", SMALL_TABLE_TOML)
+        with patch.dict(os.environ, {"FLIPPERKAST_TABLE_CACHE": ""}), patch('game.table_loader.write_cache') as write_cache:
+            load_table(path)
+        write_cache.assert_not_called()
+    
+    def test_invalid_tables_are_rejected(self):
+        data = self.default_data()
+        del data["plunger_lane"]
+        with self.assertRaises(ValueError):
+            TableLayout.from_dict(data)
+        
+        data = self.default_data()
+        data["flippers"] = data["flippers"][:1]
+        with self.assertRaises(ValueError):
+            TableLayout.from_dict(data)
+        
+        with self.assertRaises(FileNotFoundError):
+            load_table("does_not_exist")
+    
+    def test_switch_table_between_games(self):
+        data = self.default_data()
+        data["name"] = "moved"
+        data["bumpers"][0]["position"] = [260, 280]
+        path = self.write_table("moved.json", json.dumps(data))
+        
+        game_manager = GameManager(NullMQTTClient(), leaderboard_path=None, seed=1)
+        for _ in range(60):
+            game_manager.update()
+        
+        game_manager.new_game(seed=2, table=path)
+        
+        self.assertEqual(game_manager.table, "moved")
+        self.assertEqual(tuple(game_manager.bumpers[0].body.position), (260, 280))
+        self.assertIn(game_manager.bumpers[0].shape, game_manager.space.shapes)
+        self.assertEqual(game_manager.step_count, 0)
+        self.assertFalse(game_manager.game_over)
+        
+        game_manager.new_game(seed=2, table="default")
+        self.assertEqual(tuple(game_manager.bumpers[0].body.position), (220, 250))
+
+if __name__ == '__main__':
+    unittest.main()
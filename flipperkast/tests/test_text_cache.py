@@ -0,0 +1,50 @@
+import unittest
+import pygame
+from ui.text_cache import TextRenderer, DigitAtlas
+
+class TestTextCache(unittest.TestCase):
+    def setUp(self):
+        pygame.font.init()
+        self.font = pygame.font.Font(None, 30)
+        
+    def test_render_is_cached(self):
+        renderer = TextRenderer()
+        
+        first = renderer.render(self.font, "Score: ", (0, 0, 0))
+        second = renderer.render(self.font, "Score: ", (0, 0, 0))
+        
+        self.assertIs(first, second)
+        self.assertEqual(renderer.hits, 1)
+        self.assertEqual(renderer.misses, 1)
+        
+    def test_color_is_part_of_the_key(self):
+        renderer = TextRenderer()
+        
+        black = renderer.render(self.font, "GAME OVER", (0, 0, 0))
+        red = renderer.render(self.font, "GAME OVER", (255, 0, 0))
+        
+        self.assertIsNot(black, red)
+        
+    def test_least_recently_used_entry_is_evicted(self):
+        renderer = TextRenderer(max_entries=2)
+        
+        renderer.render(self.font, "a", (0, 0, 0))
+        renderer.render(self.font, "b", (0, 0, 0))
+        renderer.render(self.font, "a", (0, 0, 0))
+        renderer.render(self.font, "c", (0, 0, 0))
+        
+        self.assertIn((self.font, "a", (0, 0, 0)), renderer.cache)
+        self.assertNotIn((self.font, "b", (0, 0, 0)), renderer.cache)
+        
+    def test_digit_atlas_blits_numbers(self):
+        atlas = DigitAtlas(self.font, (0, 0, 0))
+        surface = pygame.Surface((200, 50))
+        
+        rect = atlas.blit(surface, "1234", (10, 5))
+        
+        self.assertEqual(rect.topleft, (10, 5))
+        self.assertEqual(rect.width, atlas.width("1234"))
+        self.assertEqual(rect.height, atlas.height)
+
+if __name__ == '__main__':
+    unittest.main()
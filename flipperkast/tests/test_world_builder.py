@@ -0,0 +1,113 @@
+import unittest
+from unittest.mock import patch
+import pymunk
+from game.game_manager import GameManager
+from game.world_builder import WorldBuilder, reindex_body, step_space, STUCK_TIMEOUT
+from mqtt.null_client import NullMQTTClient
+
+class TestWorldBuilder(unittest.TestCase):
+    def test_quality_presets_keep_game_speed(self):
+        for quality in ("low", "standard", "high"):
+            game_manager = GameManager(NullMQTTClient(), leaderboard_path=None, seed=1, world=WorldBuilder(quality))
+            
+            self.assertEqual(game_manager.space.iterations, WorldBuilder(quality).iterations)
+            self.assertAlmostEqual(game_manager.substeps / game_manager.physics_rate, 2 / 90.0)
+            steps = sum(game_manager.advance(1 / 60.0) for _ in range(60))
+            self.assertAlmostEqual(steps, 60 * game_manager.substeps, delta=1)
+    
+    def test_standard_quality_matches_defaults(self):
+        game_manager = GameManager(NullMQTTClient(), leaderboard_path=None, seed=1)
+        
+        self.assertEqual(game_manager.physics_rate, 90.0)
+        self.assertEqual(game_manager.substeps, 2)
+        self.assertEqual(game_manager.space.iterations, 10)
+    
+    def test_unknown_quality_is_rejected(self):
+        with self.assertRaises(ValueError):
+            WorldBuilder("ultra")
+    
+    def test_bounding_box_tree_is_kept_for_small_tables(self):
+        game_manager = GameManager(NullMQTTClient(), leaderboard_path=None, seed=1)
+        game_manager.start_multiball(6)
+        
+        self.assertIsNone(getattr(game_manager.space, "spatial_hash_cell_size", None))
+    
+    def test_spatial_hash_is_sized_to_the_ball(self):
+        game_manager = GameManager(NullMQTTClient(), leaderboard_path=None, seed=1,
+                                   world=WorldBuilder(use_spatial_hash=True))
+        
+        self.assertEqual(game_manager.space.spatial_hash_cell_size, game_manager.ball_shape.radius * 4)
+        for _ in range(30):
+            game_manager.update()
+    
+    def test_bumper_hit_reindexes_immediately_outside_a_step(self):
+        game_manager = GameManager(NullMQTTClient(), leaderboard_path=None, seed=1)
+        bumper = game_manager.bumpers[0]
+        
+        bumper.hit()
+        
+        bb = bumper.shape.bb
+        self.assertAlmostEqual((bb.left + bb.right) / 2, bumper.body.position.x)
+        self.assertAlmostEqual((bb.top + bb.bottom) / 2, bumper.body.position.y)
+    
+    def test_plunger_moves_are_reindexed(self):
+        game_manager = GameManager(NullMQTTClient(), leaderboard_path=None, seed=1)
+        plunger = game_manager.plunger
+        
+        plunger.compress(30)
+        self.assertAlmostEqual((plunger.shape.bb.top + plunger.shape.bb.bottom) / 2, plunger.position[1] + 30)
+        
+        plunger.launch(game_manager.ball_shape.body)
+        self.assertAlmostEqual((plunger.shape.bb.top + plunger.shape.bb.bottom) / 2, plunger.position[1])
+        
+        plunger.restore({"compression": 10, "position": (plunger.position[0], plunger.position[1] + 10)})
+        self.assertAlmostEqual((plunger.shape.bb.top + plunger.shape.bb.bottom) / 2, plunger.position[1] + 10)
+    
+    def test_stuck_timeout_is_the_same_sim_time_for_every_preset(self):
+        for quality in ("low", "standard", "high"):
+            game_manager = GameManager(NullMQTTClient(), leaderboard_path=None, seed=1, world=WorldBuilder(quality))
+            body = game_manager.ball_shape.body
+            lane = game_manager.layout.plunger_lane
+            resting = ((lane["left"] + lane["right"]) / 2, lane["top"] + 5)
+            
+            steps = 0
+            with patch.object(game_manager, 'reset_ball') as reset_ball:
+                while not reset_ball.called:
+                    body.position = resting
+                    body.velocity = (0, 0)
+                    game_manager.check_ball_bounds()
+                    steps += 1
+            
+            self.assertAlmostEqual(steps / game_manager.physics_rate, STUCK_TIMEOUT, delta=1 / game_manager.physics_rate)
+    
+    def test_catch_up_cap_is_the_same_sim_time_for_every_preset(self):
+        for quality in ("low", "standard", "high"):
+            game_manager = GameManager(NullMQTTClient(), leaderboard_path=None, seed=1, world=WorldBuilder(quality))
+            
+            steps = game_manager.advance(1.0)
+            
+            self.assertAlmostEqual(steps / game_manager.physics_rate, 8 / 90.0)
+    
+    def test_reindex_inside_a_callback_waits_for_the_step(self):
+        space = pymunk.Space()
+        marker_body = pymunk.Body(body_type=pymunk.Body.STATIC)
+        marker = pymunk.Circle(marker_body, 5)
+        ball_body = pymunk.Body(1, 10)
+        ball = pymunk.Circle(ball_body, 5)
+        ball.collision_type = 1
+        sensor = pymunk.Circle(space.static_body, 5)
+        sensor.collision_type = 2
+        space.add(marker_body, marker, ball_body, ball, sensor)
+        
+        def begin(arbiter, space, data):
+            marker_body.position = (100, 100)
+            reindex_body(space, marker_body)
+            return True
+        
+        space.add_collision_handler(1, 2).begin = begin
+        step_space(space, 1 / 90.0)
+        
+        self.assertEqual(marker.bb, pymunk.BB(95, 95, 105, 105))
+
+if __name__ == '__main__':
+    unittest.main()
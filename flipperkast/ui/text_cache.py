@@ -0,0 +1,48 @@
+from collections import OrderedDict
+
+class TextRenderer:
+    def __init__(self, max_entries=128):
+        self.max_entries = max_entries
+        self.cache = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        
+    def render(self, font, text, color):
+        key = (font, text, color)
+        
+        surface = self.cache.get(key)
+        if surface is not None:
+            self.cache.move_to_end(key)
+            self.hits += 1
+            return surface
+        
+        self.misses += 1
+        surface = font.render(text, True, color)
+        self.cache[key] = surface
+        
+        if len(self.cache) > self.max_entries:
+            self.cache.popitem(last=False)
+            
+        return surface
+    
+    def clear(self):
+        self.cache.clear()
+
+class DigitAtlas:
+    def __init__(self, font, color, characters="0123456789-"):
+        self.glyphs = {character: font.render(character, True, color) for character in characters}
+        self.height = max(glyph.get_height() for glyph in self.glyphs.values())
+        
+    def width(self, text):
+        return sum(self.glyphs[character].get_width() for character in text)
+        
+    def blit(self, surface, text, position):
+        import pygame
+        
+        x, y = position
+        for character in text:
+            glyph = self.glyphs[character]
+            surface.blit(glyph, (x, y))
+            x += glyph.get_width()
+            
+        return pygame.Rect(position[0], y, x - position[0], self.height)